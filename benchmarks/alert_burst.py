@@ -0,0 +1,92 @@
+"""
+Alert Burst Benchmark
+Runs a simulated scoring loop through an incident (a long run of flagged
+points) against a slow local webhook and reports how much the alert path
+adds to each iteration: synchronous delivery versus the AlertDispatcher.
+
+Usage:
+    python benchmarks/alert_burst.py --points 5000 --burst 2000 --webhook-delay 0.05
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.alerts import AlertDispatcher, LocalWebhookServer, WebhookSink
+
+def percentiles_us(samples):
+    """p50/p99/max of a list of seconds, in microseconds"""
+    arr = np.array(samples) * 1e6
+    return {
+        "p50": round(float(np.percentile(arr, 50)), 2),
+        "p99": round(float(np.percentile(arr, 99)), 2),
+        "max": round(float(np.max(arr)), 2)
+    }
+
+def scoring_loop(flags, alert):
+    """Time each iteration of a loop that scores a point and alerts when flagged"""
+    window = np.zeros(100)
+    timings = []
+    for i, flagged in enumerate(flags):
+        start = time.perf_counter()
+        window[i % 100] = i
+        _ = (i - window.mean()) / (window.std() + 1)
+        if flagged:
+            alert(i)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Measure alert overhead on the scoring loop during a burst")
+    parser.add_argument("--points", type=int, default=5000, help="Points scored (default: 5000)")
+    parser.add_argument("--burst", type=int, default=2000, help="Consecutive flagged points (default: 2000)")
+    parser.add_argument("--webhook-delay", type=float, default=0.05,
+                        help="Seconds the stand-in webhook stalls per request (default: 0.05)")
+    parser.add_argument("--sync-limit", type=int, default=50,
+                        help="Flagged points delivered synchronously before giving up on that mode (default: 50)")
+    args = parser.parse_args()
+
+    flags = np.zeros(args.points, dtype=bool)
+    start = (args.points - args.burst) // 2
+    flags[start:start + args.burst] = True
+    receiver = LocalWebhookServer(delay=args.webhook_delay)
+    sink = WebhookSink(receiver.url)
+
+    # Synchronous: the loop waits for every webhook call (capped, it is slow)
+    sync_flags = flags.copy()
+    sync_flags[np.flatnonzero(sync_flags)[args.sync_limit:]] = False
+    sync_timings = scoring_loop(
+        sync_flags, lambda i: sink([{"source": "bench", "message": "anomaly", "value": float(i)}])
+    )
+
+    dispatcher = AlertDispatcher([sink], dedup_window=5.0, rate=2.0, burst=10)
+    started = time.perf_counter()
+    async_timings = scoring_loop(
+        flags, lambda i: dispatcher.submit("bench", "anomaly", value=float(i), score=float(i))
+    )
+    loop_sec = time.perf_counter() - started
+    dispatcher.close()
+    receiver.close()
+
+    report = {
+        "points": args.points,
+        "flagged": int(flags.sum()),
+        "webhook_delay_ms": args.webhook_delay * 1000,
+        "sync_iteration_us": percentiles_us(sync_timings),
+        "sync_flagged_iteration_us": percentiles_us(np.array(sync_timings)[sync_flags]),
+        "async_iteration_us": percentiles_us(async_timings),
+        "async_flagged_iteration_us": percentiles_us(np.array(async_timings)[flags]),
+        "async_loop_sec": round(loop_sec, 3),
+        "dispatcher": dispatcher.stats,
+        "webhook_alerts_received": len(receiver.alerts())
+    }
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
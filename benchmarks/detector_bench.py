@@ -0,0 +1,263 @@
+"""
+Detector Benchmark Suite
+Times fit, score, predict and predict_with_scores for every batch detector
+over a grid of training sizes and scoring batch sizes, recording wall time,
+points/sec and peak memory, and compares a run against a stored baseline.
+
+Each case is timed until it has run for --min-time seconds (at least once,
+at most --max-repeats times) and reports the median call. Peak memory is the
+tracemalloc peak of one separate, untimed call (NumPy buffers are traced;
+memory allocated inside compiled scikit-learn code may not be), which also
+serves as the warm-up.
+
+Usage:
+    python benchmarks/detector_bench.py run --output baseline.json
+    python benchmarks/detector_bench.py run --sizes 1e2,1e3,1e4,1e5,1e6,1e7 --detectors stat-zscore,isolation-forest
+    python benchmarks/detector_bench.py compare baseline.json current.json --threshold 0.2
+
+compare exits with status 1 when any case regressed, so it can gate CI.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import StatisticalDetector, IsolationForestDetector, LOFDetector, EnsembleDetector
+
+DETECTORS = {
+    "stat-zscore": lambda: StatisticalDetector(method="zscore"),
+    "stat-iqr": lambda: StatisticalDetector(method="iqr"),
+    "stat-moving-average": lambda: StatisticalDetector(method="moving_average"),
+    "isolation-forest": lambda: IsolationForestDetector(),
+    "lof": lambda: LOFDetector(),
+    "ensemble-majority": lambda: EnsembleDetector(voting="majority"),
+    "ensemble-weighted": lambda: EnsembleDetector(voting="weighted")
+}
+OPERATIONS = ["fit", "score", "predict", "predict_with_scores"]
+DEFAULT_SIZES = "1e2,1e3,1e4,1e5"
+DEFAULT_BATCHES = "1,10,100,1e3,1e4,1e5"
+
+def parse_counts(text):
+    """Comma-separated counts, scientific notation allowed ("1e2,1e3")"""
+    counts = [int(float(item)) for item in text.split(",") if item.strip()]
+    if not counts or min(counts) < 1:
+        raise ValueError(f"counts must be positive integers: {text!r}")
+    return counts
+
+def make_series(n, rng):
+    """Gaussian series with 1% injected spikes"""
+    values = rng.normal(50, 5, n)
+    spikes = rng.random(n) < 0.01
+    values[spikes] += rng.uniform(30, 60, spikes.sum())
+    return values
+
+def peak_memory_mb(call):
+    """tracemalloc peak above the starting level while running call once"""
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return round(max(peak - baseline, 0) / 2**20, 3)
+
+def time_calls(call, min_time, max_repeats):
+    """Call repeatedly until min_time has elapsed; returns per-call durations"""
+    durations = []
+    total = 0.0
+    while not durations or (total < min_time and len(durations) < max_repeats):
+        start = time.perf_counter()
+        call()
+        elapsed = time.perf_counter() - start
+        durations.append(elapsed)
+        total += elapsed
+    return durations
+
+def measure(call, points, min_time, max_repeats):
+    """Result record for one case"""
+    peak = peak_memory_mb(call)
+    durations = time_calls(call, min_time, max_repeats)
+    wall = statistics.median(durations)
+    return {
+        "points": points,
+        "repeats": len(durations),
+        "wall_sec": wall,
+        "best_sec": min(durations),
+        "points_per_sec": round(points / wall) if wall > 0 else 0,
+        "peak_mem_mb": peak
+    }
+
+def case_key(detector, operation, size, batch=None):
+    key = f"{detector}/{operation}/n={size}"
+    return key if batch is None else f"{key}/batch={batch}"
+
+def run_suite(detectors, operations, sizes, batches, min_time, max_repeats, seed):
+    """
+    Benchmark every (detector, operation, size[, batch]) case
+
+    Returns:
+        Case key -> result record
+    """
+    rng = np.random.default_rng(seed)
+    score_data = {batch: make_series(batch, rng) for batch in batches}
+    results = {}
+    for name in detectors:
+        for size in sizes:
+            train = make_series(size, rng)
+            detector = DETECTORS[name]()
+            if "fit" in operations:
+                key = case_key(name, "fit", size)
+                results[key] = measure(lambda: detector.fit(train), size, min_time, max_repeats)
+                print(f"{key}: {results[key]['wall_sec'] * 1000:.3f} ms", file=sys.stderr)
+            else:
+                detector.fit(train)
+
+            for operation in operations:
+                if operation == "fit":
+                    continue
+                method = getattr(detector, operation)
+                for batch in batches:
+                    data = score_data[batch]
+                    key = case_key(name, operation, size, batch)
+                    results[key] = measure(lambda: method(data), batch, min_time, max_repeats)
+                    print(f"{key}: {results[key]['points_per_sec']} points/sec", file=sys.stderr)
+    return results
+
+def environment():
+    """Versions and host details stored next to the results"""
+    import sklearn
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count()
+    }
+
+def compare(baseline, current, threshold, mem_threshold, noise_floor):
+    """
+    Compare two result sets case by case
+
+    A case regresses when its median wall time grew by more than `threshold`
+    (relative) and by more than `noise_floor` seconds, or its peak memory grew
+    by more than `mem_threshold` (relative) and at least 1 MB.
+
+    Returns:
+        Dictionary with regressions, improvements, missing and new case lists
+    """
+    regressions = []
+    improvements = []
+    for key in sorted(set(baseline) & set(current)):
+        old, new = baseline[key], current[key]
+        ratio = new["wall_sec"] / old["wall_sec"] if old["wall_sec"] > 0 else 1.0
+        delta = new["wall_sec"] - old["wall_sec"]
+        entry = {"case": key, "baseline_sec": old["wall_sec"], "current_sec": new["wall_sec"],
+                 "ratio": round(ratio, 3)}
+        mem_grew = (new["peak_mem_mb"] - old["peak_mem_mb"] >= 1
+                    and new["peak_mem_mb"] > old["peak_mem_mb"] * (1 + mem_threshold))
+        if (ratio > 1 + threshold and delta > noise_floor) or mem_grew:
+            entry["baseline_mem_mb"] = old["peak_mem_mb"]
+            entry["current_mem_mb"] = new["peak_mem_mb"]
+            regressions.append(entry)
+        elif ratio < 1 - threshold and -delta > noise_floor:
+            improvements.append(entry)
+    return {
+        "regressions": regressions,
+        "improvements": improvements,
+        "missing": sorted(set(baseline) - set(current)),
+        "new": sorted(set(current) - set(baseline))
+    }
+
+def cmd_run(args):
+    detectors = args.detectors.split(",") if args.detectors else list(DETECTORS)
+    unknown = [name for name in detectors if name not in DETECTORS]
+    if unknown:
+        raise ValueError(f"Unknown detectors {unknown}; choose from {list(DETECTORS)}")
+    operations = args.operations.split(",") if args.operations else OPERATIONS
+    unknown = [op for op in operations if op not in OPERATIONS]
+    if unknown:
+        raise ValueError(f"Unknown operations {unknown}; choose from {OPERATIONS}")
+
+    results = run_suite(detectors, operations, parse_counts(args.sizes), parse_counts(args.batches),
+                        args.min_time, args.max_repeats, args.seed)
+    report = {"environment": environment(), "results": results}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"{len(results)} cases written to {args.output}")
+    return 0
+
+def cmd_compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    summary = compare(baseline["results"], current["results"],
+                      args.threshold, args.mem_threshold, args.noise_floor_us / 1e6)
+
+    for entry in summary["regressions"]:
+        print(f"REGRESSION {entry['case']}: {entry['baseline_sec'] * 1000:.3f} -> "
+              f"{entry['current_sec'] * 1000:.3f} ms (x{entry['ratio']}), "
+              f"{entry['baseline_mem_mb']} -> {entry['current_mem_mb']} MB")
+    for entry in summary["improvements"]:
+        print(f"improved   {entry['case']}: {entry['baseline_sec'] * 1000:.3f} -> "
+              f"{entry['current_sec'] * 1000:.3f} ms (x{entry['ratio']})")
+    if summary["missing"]:
+        print(f"{len(summary['missing'])} baseline cases not in the current run")
+    if summary["new"]:
+        print(f"{len(summary['new'])} new cases without a baseline")
+    print(f"{len(summary['regressions'])} regressions, {len(summary['improvements'])} improvements")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2, sort_keys=True)
+            f.write("\n")
+    return 1 if summary["regressions"] else 0
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the anomaly detectors and track regressions")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmark grid and write JSON results")
+    run.add_argument("--output", default="detector_bench.json", help="Results file (default: detector_bench.json)")
+    run.add_argument("--detectors", help=f"Comma-separated subset of: {', '.join(DETECTORS)}")
+    run.add_argument("--operations", help=f"Comma-separated subset of: {', '.join(OPERATIONS)}")
+    run.add_argument("--sizes", default=DEFAULT_SIZES,
+                     help=f"Training sizes (default: {DEFAULT_SIZES}; the grid goes up to 1e7)")
+    run.add_argument("--batches", default=DEFAULT_BATCHES, help=f"Scoring batch sizes (default: {DEFAULT_BATCHES})")
+    run.add_argument("--min-time", type=float, default=0.2, help="Seconds to spend timing each case (default: 0.2)")
+    run.add_argument("--max-repeats", type=int, default=1000, help="Calls per case at most (default: 1000)")
+    run.add_argument("--seed", type=int, default=0)
+
+    comp = commands.add_parser("compare", help="Flag regressions of a run against a baseline")
+    comp.add_argument("baseline", help="Baseline results JSON")
+    comp.add_argument("current", help="Current results JSON")
+    comp.add_argument("--threshold", type=float, default=0.2,
+                      help="Relative wall-time growth counted as a regression (default: 0.2)")
+    comp.add_argument("--mem-threshold", type=float, default=0.2,
+                      help="Relative peak-memory growth counted as a regression (default: 0.2)")
+    comp.add_argument("--noise-floor-us", type=float, default=20,
+                      help="Ignore wall-time changes smaller than this many microseconds (default: 20)")
+    comp.add_argument("--output", help="Also write the comparison as JSON")
+
+    args = parser.parse_args()
+    try:
+        status = cmd_run(args) if args.command == "run" else cmd_compare(args)
+    except ValueError as e:
+        parser.error(str(e))
+    sys.exit(status)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Accuracy vs. Latency Evaluation
+Scores every detector configuration against the generators' ground-truth
+labels and reports precision, recall and F1 next to scoring throughput,
+then the Pareto frontier over (points/sec, F1): the configurations no other
+configuration beats on both.
+
+Protocol per dataset (as in main.py): standard-normalize, fit on the first
+70% (unlabeled, anomalies included), predict the remaining 30%. Precision,
+recall and F1 are micro-averaged over all datasets; throughput is test
+points over the median predict time. StreamingDetector configurations run
+update_batch over the test set in chunks of STREAM_CHUNK points instead, the
+way the realtime loops use it.
+
+Usage:
+    python benchmarks/evaluate.py --output evaluation.json
+    python benchmarks/evaluate.py --target-f1 0.8 --datasets cpu,network,fraud
+"""
+import argparse
+import copy
+import json
+import os
+import statistics
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import generate_data, real_world_data
+from detector_bench import environment, time_calls
+from models import (StatisticalDetector, IsolationForestDetector, LOFDetector,
+                    EnsembleDetector, StreamingDetector)
+from utils.data_processor import TimeSeriesProcessor
+
+STREAM_CHUNK = 32
+
+# name -> (generator, value column, synthetic?)
+DATASETS = {
+    "cpu": (generate_data.generate_cpu_usage_data, "cpu_usage", True),
+    "network": (generate_data.generate_network_traffic_data, "traffic_mbps", True),
+    "sensor": (generate_data.generate_sensor_data, "temperature", True),
+    "financial": (generate_data.generate_financial_data, "price", True),
+    "fraud": (real_world_data.generate_fraud_detection_data, "transaction_amount", False),
+    "electricity": (real_world_data.generate_electricity_usage_data, "power_kwh", False),
+    "machine": (real_world_data.generate_machine_health_data, "temperature_celsius", False),
+    "server": (real_world_data.generate_server_traffic_data, "requests_per_min", False),
+    "stock": (real_world_data.generate_stock_risk_data, "volatility_percent", False),
+    "iot": (real_world_data.generate_iot_sensor_data, "air_quality_index", False)
+}
+
+def configurations():
+    """Config name -> detector factory for the whole evaluation grid"""
+    configs = {}
+    for threshold in (2.0, 2.5, 3.0, 3.5, 4.0):
+        configs[f"StatisticalDetector(zscore, threshold={threshold})"] = \
+            lambda t=threshold: StatisticalDetector(threshold=t, method="zscore")
+    for threshold in (1.5, 2.5, 3.5):
+        configs[f"StatisticalDetector(iqr, threshold={threshold})"] = \
+            lambda t=threshold: StatisticalDetector(threshold=t, method="iqr")
+    for window in (5, 10, 20):
+        for threshold in (2.5, 3.5):
+            configs[f"StatisticalDetector(moving_average, window={window}, threshold={threshold})"] = \
+                lambda w=window, t=threshold: StatisticalDetector(threshold=t, method="moving_average", window=w)
+    for contamination in (0.02, 0.05, 0.1):
+        configs[f"IsolationForestDetector(contamination={contamination})"] = \
+            lambda c=contamination: IsolationForestDetector(contamination=c)
+    for n_neighbors in (10, 20, 50):
+        for contamination in (0.02, 0.05, 0.1):
+            configs[f"LOFDetector(n_neighbors={n_neighbors}, contamination={contamination})"] = \
+                lambda k=n_neighbors, c=contamination: LOFDetector(n_neighbors=k, contamination=c)
+    for voting in ("majority", "weighted"):
+        configs[f"EnsembleDetector({voting})"] = lambda v=voting: EnsembleDetector(voting=v)
+    for alpha in (0.01, 0.05):
+        for threshold in (3.0, 4.0):
+            configs[f"StreamingDetector(alpha={alpha}, threshold={threshold})"] = \
+                lambda a=alpha, t=threshold: StreamingDetector(threshold=t, alpha=a)
+    return configs
+
+@contextmanager
+def scratch_directory():
+    """Run in a temporary directory (the real-world generators write data/<name>.csv)"""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "data"))
+        os.chdir(tmp)
+        try:
+            yield
+        finally:
+            os.chdir(previous)
+
+def load_datasets(names, n_samples, seed):
+    """
+    Generate the labeled datasets and split them
+
+    Returns:
+        Dataset name -> (train, test, test_labels), normalized on the train split
+    """
+    datasets = {}
+    for name in names:
+        generator, column, synthetic = DATASETS[name]
+        if synthetic:
+            np.random.seed(seed)
+            df, labels = generator(n_samples=n_samples, return_labels=True)
+        else:
+            # These generators reseed the global state themselves
+            with scratch_directory():
+                df, labels = generator(n_samples=n_samples, return_labels=True, seed=seed)
+
+        values = df[column].values.astype(float)
+        processor = TimeSeriesProcessor(normalization_method="standard")
+        train, test = processor.split_data(values, train_ratio=0.7)
+        _, test_labels = processor.split_data(labels, train_ratio=0.7)
+        datasets[name] = (processor.normalize(train, fit=True), processor.normalize(test, fit=False), test_labels)
+    return datasets
+
+def stream_predict(detector, data):
+    """Flags from feeding data through update_batch in STREAM_CHUNK-point chunks"""
+    flags = [detector.update_batch(data[i:i + STREAM_CHUNK])[1] for i in range(0, len(data), STREAM_CHUNK)]
+    return np.concatenate(flags).astype(int)
+
+def prf(tp, fp, fn):
+    """Precision, recall and F1 from confusion counts (0 where undefined)"""
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return round(precision, 4), round(recall, 4), round(f1, 4)
+
+def evaluate_config(factory, datasets, min_time, max_repeats):
+    """Accuracy and throughput of one configuration over all datasets"""
+    totals = np.zeros(3, dtype=int)
+    per_dataset = {}
+    fit_sec = 0.0
+    predict_sec = 0.0
+    points = 0
+
+    for name, (train, test, labels) in datasets.items():
+        detector = factory()
+        fit_sec += time_calls(lambda: detector.fit(train), 0, 1)[0]
+        if isinstance(detector, StreamingDetector):
+            # Every run starts from the fitted state
+            predictions = stream_predict(copy.deepcopy(detector), test)
+            durations = time_calls(lambda: stream_predict(copy.deepcopy(detector), test), min_time, max_repeats)
+        else:
+            predictions = np.asarray(detector.predict(test)).astype(int)
+            durations = time_calls(lambda: detector.predict(test), min_time, max_repeats)
+        predict_sec += statistics.median(durations)
+        points += len(test)
+
+        flagged = predictions == 1
+        actual = labels == 1
+        counts = np.array([np.sum(flagged & actual), np.sum(flagged & ~actual), np.sum(~flagged & actual)])
+        totals += counts
+        precision, recall, f1 = prf(*counts)
+        per_dataset[name] = {"precision": precision, "recall": recall, "f1": f1}
+
+    precision, recall, f1 = prf(*totals)
+    return {
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "points_per_sec": round(points / predict_sec) if predict_sec > 0 else 0,
+        "fit_sec": round(fit_sec, 6),
+        "per_dataset": per_dataset
+    }
+
+def pareto_frontier(results):
+    """
+    Configurations not dominated on (points_per_sec, f1), fastest first
+
+    Along the returned list throughput falls and F1 rises strictly, so the
+    first entry meeting an accuracy target is the fastest one that does.
+    """
+    ordered = sorted(results, key=lambda name: (-results[name]["points_per_sec"], -results[name]["f1"]))
+    frontier = []
+    best_f1 = -1.0
+    for name in ordered:
+        if results[name]["f1"] > best_f1:
+            frontier.append(name)
+            best_f1 = results[name]["f1"]
+    return frontier
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Evaluate detector accuracy against throughput")
+    parser.add_argument("--datasets", help=f"Comma-separated subset of: {', '.join(DATASETS)}")
+    parser.add_argument("--samples", type=int, default=2000, help="Points per dataset (default: 2000)")
+    parser.add_argument("--configs", help="Only configurations whose name contains this text")
+    parser.add_argument("--target-f1", type=float, help="Report the fastest configuration with at least this F1")
+    parser.add_argument("--min-time", type=float, default=0.1,
+                        help="Seconds to spend timing each prediction (default: 0.1)")
+    parser.add_argument("--max-repeats", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the full report to this JSON file")
+    args = parser.parse_args()
+
+    names = args.datasets.split(",") if args.datasets else list(DATASETS)
+    unknown = [name for name in names if name not in DATASETS]
+    if unknown:
+        parser.error(f"Unknown datasets {unknown}; choose from {list(DATASETS)}")
+    configs = {name: factory for name, factory in configurations().items()
+               if not args.configs or args.configs in name}
+    if not configs:
+        parser.error(f"No configuration matches {args.configs!r}")
+
+    datasets = load_datasets(names, args.samples, args.seed)
+    results = {}
+    for name, factory in configs.items():
+        results[name] = evaluate_config(factory, datasets, args.min_time, args.max_repeats)
+        print(f"{name}: F1 {results[name]['f1']:.3f}, {results[name]['points_per_sec']} points/sec",
+              file=sys.stderr)
+
+    frontier = pareto_frontier(results)
+    recommended = None
+    if args.target_f1 is not None:
+        recommended = next((name for name in frontier if results[name]["f1"] >= args.target_f1), None)
+
+    print(f"\nPareto frontier ({len(frontier)} of {len(results)} configurations, fastest first):")
+    print(f"{'configuration':<68} {'points/sec':>12} {'precision':>9} {'recall':>7} {'F1':>6}")
+    for name in frontier:
+        r = results[name]
+        print(f"{name:<68} {r['points_per_sec']:>12} {r['precision']:>9.3f} {r['recall']:>7.3f} {r['f1']:>6.3f}")
+    if args.target_f1 is not None:
+        print(f"\nFastest with F1 >= {args.target_f1}: {recommended or 'none'}")
+
+    if args.output:
+        report = {
+            "environment": environment(),
+            "datasets": names,
+            "samples": args.samples,
+            "seed": args.seed,
+            "results": results,
+            "frontier": frontier,
+            "target_f1": args.target_f1,
+            "recommended": recommended
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+if __name__ == "__main__":
+    main()
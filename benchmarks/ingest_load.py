@@ -0,0 +1,129 @@
+"""
+Ingest Load Generator
+Posts batches of synthetic points to a local /api/ingest endpoint from
+several keep-alive connections and reports throughput and response times.
+
+Usage:
+    python server.py                      # or: python web/app.py
+    python benchmarks/ingest_load.py --batch 10000 --connections 4 --duration 20
+    python benchmarks/ingest_load.py --format ndjson --batch 2000
+"""
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ingest import pack_points
+
+def build_batches(sources, batch_size, n_batches, fmt, seed=0):
+    """Pre-encode request bodies so the generator measures the server, not itself"""
+    rng = np.random.default_rng(seed)
+    batches = []
+    for _ in range(n_batches):
+        source_ids = rng.integers(0, len(sources), batch_size)
+        timestamps = time.time() + np.arange(batch_size) * 1e-3
+        values = rng.normal(50, 5, batch_size)
+        spikes = rng.random(batch_size) < 0.01
+        values[spikes] += rng.uniform(30, 60, spikes.sum())
+
+        if fmt == "packed":
+            batches.append(pack_points(source_ids, timestamps, values))
+        else:
+            batches.append("\n".join(
+                json.dumps({"source": sources[s], "ts": float(t), "value": float(v)})
+                for s, t, v in zip(source_ids, timestamps, values)
+            ).encode("utf-8"))
+    return batches
+
+def run_connection(host, port, batches, content_type, deadline, results, lock):
+    """Post batches back to back on one keep-alive connection until the deadline"""
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    latencies = []
+    points = 0
+    errors = 0
+    i = 0
+    try:
+        while time.monotonic() < deadline:
+            body = batches[i % len(batches)]
+            i += 1
+            start = time.perf_counter()
+            conn.request("POST", "/api/ingest", body=body, headers={"Content-Type": content_type})
+            response = conn.getresponse()
+            payload = response.read()
+            latencies.append(time.perf_counter() - start)
+            if response.status == 200:
+                points += json.loads(payload)["accepted"]
+            else:
+                errors += 1
+    except (OSError, http.client.HTTPException):
+        errors += 1
+    finally:
+        conn.close()
+
+    with lock:
+        results["latencies"].extend(latencies)
+        results["points"] += points
+        results["errors"] += errors
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Load-test the local /api/ingest endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--format", choices=["packed", "ndjson"], default="packed")
+    parser.add_argument("--batch", type=int, default=10000, help="Points per request (default: 10000)")
+    parser.add_argument("--connections", type=int, default=4, help="Concurrent connections (default: 4)")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to run (default: 10)")
+    args = parser.parse_args()
+
+    conn = http.client.HTTPConnection(args.host, args.port, timeout=10)
+    conn.request("GET", "/api/ingest")
+    sources = json.loads(conn.getresponse().read())["sources"]
+    conn.close()
+
+    batches = build_batches(sources, args.batch, 8, args.format)
+    content_type = "application/octet-stream" if args.format == "packed" else "application/x-ndjson"
+
+    results = {"latencies": [], "points": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+    threads = [
+        threading.Thread(target=run_connection,
+                         args=(args.host, args.port, batches, content_type, deadline, results, lock))
+        for _ in range(args.connections)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(results["latencies"]) * 1000
+    report = {
+        "format": args.format,
+        "batch": args.batch,
+        "connections": args.connections,
+        "requests": len(latencies_ms),
+        "errors": results["errors"],
+        "points": results["points"],
+        "elapsed_sec": round(elapsed, 2),
+        "points_per_sec": round(results["points"] / elapsed) if elapsed else 0,
+        "response_ms": {
+            "p50": round(float(np.percentile(latencies_ms, 50)), 2) if len(latencies_ms) else 0,
+            "p95": round(float(np.percentile(latencies_ms, 95)), 2) if len(latencies_ms) else 0,
+            "p99": round(float(np.percentile(latencies_ms, 99)), 2) if len(latencies_ms) else 0,
+            "max": round(float(np.max(latencies_ms)), 2) if len(latencies_ms) else 0
+        }
+    }
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
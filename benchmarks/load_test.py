@@ -0,0 +1,276 @@
+"""
+Dashboard and Ingest Load Test
+Simulates N concurrent dashboards polling a local server the way
+modern_dashboard.html does, optionally alongside open-loop ingest traffic,
+and reports throughput and p50/p95/p99 latency per endpoint as JSON.
+
+Dashboards (one keep-alive connection each, start times spread over one
+interval):
+    web     GET / and /api/get-anomaly-history on load, then every interval
+            the five /api/get-realtime-* endpoints and
+            /api/get-anomaly-history (the page's polling fallback)
+    server  GET /api/data/<source>?since=<cursor> for every source and
+            /api/stats every interval, revalidating with If-None-Match
+
+Ingest is open loop: requests are scheduled at --ingest-rate per second
+regardless of how fast the server answers, and latency is measured from the
+scheduled send time, so a server that falls behind shows it as queueing
+delay instead of silently lowering the offered load.
+
+The output is stable (sorted keys) so reports from two releases can be
+diffed directly. Only loopback hosts are accepted. The generator shares the
+machine with the server; on small hosts keep --dashboards modest or pin the
+two to different cores.
+
+Usage:
+    python web/app.py                     # or: python server.py
+    python benchmarks/load_test.py --target web --dashboards 50 --duration 30
+    python benchmarks/load_test.py --target server --port 5000 --ingest-rate 20 --output load.json
+"""
+import argparse
+import http.client
+import ipaddress
+import json
+import random
+import socket
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from ingest_load import build_batches
+
+WEB_REALTIME_ENDPOINTS = [
+    "/api/get-realtime-cpu",
+    "/api/get-realtime-financial",
+    "/api/get-realtime-network",
+    "/api/get-realtime-temperature",
+    "/api/get-realtime-stock"
+]
+
+def require_loopback(host):
+    """Refuse to generate load against anything but this machine"""
+    address = ipaddress.ip_address(socket.gethostbyname(host))
+    if not address.is_loopback:
+        raise ValueError(f"{host} resolves to {address}, not a loopback address")
+
+class Recorder:
+    """Thread-safe per-endpoint latency and error collection"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies = defaultdict(list)
+        self._errors = defaultdict(int)
+        self._not_modified = defaultdict(int)
+
+    def record(self, endpoint, seconds, status):
+        with self._lock:
+            self._latencies[endpoint].append(seconds)
+            if status == 304:
+                self._not_modified[endpoint] += 1
+            elif status >= 400:
+                self._errors[endpoint] += 1
+
+    def error(self, endpoint):
+        with self._lock:
+            self._errors[endpoint] += 1
+
+    def report(self, elapsed):
+        """Per-endpoint summary: requests, errors, req/s and latency percentiles"""
+        endpoints = {}
+        with self._lock:
+            names = set(self._latencies) | set(self._errors)
+            for name in sorted(names):
+                latencies_ms = np.array(self._latencies[name]) * 1000
+                endpoints[name] = {
+                    "requests": len(latencies_ms),
+                    "errors": self._errors[name],
+                    "not_modified": self._not_modified[name],
+                    "req_per_sec": round(len(latencies_ms) / elapsed, 2) if elapsed else 0,
+                    "latency_ms": {
+                        key: round(float(np.percentile(latencies_ms, q)), 2) if len(latencies_ms) else 0
+                        for key, q in (("p50", 50), ("p95", 95), ("p99", 99), ("max", 100))
+                    }
+                }
+        return endpoints
+
+def timed_get(conn, path, recorder, endpoint, headers=None):
+    """GET on a keep-alive connection; returns (status, body, headers) or None on failure"""
+    start = time.perf_counter()
+    try:
+        conn.request("GET", path, headers=headers or {})
+        response = conn.getresponse()
+        body = response.read()
+    except (OSError, http.client.HTTPException):
+        recorder.error(endpoint)
+        conn.close()
+        return None
+    recorder.record(endpoint, time.perf_counter() - start, response.status)
+    return response.status, body, response
+
+def run_web_dashboard(host, port, interval, deadline, recorder):
+    """One modern_dashboard.html tab on the polling fallback"""
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    time.sleep(random.uniform(0, interval))
+    timed_get(conn, "/", recorder, "/")
+    timed_get(conn, "/api/get-anomaly-history", recorder, "/api/get-anomaly-history")
+
+    next_tick = time.monotonic() + interval
+    while next_tick < deadline:
+        time.sleep(max(next_tick - time.monotonic(), 0))
+        for path in WEB_REALTIME_ENDPOINTS + ["/api/get-anomaly-history"]:
+            timed_get(conn, path, recorder, path)
+        next_tick += interval
+    conn.close()
+
+def remember_etag(etags, key, path, response):
+    """Keep the latest ETag per key, with the path it is valid for"""
+    etag = response.getheader("ETag")
+    if etag:
+        etags[key] = (path, etag)
+
+def revalidate(etags, key, path):
+    """If-None-Match headers when the stored ETag belongs to this path"""
+    stored = etags.get(key)
+    return {"If-None-Match": stored[1]} if stored and stored[0] == path else None
+
+def run_server_dashboard(host, port, sources, interval, deadline, recorder):
+    """One dashboard following every server.py source with since-cursors and ETags"""
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    cursors = {source: -1 for source in sources}
+    etags = {}
+    time.sleep(random.uniform(0, interval))
+
+    next_tick = time.monotonic()
+    while next_tick < deadline:
+        time.sleep(max(next_tick - time.monotonic(), 0))
+        for source in sources:
+            path = f"/api/data/{source}?since={cursors[source]}"
+            result = timed_get(conn, path, recorder, "/api/data/<source>", revalidate(etags, source, path))
+            if result and result[0] == 200:
+                cursors[source] = json.loads(result[1])["last_seq"]
+                remember_etag(etags, source, path, result[2])
+        result = timed_get(conn, "/api/stats", recorder, "/api/stats", revalidate(etags, "stats", "/api/stats"))
+        if result and result[0] == 200:
+            remember_etag(etags, "stats", "/api/stats", result[2])
+        next_tick += interval
+    conn.close()
+
+def run_ingest_sender(host, port, batches, schedule, deadline, recorder, totals, lock):
+    """
+    Take the next scheduled send time, wait for it and post one batch
+
+    Latency runs from the scheduled time, so time spent waiting for a free
+    sender (the server being slow) counts against the server.
+    """
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    while True:
+        with lock:
+            i = totals["scheduled"]
+            scheduled = schedule(i)
+            if scheduled >= deadline:
+                break
+            totals["scheduled"] += 1
+        time.sleep(max(scheduled - time.perf_counter(), 0))
+        try:
+            conn.request("POST", "/api/ingest", body=batches[i % len(batches)],
+                         headers={"Content-Type": "application/octet-stream"})
+            response = conn.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException):
+            recorder.error("/api/ingest")
+            conn.close()
+            continue
+        recorder.record("/api/ingest", time.perf_counter() - scheduled, response.status)
+        if response.status == 200:
+            with lock:
+                totals["points"] += json.loads(payload)["accepted"]
+    conn.close()
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Load-test local dashboards and ingest")
+    parser.add_argument("--target", choices=["web", "server"], default="web",
+                        help="web/app.py or server.py endpoint set (default: web)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--dashboards", type=int, default=20, help="Concurrent dashboards (default: 20)")
+    parser.add_argument("--interval", type=float, default=3.0,
+                        help="Dashboard polling interval in seconds (default: 3, as in the page)")
+    parser.add_argument("--ingest-rate", type=float, default=0,
+                        help="Open-loop ingest requests per second (default: 0, off)")
+    parser.add_argument("--ingest-batch", type=int, default=1000, help="Points per ingest request (default: 1000)")
+    parser.add_argument("--ingest-senders", type=int, default=8,
+                        help="Connections available to the ingest schedule (default: 8)")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run (default: 30)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    try:
+        require_loopback(args.host)
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+    random.seed(args.seed)
+
+    conn = http.client.HTTPConnection(args.host, args.port, timeout=10)
+    conn.request("GET", "/api/ingest")
+    sources = json.loads(conn.getresponse().read())["sources"]
+    conn.close()
+
+    recorder = Recorder()
+    lock = threading.Lock()
+    totals = {"scheduled": 0, "points": 0}
+    start = time.perf_counter()
+    deadline = time.monotonic() + args.duration
+
+    threads = []
+    for _ in range(args.dashboards):
+        if args.target == "web":
+            target = run_web_dashboard
+            thread_args = (args.host, args.port, args.interval, deadline, recorder)
+        else:
+            target = run_server_dashboard
+            thread_args = (args.host, args.port, sources, args.interval, deadline, recorder)
+        threads.append(threading.Thread(target=target, args=thread_args, daemon=True))
+    if args.ingest_rate > 0:
+        batches = build_batches(sources, args.ingest_batch, 8, "packed", seed=args.seed)
+        ingest_deadline = start + args.duration
+        schedule = lambda i: start + i / args.ingest_rate
+        threads += [
+            threading.Thread(target=run_ingest_sender, daemon=True,
+                             args=(args.host, args.port, batches, schedule, ingest_deadline,
+                                   recorder, totals, lock))
+            for _ in range(args.ingest_senders)
+        ]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "target": args.target,
+        "dashboards": args.dashboards,
+        "interval_sec": args.interval,
+        "duration_sec": args.duration,
+        "elapsed_sec": round(elapsed, 2),
+        "ingest": {
+            "rate": args.ingest_rate,
+            "batch": args.ingest_batch,
+            "scheduled": totals["scheduled"],
+            "points_accepted": totals["points"],
+            "points_per_sec": round(totals["points"] / elapsed) if elapsed else 0
+        },
+        "endpoints": recorder.report(elapsed)
+    }
+    output = json.dumps(report, indent=2, sort_keys=True)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+PointStore Throughput Benchmark
+Feeds a PointStore from several producer threads at an offered rate for a
+fixed duration and reports sustained committed rows/sec, dropped rows, enqueue cost seen by the producers
+(the detection loop's only write cost) and time-range query latency.
+
+Usage:
+    python benchmarks/sqlite_store_bench.py --duration 10 --batch 1000 --rate 50000
+    python benchmarks/sqlite_store_bench.py --rate 0                  # unthrottled
+    python benchmarks/sqlite_store_bench.py --batch 1 --producers 1   # per-point writes
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.sqlite_store import PointStore
+
+def percentiles_us(samples):
+    """p50/p99/max of a list of seconds, in microseconds"""
+    if not samples:
+        return {"p50": 0, "p99": 0, "max": 0}
+    arr = np.array(samples) * 1e6
+    return {
+        "p50": round(float(np.percentile(arr, 50)), 2),
+        "p99": round(float(np.percentile(arr, 99)), 2),
+        "max": round(float(np.max(arr)), 2)
+    }
+
+def produce(store, source, batch, rate, deadline, latencies, lock, seed):
+    """Enqueue batches of points for one source at `rate` points/sec until the deadline"""
+    rng = np.random.default_rng(seed)
+    values = rng.normal(50, 5, batch)
+    flags = rng.random(batch) < 0.01
+    local = []
+    next_send = time.monotonic()
+    while time.monotonic() < deadline:
+        if rate > 0:
+            next_send += batch / rate
+            delay = next_send - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        timestamps = time.time() + np.arange(batch) * 1e-6
+        start = time.perf_counter()
+        if batch == 1:
+            store.add_point(source, float(timestamps[0]), float(values[0]), bool(flags[0]))
+        else:
+            store.add_points(source, timestamps, values, flags)
+        local.append(time.perf_counter() - start)
+        if rate <= 0:
+            time.sleep(0)  # let other producers and the writer run
+    with lock:
+        latencies.extend(local)
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Measure sustained PointStore insert throughput")
+    parser.add_argument("--db", default=None, help="Database path (default: temporary file)")
+    parser.add_argument("--producers", type=int, default=3, help="Producer threads / sources (default: 3)")
+    parser.add_argument("--batch", type=int, default=1000, help="Points per enqueue call (default: 1000)")
+    parser.add_argument("--rate", type=float, default=50000,
+                        help="Offered points/sec per producer, 0 for unthrottled (default: 50000)")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to produce (default: 10)")
+    parser.add_argument("--store-batch", type=int, default=5000, help="Rows per transaction (default: 5000)")
+    args = parser.parse_args()
+
+    tmpdir = None
+    path = args.db
+    if path is None:
+        tmpdir = tempfile.mkdtemp()
+        path = os.path.join(tmpdir, "points.db")
+
+    store = PointStore(path, batch_size=args.store_batch)
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+    threads = [
+        threading.Thread(target=produce,
+                         args=(store, f"source_{i}", args.batch, args.rate, deadline, latencies, lock, i))
+        for i in range(args.producers)
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    produced = time.perf_counter() - start
+    store.flush()
+    committed = time.perf_counter() - start
+
+    query_latencies = []
+    now = time.time()
+    for _ in range(50):
+        started = time.perf_counter()
+        store.points("source_0", now - 1, now, limit=1000)
+        query_latencies.append(time.perf_counter() - started)
+    anomaly_latencies = []
+    for _ in range(50):
+        started = time.perf_counter()
+        store.points("source_0", now - 60, now, limit=100, anomalies_only=True)
+        anomaly_latencies.append(time.perf_counter() - started)
+
+    stats = dict(store.stats)
+    store.close()
+    db_bytes = sum(
+        os.path.getsize(path + suffix) for suffix in ("", "-wal", "-shm") if os.path.exists(path + suffix)
+    )
+
+    report = {
+        "producers": args.producers,
+        "batch": args.batch,
+        "store_batch": args.store_batch,
+        "offered_rows_per_sec": round(args.rate * args.producers) if args.rate > 0 else "unthrottled",
+        "rows_committed": stats["points"],
+        "commits": stats["commits"],
+        "rows_dropped": stats["dropped"],
+        "produce_sec": round(produced, 2),
+        "commit_sec": round(committed, 2),
+        "rows_per_sec": round(stats["points"] / committed) if committed else 0,
+        "enqueue_us": percentiles_us(latencies),
+        "range_query_us": percentiles_us(query_latencies),
+        "anomaly_query_us": percentiles_us(anomaly_latencies),
+        "db_mb": round(db_bytes / 1e6, 1)
+    }
+    print(json.dumps(report, indent=2))
+
+    if tmpdir is not None:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        os.rmdir(tmpdir)
+
+if __name__ == "__main__":
+    main()
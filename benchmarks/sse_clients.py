@@ -0,0 +1,108 @@
+"""
+Simulated SSE Dashboard Clients
+Opens many concurrent /api/stream connections against a local server and
+reports delivered events, bytes and fan-out spread across clients.
+
+Usage:
+    python server.py                      # or: python web/app.py
+    python benchmarks/sse_clients.py --clients 200 --duration 30
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+
+def run_client(host, port, path, duration, arrivals, totals, lock, stop):
+    """Read one SSE stream until the duration elapses"""
+    conn = http.client.HTTPConnection(host, port, timeout=duration + 30)
+    try:
+        conn.request("GET", path, headers={"Accept": "text/event-stream"})
+        response = conn.getresponse()
+        deadline = time.monotonic() + duration
+        events = 0
+        n_bytes = 0
+
+        while not stop.is_set() and time.monotonic() < deadline:
+            line = response.fp.readline()
+            if not line:
+                break
+            n_bytes += len(line)
+            if line.startswith(b"id: "):
+                event_id = int(line[4:])
+                now = time.perf_counter()
+                events += 1
+                with lock:
+                    arrivals[event_id].append(now)
+
+        with lock:
+            totals["events"] += events
+            totals["bytes"] += n_bytes
+            totals["completed"] += 1
+    except (OSError, http.client.HTTPException):
+        with lock:
+            totals["errors"] += 1
+    finally:
+        conn.close()
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Simulate many SSE dashboard clients against localhost")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--path", default="/api/stream")
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent connections (default: 100)")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds to stay connected (default: 20)")
+    args = parser.parse_args()
+
+    arrivals = defaultdict(list)
+    totals = defaultdict(int)
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    threads = [
+        threading.Thread(
+            target=run_client,
+            args=(args.host, args.port, args.path, args.duration, arrivals, totals, lock, stop),
+            daemon=True
+        )
+        for _ in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        stop.set()
+    elapsed = time.perf_counter() - start
+
+    # Fan-out spread: how long after the first client each other client got the same event
+    spreads_ms = [
+        (max(times) - min(times)) * 1000
+        for times in arrivals.values() if len(times) > 1
+    ]
+
+    report = {
+        "clients": args.clients,
+        "completed": totals["completed"],
+        "errors": totals["errors"],
+        "elapsed_sec": round(elapsed, 2),
+        "distinct_events": len(arrivals),
+        "events_delivered": totals["events"],
+        "events_per_sec": round(totals["events"] / elapsed, 1) if elapsed else 0,
+        "bytes_per_client": round(totals["bytes"] / max(args.clients, 1)),
+        "fanout_spread_ms": {
+            "p50": round(float(np.percentile(spreads_ms, 50)), 2) if spreads_ms else 0,
+            "p99": round(float(np.percentile(spreads_ms, 99)), 2) if spreads_ms else 0,
+            "max": round(float(np.max(spreads_ms)), 2) if spreads_ms else 0
+        }
+    }
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,7 @@ class Config:
     # Model parameters
     ANOMALY_THRESHOLD = 2.5  # Z-score threshold
     SENSITIVITY = "medium"  # low, medium, high
+    EVENT_GAP_TOLERANCE = int(os.getenv("EVENT_GAP_TOLERANCE", 2))  # normal points allowed inside one anomaly event
     
     # Data parameters
     TRAIN_TEST_SPLIT = 0.8
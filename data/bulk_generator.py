@@ -0,0 +1,279 @@
+"""
+Vectorized, seedable high-volume synthetic data generator
+
+Produces many independent series with labeled injected anomalies and writes
+them chunk by chunk in the packed ingest format (utils/ingest.py), so tens of
+millions of points never have to be held in memory at once.
+
+Every series draws from its own np.random.Generator substreams spawned from
+one SeedSequence, so a series' values and labels depend only on the seed and
+its index: not on the number of series, the chunk size or generation order
+(random walks are accumulated strictly left to right from the carried
+level, so even they come out bit-identical for any chunking).
+
+Files written for an output prefix:
+    <prefix>.bin     packed (uint16 source index, float64 ts, float64 value) records,
+                     time-major (all series at step t, then step t + 1, ...)
+    <prefix>.labels  one uint8 per record, 0 = normal, else 1 + index in ANOMALY_KINDS
+    <prefix>.json    generation parameters and counts
+
+The servers' /api/ingest only accepts the source indices listed by
+GET /api/ingest (3 on server.py, 5 on web/app.py); --sources N writes series
+i under source index i % N so a file with more series can be replayed there.
+
+Usage:
+    python data/bulk_generator.py --series 2000 --points 20000000 --output /tmp/bulk
+    python data/bulk_generator.py --series 50 --sources 5 --points 1e6 --output /tmp/web
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+from typing import Iterator, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ingest import POINT_DTYPE
+
+SERIES_KINDS = ("seasonal", "random_walk", "traffic")
+ANOMALY_KINDS = ("spike", "level_shift", "drift", "dropout", "noise_burst")
+# Relative frequency of each anomaly kind among onsets
+ANOMALY_WEIGHTS = np.array([0.4, 0.2, 0.15, 0.1, 0.15])
+_CUMULATIVE_WEIGHTS = np.cumsum(ANOMALY_WEIGHTS) / ANOMALY_WEIGHTS.sum()
+# Duration range in steps per anomaly kind
+ANOMALY_DURATIONS = {"spike": (1, 1), "level_shift": (20, 200), "drift": (50, 500),
+                     "dropout": (5, 50), "noise_burst": (20, 200)}
+
+class SyntheticSeries:
+    """One series: base pattern plus injected anomalies, generated a chunk at a time"""
+
+    def __init__(self, seed_sequence: np.random.SeedSequence, anomaly_rate: float):
+        """
+        Initialize series
+
+        Args:
+            seed_sequence: This series' SeedSequence (spawned from the run seed)
+            anomaly_rate: Probability that an anomaly starts at any step
+        """
+        params, noise, onsets, anomalies = [np.random.default_rng(s) for s in seed_sequence.spawn(4)]
+        self._noise_rng = noise
+        self._onset_rng = onsets
+        self._anomaly_rng = anomalies
+        self.anomaly_rate = anomaly_rate
+
+        self.kind = SERIES_KINDS[int(params.integers(len(SERIES_KINDS)))]
+        self.level = float(params.uniform(10, 1000))
+        self.scale = float(self.level * params.uniform(0.01, 0.05))
+        self.amplitude = float(self.level * params.uniform(0.05, 0.3))
+        self.period = float(params.uniform(50, 2000))
+        self.phase = float(params.uniform(0, 2 * np.pi))
+        self._walk = 0.0
+        # Anomaly segments still running past the last chunk: (code, start, end, sign, magnitude)
+        self._active = []
+
+    def generate(self, t0: int, n_steps: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Values and labels for steps t0 .. t0 + n_steps - 1 (call with consecutive ranges)
+
+        Args:
+            t0: First step of the chunk
+            n_steps: Chunk length
+
+        Returns:
+            Tuple of (values, labels) arrays
+        """
+        t = np.arange(t0, t0 + n_steps)
+        noise = self._noise_rng.standard_normal(n_steps)
+        seasonal = self.amplitude * np.sin(2 * np.pi * t / self.period + self.phase)
+
+        if self.kind == "seasonal":
+            values = self.level + seasonal + self.scale * noise
+        elif self.kind == "random_walk":
+            # Sequential sum seeded with the carried level: the same additions
+            # in the same order whatever the chunk boundaries
+            walk = np.cumsum(np.concatenate(([self._walk], noise * self.scale * 0.2)))[1:]
+            self._walk = float(walk[-1])
+            values = self.level + walk
+        else:
+            values = (self.level + seasonal) * np.exp(0.1 * noise)
+
+        labels = np.zeros(n_steps, dtype=np.uint8)
+        segments = self._active
+        busy_until = max((end for _, _, end, _, _ in segments), default=t0)
+        # Every onset consumes the same draws, skipped or not, so the
+        # streams stay aligned whatever the chunking
+        for offset in np.flatnonzero(self._onset_rng.random(n_steps) < self.anomaly_rate):
+            pick, magnitude, length, sign = self._anomaly_rng.random(4)
+            start = t0 + int(offset)
+            if start < busy_until:
+                continue
+            code = min(int(np.searchsorted(_CUMULATIVE_WEIGHTS, pick, side="right")), len(ANOMALY_KINDS) - 1)
+            low, high = ANOMALY_DURATIONS[ANOMALY_KINDS[code]]
+            end = start + low + int(length * (high - low + 1))
+            segments.append((code, start, end, 1.0 if sign < 0.5 else -1.0, float(magnitude)))
+            busy_until = end
+
+        self._active = []
+        for segment in segments:
+            self._apply(segment, t0, values, labels, noise)
+            if segment[2] > t0 + n_steps:
+                self._active.append(segment)
+        return values, labels
+
+    def _apply(self, segment, t0, values, labels, noise):
+        """Inject the part of one anomaly segment that falls in this chunk"""
+        code, start, end, sign, magnitude = segment
+        lo = max(start, t0) - t0
+        hi = min(end, t0 + len(values)) - t0
+        if lo >= hi:
+            return
+        kind = ANOMALY_KINDS[code]
+        if kind == "spike":
+            values[lo:hi] += sign * (4 + 6 * magnitude) * self.scale
+        elif kind == "level_shift":
+            values[lo:hi] += sign * (3 + 3 * magnitude) * self.scale
+        elif kind == "drift":
+            progress = (np.arange(lo, hi) + t0 - start + 1) / (end - start)
+            values[lo:hi] += sign * (4 + 4 * magnitude) * self.scale * progress
+        elif kind == "dropout":
+            values[lo:hi] = 0.0
+        else:
+            values[lo:hi] += (2 + 3 * magnitude) * self.scale * noise[lo:hi]
+        labels[lo:hi] = code + 1
+
+class BulkGenerator:
+    """Many SyntheticSeries advanced together in time-major chunks"""
+
+    def __init__(self, n_series: int, seed: int = 0, anomaly_rate: float = 0.002,
+                 start: float = 1704067200.0, interval: float = 1.0, n_sources: int = None):
+        """
+        Initialize generator
+
+        Args:
+            n_series: Number of series
+            seed: Run seed; each series gets independent substreams spawned from it
+            anomaly_rate: Probability that an anomaly starts at any step of a series
+            start: Unix timestamp of step 0 (fixed, so output is reproducible)
+            interval: Seconds between steps
+            n_sources: Source indices to write (series i gets i % n_sources;
+                       default n_series, one index per series)
+        """
+        if not 0 < n_series <= np.iinfo(np.uint16).max + 1:
+            raise ValueError(f"n_series must be between 1 and {np.iinfo(np.uint16).max + 1}")
+        if n_sources is None:
+            n_sources = n_series
+        if not 0 < n_sources <= np.iinfo(np.uint16).max + 1:
+            raise ValueError(f"n_sources must be between 1 and {np.iinfo(np.uint16).max + 1}")
+        if not 0 <= anomaly_rate < 1:
+            raise ValueError("anomaly_rate must be in [0, 1)")
+        self.n_series = n_series
+        self.n_sources = n_sources
+        self.seed = seed
+        self.anomaly_rate = anomaly_rate
+        self.start = start
+        self.interval = interval
+        self.series = [SyntheticSeries(s, anomaly_rate) for s in np.random.SeedSequence(seed).spawn(n_series)]
+
+    def chunks(self, n_steps: int, chunk_points: int = 1_000_000) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Generate n_steps steps of every series, chunk_points points at a time
+
+        Args:
+            n_steps: Steps per series
+            chunk_points: Approximate points per chunk (whole steps across all series)
+
+        Returns:
+            Iterator of (records, labels): POINT_DTYPE records in time-major
+            order and the aligned uint8 labels
+        """
+        steps_per_chunk = max(1, chunk_points // self.n_series)
+        source_ids = (np.arange(self.n_series) % self.n_sources).astype(np.uint16)
+        values = np.empty((self.n_series, steps_per_chunk))
+        labels = np.empty((self.n_series, steps_per_chunk), dtype=np.uint8)
+
+        for t0 in range(0, n_steps, steps_per_chunk):
+            n = min(steps_per_chunk, n_steps - t0)
+            for i, series in enumerate(self.series):
+                values[i, :n], labels[i, :n] = series.generate(t0, n)
+
+            records = np.empty(n * self.n_series, dtype=POINT_DTYPE)
+            records["source"] = np.tile(source_ids, n)
+            records["ts"] = np.repeat(self.start + np.arange(t0, t0 + n) * self.interval, self.n_series)
+            records["value"] = values[:, :n].T.ravel()
+            yield records, labels[:, :n].T.ravel()
+
+    def write(self, prefix: str, n_steps: int, chunk_points: int = 1_000_000) -> dict:
+        """
+        Stream the dataset to <prefix>.bin, <prefix>.labels and <prefix>.json
+
+        Args:
+            prefix: Output path prefix
+            n_steps: Steps per series
+            chunk_points: Approximate points held in memory at once
+
+        Returns:
+            Manifest written to <prefix>.json
+        """
+        counts = np.zeros(len(ANOMALY_KINDS) + 1, dtype=np.int64)
+        with open(prefix + ".bin", "wb") as points_file, open(prefix + ".labels", "wb") as labels_file:
+            for records, labels in self.chunks(n_steps, chunk_points):
+                points_file.write(records.tobytes())
+                labels_file.write(labels.tobytes())
+                counts += np.bincount(labels, minlength=len(counts))
+
+        manifest = {
+            "format": "packed (uint16 source, float64 ts, float64 value), little-endian",
+            "record_bytes": POINT_DTYPE.itemsize,
+            "series": self.n_series,
+            "sources": self.n_sources,
+            "steps": n_steps,
+            "points": int(counts.sum()),
+            "seed": self.seed,
+            "anomaly_rate": self.anomaly_rate,
+            "start": self.start,
+            "interval": self.interval,
+            "series_kinds": [series.kind for series in self.series],
+            "label_codes": {0: "normal", **{i + 1: kind for i, kind in enumerate(ANOMALY_KINDS)}},
+            "label_counts": {"normal": int(counts[0]),
+                             **{kind: int(counts[i + 1]) for i, kind in enumerate(ANOMALY_KINDS)}}
+        }
+        with open(prefix + ".json", "w") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Generate a large labeled dataset in the packed ingest format")
+    parser.add_argument("--series", type=int, default=1000, help="Number of series (default: 1000)")
+    parser.add_argument("--points", type=float, default=1e7,
+                        help="Total points, rounded up to whole steps (default: 1e7)")
+    parser.add_argument("--sources", type=int,
+                        help="Write series i as source index i %% N, to fit a server's source list "
+                             "(default: one index per series)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--anomaly-rate", type=float, default=0.002,
+                        help="Anomaly onsets per point (default: 0.002)")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between steps (default: 1)")
+    parser.add_argument("--chunk-points", type=int, default=1_000_000,
+                        help="Points generated per chunk (default: 1000000)")
+    parser.add_argument("--output", required=True, help="Output path prefix")
+    args = parser.parse_args()
+
+    try:
+        generator = BulkGenerator(args.series, seed=args.seed, anomaly_rate=args.anomaly_rate,
+                                  interval=args.interval, n_sources=args.sources)
+    except ValueError as e:
+        parser.error(str(e))
+    n_steps = -(-int(args.points) // args.series)
+
+    started = time.perf_counter()
+    manifest = generator.write(args.output, n_steps, args.chunk_points)
+    elapsed = time.perf_counter() - started
+    print(f"[OK] {manifest['points']:,} points over {args.series} series in {elapsed:.1f}s "
+          f"({manifest['points'] / elapsed:,.0f} points/sec) -> {args.output}.bin")
+    print(f"     Labels: {manifest['label_counts']}")
+
+if __name__ == "__main__":
+    main()
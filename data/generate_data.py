@@ -4,17 +4,36 @@ Generate synthetic time-series data for demonstration
 import numpy as np
 import pandas as pd
 import os
+from typing import Tuple, Union
 
-def generate_cpu_usage_data(n_samples: int = 1000, anomaly_percentage: float = 0.05) -> pd.DataFrame:
+def labels_from_indices(n_samples: int, anomaly_indices: np.ndarray) -> np.ndarray:
+    """
+    Ground-truth label array for injected anomalies
+    
+    Args:
+        n_samples: Number of data points
+        anomaly_indices: Positions where anomalies were injected
+        
+    Returns:
+        Integer array (1 = injected anomaly, 0 = normal)
+    """
+    labels = np.zeros(n_samples, dtype=int)
+    labels[anomaly_indices] = 1
+    return labels
+
+def generate_cpu_usage_data(n_samples: int = 1000, anomaly_percentage: float = 0.05,
+                            return_labels: bool = False) -> Union[pd.DataFrame, Tuple[pd.DataFrame, np.ndarray]]:
     """
     Generate synthetic CPU usage data with anomalies
     
     Args:
         n_samples: Number of data points
         anomaly_percentage: Percentage of anomalies to inject
+        return_labels: Also return the ground-truth labels
         
     Returns:
-        DataFrame with timestamp and cpu_usage columns
+        DataFrame with timestamp and cpu_usage columns, or (DataFrame, labels)
+        with labels[i] = 1 where an anomaly was injected
     """
     # Normal pattern: cyclic behavior with daily peaks
     t = np.arange(n_samples)
@@ -33,11 +52,14 @@ def generate_cpu_usage_data(n_samples: int = 1000, anomaly_percentage: float = 0
         'cpu_usage': base
     })
     
-    return df
+    return (df, labels_from_indices(n_samples, anomaly_indices)) if return_labels else df
 
-def generate_network_traffic_data(n_samples: int = 1000, anomaly_percentage: float = 0.05) -> pd.DataFrame:
+def generate_network_traffic_data(n_samples: int = 1000, anomaly_percentage: float = 0.05,
+                                  return_labels: bool = False) -> Union[pd.DataFrame, Tuple[pd.DataFrame, np.ndarray]]:
     """
     Generate synthetic network traffic data
+    
+    With return_labels=True returns (DataFrame, labels) like generate_cpu_usage_data
     """
     t = np.arange(n_samples)
     # Weekly pattern
@@ -55,11 +77,14 @@ def generate_network_traffic_data(n_samples: int = 1000, anomaly_percentage: flo
         'traffic_mbps': base
     })
     
-    return df
+    return (df, labels_from_indices(n_samples, anomaly_indices)) if return_labels else df
 
-def generate_sensor_data(n_samples: int = 1000, anomaly_percentage: float = 0.05) -> pd.DataFrame:
+def generate_sensor_data(n_samples: int = 1000, anomaly_percentage: float = 0.05,
+                         return_labels: bool = False) -> Union[pd.DataFrame, Tuple[pd.DataFrame, np.ndarray]]:
     """
     Generate synthetic sensor data (temperature)
+    
+    With return_labels=True returns (DataFrame, labels) like generate_cpu_usage_data
     """
     t = np.arange(n_samples)
     # Seasonal pattern
@@ -77,11 +102,14 @@ def generate_sensor_data(n_samples: int = 1000, anomaly_percentage: float = 0.05
         'temperature': base
     })
     
-    return df
+    return (df, labels_from_indices(n_samples, anomaly_indices)) if return_labels else df
 
-def generate_financial_data(n_samples: int = 1000, anomaly_percentage: float = 0.05) -> pd.DataFrame:
+def generate_financial_data(n_samples: int = 1000, anomaly_percentage: float = 0.05,
+                            return_labels: bool = False) -> Union[pd.DataFrame, Tuple[pd.DataFrame, np.ndarray]]:
     """
     Generate synthetic financial data (stock price)
+    
+    With return_labels=True returns (DataFrame, labels) like generate_cpu_usage_data
     """
     t = np.arange(n_samples)
     # Random walk with drift
@@ -98,7 +126,7 @@ def generate_financial_data(n_samples: int = 1000, anomaly_percentage: float = 0
         'price': price
     })
     
-    return df
+    return (df, labels_from_indices(n_samples, anomaly_indices)) if return_labels else df
 
 def save_all_datasets(data_dir: str = '.') -> None:
     """
@@ -1,28 +1,35 @@
 """
 Real-world time-series data generators for various domains
+
+Every generator takes return_labels=True to also return the per-sample
+ground truth (1 = drawn from the anomalous branch) as (DataFrame, labels),
+and seeds NumPy's global random state with seed (default 42) first.
 """
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
-def generate_fraud_detection_data(n_samples=500):
+def generate_fraud_detection_data(n_samples=500, return_labels=False, seed=42):
     """
     Bank/UPI Fraud Detection
     Normal: 100-5000 rupees, Regular patterns
     Anomaly: Sudden large transactions, unusual times
     """
-    np.random.seed(42)
+    np.random.seed(seed)
     data = []
+    labels = []
     
     for i in range(n_samples):
         # 90% normal transactions
-        if np.random.random() < 0.9:
+        is_anomaly = np.random.random() >= 0.9
+        if not is_anomaly:
             amount = np.random.normal(1500, 800)  # Normal distribution
             amount = max(100, min(5000, amount))
         else:
             # 10% anomalous transactions (fraud)
             amount = np.random.uniform(10000, 50000)
         
+        labels.append(int(is_anomaly))
         data.append({
             'transaction_amount': amount,
             'timestamp': datetime.now() - timedelta(seconds=(n_samples-i)*10)
@@ -30,16 +37,17 @@ def generate_fraud_detection_data(n_samples=500):
     
     df = pd.DataFrame(data)
     df.to_csv('data/fraud_detection.csv', index=False)
-    return df
+    return (df, np.array(labels)) if return_labels else df
 
-def generate_electricity_usage_data(n_samples=500):
+def generate_electricity_usage_data(n_samples=500, return_labels=False, seed=42):
     """
     Electricity & Water Usage Monitoring
     Normal: 20-80 kWh daily, peaks during day
     Anomaly: Sudden spikes (equipment malfunction)
     """
-    np.random.seed(42)
+    np.random.seed(seed)
     data = []
+    labels = []
     
     for i in range(n_samples):
         hour = (i // 20) % 24
@@ -51,12 +59,14 @@ def generate_electricity_usage_data(n_samples=500):
             base = 30 + np.random.normal(0, 5)
         
         # 95% normal
-        if np.random.random() < 0.95:
+        is_anomaly = np.random.random() >= 0.95
+        if not is_anomaly:
             consumption = base
         else:
             # 5% anomalous (sudden spike/drop)
             consumption = np.random.uniform(120, 200)
         
+        labels.append(int(is_anomaly))
         data.append({
             'power_kwh': max(5, consumption),
             'timestamp': datetime.now() - timedelta(seconds=(n_samples-i)*30)
@@ -64,20 +74,22 @@ def generate_electricity_usage_data(n_samples=500):
     
     df = pd.DataFrame(data)
     df.to_csv('data/electricity_usage.csv', index=False)
-    return df
+    return (df, np.array(labels)) if return_labels else df
 
-def generate_machine_health_data(n_samples=500):
+def generate_machine_health_data(n_samples=500, return_labels=False, seed=42):
     """
     Machine Health Monitoring
     Normal: Temperature 60-80°C, Vibration 0.5-2.0 Hz
     Anomaly: Overheating or high vibration indicates failure
     """
-    np.random.seed(42)
+    np.random.seed(seed)
     data = []
+    labels = []
     
     for i in range(n_samples):
         # 92% normal operation
-        if np.random.random() < 0.92:
+        is_anomaly = np.random.random() >= 0.92
+        if not is_anomaly:
             temp = np.random.normal(70, 5)  # Normal temp
             vibration = np.random.normal(1.2, 0.3)  # Normal vibration
         else:
@@ -85,6 +97,7 @@ def generate_machine_health_data(n_samples=500):
             temp = np.random.uniform(95, 120)  # Overheating
             vibration = np.random.uniform(4.0, 8.0)  # High vibration
         
+        labels.append(int(is_anomaly))
         data.append({
             'temperature_celsius': max(50, temp),
             'vibration_hz': max(0.1, vibration),
@@ -93,20 +106,22 @@ def generate_machine_health_data(n_samples=500):
     
     df = pd.DataFrame(data)
     df.to_csv('data/machine_health.csv', index=False)
-    return df
+    return (df, np.array(labels)) if return_labels else df
 
-def generate_server_traffic_data(n_samples=500):
+def generate_server_traffic_data(n_samples=500, return_labels=False, seed=42):
     """
     Server & Network Traffic Monitoring
     Normal: 1000-5000 requests/min, steady
     Anomaly: DDoS attack (10000+) or server down (0-100)
     """
-    np.random.seed(42)
+    np.random.seed(seed)
     data = []
+    labels = []
     
     for i in range(n_samples):
         # 88% normal traffic
-        if np.random.random() < 0.88:
+        is_anomaly = np.random.random() >= 0.88
+        if not is_anomaly:
             requests = np.random.normal(2500, 800)
         elif np.random.random() < 0.5:
             # DDoS attack
@@ -115,6 +130,7 @@ def generate_server_traffic_data(n_samples=500):
             # Server down / connection lost
             requests = np.random.uniform(0, 100)
         
+        labels.append(int(is_anomaly))
         data.append({
             'requests_per_min': max(0, requests),
             'response_time_ms': np.random.normal(150, 50),
@@ -123,21 +139,23 @@ def generate_server_traffic_data(n_samples=500):
     
     df = pd.DataFrame(data)
     df.to_csv('data/server_traffic.csv', index=False)
-    return df
+    return (df, np.array(labels)) if return_labels else df
 
-def generate_stock_risk_data(n_samples=500):
+def generate_stock_risk_data(n_samples=500, return_labels=False, seed=42):
     """
     Stock & Financial Risk Monitoring
     Normal: Small daily fluctuations (±2%)
     Anomaly: Sudden price crashes or spikes (±10%+)
     """
-    np.random.seed(42)
+    np.random.seed(seed)
     data = []
+    labels = []
     price = 1000
     
     for i in range(n_samples):
         # 85% normal market movement
-        if np.random.random() < 0.85:
+        is_anomaly = np.random.random() >= 0.85
+        if not is_anomaly:
             change = np.random.normal(0, 1.5)  # Small changes
         else:
             # 15% anomalous (crash/spike)
@@ -146,6 +164,7 @@ def generate_stock_risk_data(n_samples=500):
         price = price * (1 + change/100)
         price = max(100, min(2000, price))  # Keep in bounds
         
+        labels.append(int(is_anomaly))
         data.append({
             'stock_price': price,
             'volatility_percent': abs(change),
@@ -154,20 +173,22 @@ def generate_stock_risk_data(n_samples=500):
     
     df = pd.DataFrame(data)
     df.to_csv('data/stock_risk.csv', index=False)
-    return df
+    return (df, np.array(labels)) if return_labels else df
 
-def generate_iot_sensor_data(n_samples=500):
+def generate_iot_sensor_data(n_samples=500, return_labels=False, seed=42):
     """
     IoT Sensor Safety Monitoring
     Normal: Humidity 40-60%, Temp 18-28°C, Air quality good
     Anomaly: Sensor failure (extreme values) or environmental hazard
     """
-    np.random.seed(42)
+    np.random.seed(seed)
     data = []
+    labels = []
     
     for i in range(n_samples):
         # 90% normal sensor readings
-        if np.random.random() < 0.90:
+        is_anomaly = np.random.random() >= 0.90
+        if not is_anomaly:
             humidity = np.random.normal(50, 8)
             air_quality = np.random.normal(50, 15)  # 0-100 scale
             temperature = np.random.normal(23, 3)
@@ -183,6 +204,7 @@ def generate_iot_sensor_data(n_samples=500):
                 np.random.uniform(40, 50)      # Too hot
             ])
         
+        labels.append(int(is_anomaly))
         data.append({
             'humidity_percent': max(0, min(100, humidity)),
             'air_quality_index': max(0, air_quality),
@@ -192,7 +214,7 @@ def generate_iot_sensor_data(n_samples=500):
     
     df = pd.DataFrame(data)
     df.to_csv('data/iot_sensors.csv', index=False)
-    return df
+    return (df, np.array(labels)) if return_labels else df
 
 # Generate all data when module is imported
 if __name__ == '__main__':
@@ -10,6 +10,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from data.generate_data import generate_cpu_usage_data
 from utils.data_processor import TimeSeriesProcessor
+from utils.events import compact_events
 from models import StatisticalDetector, IsolationForestDetector, LOFDetector
 from visualization.plotter import TimeSeriesPlotter
 from config.config import config
@@ -61,11 +62,14 @@ def main():
     for name, detector in detectors.items():
         predictions = detector.predict(test_normalized)
         results = detector.predict_with_scores(test_normalized)
+        results['events'] = compact_events(predictions, results['scores'], values=test_data,
+                                           gap_tolerance=config.EVENT_GAP_TOLERANCE)
         results_dict[name] = predictions
         all_results[name] = results
         
         print(f"✓ {name}")
-        print(f"  - Anomalies detected: {results['anomaly_count']} ({results['anomaly_rate']:.2%})")
+        print(f"  - Anomalies detected: {results['anomaly_count']} ({results['anomaly_rate']:.2%}) "
+              f"in {len(results['events'])} events")
     
     # 5. Visualization
     print("\n[5/5] Creating visualizations...")
@@ -103,6 +107,10 @@ def main():
     for name, results in all_results.items():
         print(f"\n{name}:")
         print(f"  Anomalies: {results['anomaly_count']} ({results['anomaly_rate']:.2%})")
+        print(f"  Events: {len(results['events'])}")
+        for event in sorted(results['events'], key=lambda e: e['peak_score'], reverse=True)[:3]:
+            print(f"    points {event['start_index']}-{event['end_index']} ({event['count']} flagged), "
+                  f"peak score {event['peak_score']:.4f} at {event['peak_index']}")
         print(f"  Min score: {results['scores'].min():.4f}")
         print(f"  Max score: {results['scores'].max():.4f}")
         print(f"  Mean score: {results['scores'].mean():.4f}")
@@ -4,11 +4,13 @@ from .statistical_detector import StatisticalDetector
 from .isolation_forest_detector import IsolationForestDetector
 from .lof_detector import LOFDetector
 from .ensemble_detector import EnsembleDetector
+from .streaming_detector import StreamingDetector
 
 __all__ = [
     "AnomalyDetector",
     "StatisticalDetector",
     "IsolationForestDetector",
     "LOFDetector",
-    "EnsembleDetector"
+    "EnsembleDetector",
+    "StreamingDetector"
 ]
@@ -0,0 +1,169 @@
+"""
+Streaming anomaly detector with O(1) per-point scoring and incremental updates
+"""
+import math
+import threading
+import numpy as np
+from scipy.signal import lfilter
+from typing import Tuple
+from .detector_base import AnomalyDetector
+from .statistical_detector import StatisticalDetector
+from utils.data_processor import TimeSeriesProcessor
+
+class StreamingDetector(AnomalyDetector):
+    """
+    Long-lived detector for one data stream
+
+    Fitted once on a batch (scaler + Z-score StatisticalDetector), then each
+    new point is normalized and scored with plain float arithmetic and the
+    detector's mean/std are updated as exponentially weighted moving
+    statistics, so the model follows slow drift without refitting.
+    """
+
+    def __init__(self, threshold: float = 3.0, alpha: float = 0.05, normalization_method: str = "standard"):
+        """
+        Initialize streaming detector
+
+        Args:
+            threshold: Z-score threshold for flagging a point
+            alpha: EWMA weight of each new normal point (0-1, higher adapts faster)
+            normalization_method: "standard", "minmax", or "robust"
+        """
+        super().__init__(threshold=threshold, name="StreamingDetector")
+        self.alpha = alpha
+        self.processor = TimeSeriesProcessor(normalization_method=normalization_method)
+        self.detector = StatisticalDetector(threshold=threshold, method="zscore")
+
+        # Scaler reduced to normalized = scale * x + offset (all scalers are affine)
+        self._scale = 1.0
+        self._offset = 0.0
+        self._mean = 0.0
+        self._var = 1.0
+        self.n_updates = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def fit(self, data: np.ndarray) -> None:
+        """
+        Fit the scaler and Z-score detector on an initial batch of normal data
+
+        Args:
+            data: Training data
+        """
+        normalized = self.processor.normalize(np.asarray(data, dtype=float), fit=True)
+        self.detector.fit(normalized)
+
+        probe = self.processor.normalize(np.array([0.0, 1.0]), fit=False)
+        self._offset = float(probe[0])
+        self._scale = float(probe[1] - probe[0])
+        self._mean = float(self.detector.mean)
+        self._var = float(self.detector.std) ** 2
+        self.n_updates = 0
+        self.is_fitted = True
+
+        self.metadata = {
+            "alpha": self.alpha,
+            "n_samples": len(data),
+            "normalization": self.processor.normalization_method
+        }
+
+    def score(self, data: np.ndarray) -> np.ndarray:
+        """
+        Score a batch against the current (adapted) statistics without updating them
+
+        Args:
+            data: Input data
+
+        Returns:
+            Absolute Z-scores
+        """
+        self._check_fitted()
+        normalized = np.asarray(data, dtype=float) * self._scale + self._offset
+        return np.abs(normalized - self._mean) / (math.sqrt(self._var) + 1e-8)
+
+    def predict(self, data: np.ndarray) -> np.ndarray:
+        """
+        Predict anomalies in a batch without updating the statistics
+
+        Args:
+            data: Input data
+
+        Returns:
+            Binary predictions (1 = anomaly, 0 = normal)
+        """
+        return (self.score(data) > self.threshold).astype(int)
+
+    def update(self, value: float) -> Tuple[float, bool]:
+        """
+        Score one new point in O(1) and fold it into the running statistics
+
+        Anomalous points are not learned from, so a burst of outliers does
+        not drag the baseline towards itself.
+
+        Args:
+            value: New observation
+
+        Returns:
+            Tuple of (score, is_anomaly)
+        """
+        self._check_fitted()
+        with self._lock:
+            z = value * self._scale + self._offset
+            deviation = z - self._mean
+            score = abs(deviation) / (math.sqrt(self._var) + 1e-8)
+            is_anomaly = score > self.threshold
+
+            if not is_anomaly:
+                alpha = self.alpha
+                self._mean += alpha * deviation
+                self._var = (1 - alpha) * (self._var + alpha * deviation * deviation)
+                self.n_updates += 1
+
+        return score, is_anomaly
+
+    def update_batch(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized update() for a batch of points in arrival order
+
+        The whole batch is scored against the statistics as they were at the
+        start of the batch; its normal points are then folded into the EWMA
+        mean/variance exactly as sequential update() calls would (both
+        recurrences are linear, so they run as IIR filters).
+
+        Args:
+            values: New observations
+
+        Returns:
+            Tuple of (scores, is_anomaly) arrays
+        """
+        self._check_fitted()
+        values = np.asarray(values, dtype=float)
+        alpha = self.alpha
+
+        with self._lock:
+            z = values * self._scale + self._offset
+            scores = np.abs(z - self._mean) / (math.sqrt(self._var) + 1e-8)
+            is_anomaly = scores > self.threshold
+
+            normal = z[~is_anomaly]
+            if len(normal):
+                # mean_i = (1 - a) * mean_{i-1} + a * x_i
+                means, _ = lfilter([alpha], [1, -(1 - alpha)], normal, zi=[(1 - alpha) * self._mean])
+                previous_means = np.concatenate(([self._mean], means[:-1]))
+                deviations = normal - previous_means
+                # var_i = (1 - a) * var_{i-1} + (1 - a) * a * d_i^2
+                variances, _ = lfilter([1.0], [1, -(1 - alpha)], (1 - alpha) * alpha * deviations ** 2,
+                                       zi=[(1 - alpha) * self._var])
+                self._mean = float(means[-1])
+                self._var = float(variances[-1])
+                self.n_updates += len(normal)
+
+        return scores, is_anomaly
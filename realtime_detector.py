@@ -2,8 +2,10 @@
 Real-Time Anomaly Detection System
 Continuous streaming data monitoring with live anomaly detection
 """
+import gzip
 import numpy as np
 import os
+import pickle
 import sys
 import time
 from collections import deque
@@ -13,6 +15,7 @@ import threading
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.data_processor import TimeSeriesProcessor
+from utils.alerts import AlertDispatcher, ConsoleSink, FileSink, WebhookSink
 from models import StatisticalDetector, IsolationForestDetector
 from data.generate_data import (
     generate_cpu_usage_data, 
@@ -20,19 +23,37 @@ from data.generate_data import (
     generate_network_traffic_data
 )
 
+CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "checkpoints")
+CHECKPOINT_VERSION = 1
+
+# Alert delivery: always to the console, plus ALERT_LOG_PATH (JSON lines)
+# and ALERT_WEBHOOK_URL when set. Repeats from one monitor within
+# ALERT_DEDUP_WINDOW seconds are folded into the next alert
+ALERT_LOG_PATH = os.getenv("ALERT_LOG_PATH")
+ALERT_WEBHOOK_URL = os.getenv("ALERT_WEBHOOK_URL")
+ALERT_DEDUP_WINDOW = float(os.getenv("ALERT_DEDUP_WINDOW", 10))
+ALERT_RATE = float(os.getenv("ALERT_RATE", 1))  # alerts per second, sustained
+
 class RealtimeAnomalyDetector:
     """Real-time anomaly detection system"""
     
-    def __init__(self, window_size=100, update_frequency=1):
+    def __init__(self, window_size=100, update_frequency=1, checkpoint_path=None, checkpoint_every=100):
         """
         Initialize real-time detector
         
         Args:
             window_size: Size of sliding window
             update_frequency: Update interval in seconds
+            checkpoint_path: File to snapshot detector state to (None disables checkpoints)
+            checkpoint_every: Number of points between periodic checkpoints
         """
         self.window_size = window_size
         self.update_frequency = update_frequency
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self._points_since_checkpoint = 0
+        self._checkpoint_lock = threading.Lock()
+        self._checkpoint_thread = None
         self.data_buffer = deque(maxlen=window_size)
         self.predictions_buffer = deque(maxlen=window_size)
         self.scores_buffer = deque(maxlen=window_size)
@@ -63,7 +84,18 @@ class RealtimeAnomalyDetector:
         self.data_buffer.append(value)
         self.timestamps.append(timestamp)
         self.total_points += 1
+        self._points_since_checkpoint += 1
+        
+        result = self._score_latest(value, timestamp)
+        
+        # After scoring, so the snapshot's buffers line up point for point
+        if self.checkpoint_path and self._points_since_checkpoint >= self.checkpoint_every:
+            self.save_checkpoint_async()
         
+        return result
+    
+    def _score_latest(self, value, timestamp):
+        """Score the newest buffered point (None until the detector is ready)"""
         if len(self.data_buffer) >= 10 and self.is_trained:
             # Normalize new data
             data_array = np.array(list(self.data_buffer))
@@ -95,6 +127,117 @@ class RealtimeAnomalyDetector:
         
         return None
     
+    def save_checkpoint(self, path=None):
+        """
+        Snapshot the full detector state (scaler, models, buffers, counters)
+        
+        The state is pickled and gzip-compressed (level 1 keeps saves fast),
+        written to a temporary path and atomically moved into place, so a
+        crash mid-write never corrupts the last checkpoint.
+        
+        Args:
+            path: Checkpoint file (defaults to self.checkpoint_path)
+        """
+        path = path or self.checkpoint_path
+        if not path:
+            raise ValueError("No checkpoint path configured")
+        
+        # Let an in-flight background save finish first so it cannot
+        # replace this newer snapshot afterwards
+        self.wait_for_checkpoint()
+        self._write_checkpoint(self._checkpoint_state(), path)
+    
+    def save_checkpoint_async(self):
+        """
+        Snapshot the state now and write it on a background thread
+        
+        Only the buffer copies happen on the caller's thread; pickling and
+        compression (tens of ms) run off the scoring path. The models are
+        not mutated after training, so the thread can safely pickle them.
+        While a save is still running, the request is skipped and retried
+        on the next point.
+        """
+        if self._checkpoint_thread is not None and self._checkpoint_thread.is_alive():
+            return
+        state = self._checkpoint_state()
+        self._checkpoint_thread = threading.Thread(
+            target=self._write_checkpoint, args=(state, self.checkpoint_path), daemon=True
+        )
+        self._checkpoint_thread.start()
+    
+    def wait_for_checkpoint(self):
+        """Block until a background checkpoint save (if any) has finished"""
+        if self._checkpoint_thread is not None:
+            self._checkpoint_thread.join()
+            self._checkpoint_thread = None
+    
+    def _checkpoint_state(self):
+        """Consistent copy of everything a checkpoint stores"""
+        self._points_since_checkpoint = 0
+        return {
+            'version': CHECKPOINT_VERSION,
+            'window_size': self.window_size,
+            'update_frequency': self.update_frequency,
+            'checkpoint_every': self.checkpoint_every,
+            'processor': self.processor,
+            'detector': self.detector,
+            'detector_if': self.detector_if,
+            'data_buffer': np.asarray(self.data_buffer, dtype=float),
+            'predictions_buffer': np.asarray(self.predictions_buffer, dtype=np.int8),
+            'scores_buffer': np.asarray(self.scores_buffer, dtype=float),
+            'timestamps': list(self.timestamps),
+            'is_trained': self.is_trained,
+            'anomaly_count': self.anomaly_count,
+            'total_points': self.total_points,
+            'start_time': self.start_time
+        }
+    
+    def _write_checkpoint(self, state, path):
+        """Pickle, compress and atomically move a checkpoint into place"""
+        with self._checkpoint_lock:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            tmp_path = path + ".tmp"
+            with gzip.open(tmp_path, 'wb', compresslevel=1) as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+    
+    @classmethod
+    def load_checkpoint(cls, path, update_frequency=None):
+        """
+        Restore a detector from a checkpoint written by save_checkpoint()
+        
+        Args:
+            path: Checkpoint file
+            update_frequency: Override the saved update interval (optional)
+            
+        Returns:
+            RealtimeAnomalyDetector ready to continue streaming
+        """
+        with gzip.open(path, 'rb') as f:
+            state = pickle.load(f)
+        
+        if state.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {state.get('version')}")
+        
+        detector = cls(
+            window_size=state['window_size'],
+            update_frequency=update_frequency if update_frequency is not None else state['update_frequency'],
+            checkpoint_path=path,
+            checkpoint_every=state['checkpoint_every']
+        )
+        detector.processor = state['processor']
+        detector.detector = state['detector']
+        detector.detector_if = state['detector_if']
+        detector.data_buffer.extend(state['data_buffer'].tolist())
+        detector.predictions_buffer.extend(state['predictions_buffer'].tolist())
+        detector.scores_buffer.extend(state['scores_buffer'].tolist())
+        detector.timestamps.extend(state['timestamps'])
+        detector.is_trained = state['is_trained']
+        detector.anomaly_count = state['anomaly_count']
+        detector.total_points = state['total_points']
+        detector.start_time = state['start_time']
+        return detector
+    
     def get_stats(self):
         """Get current statistics"""
         if len(self.predictions_buffer) == 0:
@@ -173,20 +316,65 @@ def print_visualization(detector):
         
         print(f"  {i:3d} {status} {val:8.2f} {bar}")
 
+def make_alert_dispatcher():
+    """
+    Build the alert dispatcher for a monitoring run
+
+    Returns:
+        AlertDispatcher delivering to the configured sinks off the detection loop
+    """
+    sinks = [ConsoleSink()]
+    if ALERT_LOG_PATH:
+        sinks.append(FileSink(ALERT_LOG_PATH))
+    if ALERT_WEBHOOK_URL:
+        sinks.append(WebhookSink(ALERT_WEBHOOK_URL))
+    return AlertDispatcher(sinks, dedup_window=ALERT_DEDUP_WINDOW, rate=ALERT_RATE)
+
+def load_or_train_detector(name, generate_fn, column, n_samples, update_frequency):
+    """
+    Restore a detector from its checkpoint, or train a fresh one
+    
+    Args:
+        name: Checkpoint name (file stem inside CHECKPOINT_DIR)
+        generate_fn: Data generator used for initial training
+        column: Column of the generated DataFrame to train on
+        n_samples: Number of initial training samples
+        update_frequency: Update interval in seconds
+        
+    Returns:
+        RealtimeAnomalyDetector with checkpointing enabled
+    """
+    checkpoint_path = os.path.join(CHECKPOINT_DIR, f"{name}.ckpt")
+    
+    if os.path.exists(checkpoint_path):
+        start = time.perf_counter()
+        try:
+            detector = RealtimeAnomalyDetector.load_checkpoint(checkpoint_path, update_frequency=update_frequency)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"\nRestored detector from checkpoint in {elapsed_ms:.1f} ms "
+                  f"({detector.total_points} points already processed)")
+            return detector
+        except Exception as e:
+            print(f"\nWarning: could not restore checkpoint ({e}), retraining")
+    
+    print(f"\nTraining detector on initial {n_samples} samples...")
+    df = generate_fn(n_samples=n_samples)
+    initial_data = df[column].values
+    
+    detector = RealtimeAnomalyDetector(window_size=100, update_frequency=update_frequency,
+                                       checkpoint_path=checkpoint_path)
+    detector.train(initial_data)
+    print("Detector trained!")
+    return detector
+
 def run_cpu_monitoring():
     """Real-time CPU usage monitoring"""
     print_header()
     print("\nMODE: CPU Usage Monitoring")
     print("Data source: Simulated CPU usage with anomalies")
     
-    # Generate initial data for training
-    print("\nTraining detector on initial 200 samples...")
-    df = generate_cpu_usage_data(n_samples=200)
-    initial_data = df['cpu_usage'].values
-    
-    detector = RealtimeAnomalyDetector(window_size=100, update_frequency=1)
-    detector.train(initial_data)
-    print("Detector trained!")
+    # Restore from checkpoint or train on initial data
+    detector = load_or_train_detector("cpu", generate_cpu_usage_data, 'cpu_usage', 200, update_frequency=1)
     
     # Stream new data
     print("\nStarting real-time stream...")
@@ -194,16 +382,19 @@ def run_cpu_monitoring():
     
     df_stream = generate_cpu_usage_data(n_samples=500)
     stream_data = df_stream['cpu_usage'].values
+    alerts = make_alert_dispatcher()
     
     try:
         for i, value in enumerate(stream_data):
             result = detector.add_point(value)
             
             if result and result['is_anomaly']:
-                print(f"\n!!! ANOMALY DETECTED !!!")
-                print(f"    Value: {result['value']:.2f}")
-                print(f"    Score: {result['score']:.4f}")
-                print(f"    Time: {result['timestamp'].strftime('%H:%M:%S')}")
+                alerts.submit("cpu", "ANOMALY DETECTED", value=result['value'], score=result['score'],
+                              ts=result['timestamp'].timestamp(), details={
+                                  "Value": f"{result['value']:.2f}",
+                                  "Score": f"{result['score']:.4f}",
+                                  "Time": result['timestamp'].strftime('%H:%M:%S')
+                              })
             
             # Print status every 20 points
             if (i + 1) % 20 == 0:
@@ -218,6 +409,10 @@ def run_cpu_monitoring():
     except KeyboardInterrupt:
         print("\n\nStopped by user")
         return detector
+    
+    finally:
+        alerts.close()
+        detector.save_checkpoint()
 
 def run_financial_monitoring():
     """Real-time financial data monitoring"""
@@ -225,14 +420,8 @@ def run_financial_monitoring():
     print("\nMODE: Financial Data Monitoring")
     print("Data source: Simulated stock price data")
     
-    # Generate initial data
-    print("\nTraining detector on initial 150 samples...")
-    df = generate_financial_data(n_samples=150)
-    initial_data = df['price'].values
-    
-    detector = RealtimeAnomalyDetector(window_size=100, update_frequency=0.5)
-    detector.train(initial_data)
-    print("Detector trained!")
+    # Restore from checkpoint or train on initial data
+    detector = load_or_train_detector("financial", generate_financial_data, 'price', 150, update_frequency=0.5)
     
     # Stream new data
     print("\nStarting real-time stream...")
@@ -240,16 +429,20 @@ def run_financial_monitoring():
     
     df_stream = generate_financial_data(n_samples=500)
     stream_data = df_stream['price'].values
+    alerts = make_alert_dispatcher()
     
     try:
         for i, value in enumerate(stream_data):
             result = detector.add_point(value)
             
             if result and result['is_anomaly']:
-                print(f"\n!!! PRICE ANOMALY DETECTED !!!")
-                print(f"    Price: ${result['value']:.2f}")
-                print(f"    Deviation Score: {result['score']:.4f}")
-                print(f"    Alert Level: MEDIUM")
+                alerts.submit("financial", "PRICE ANOMALY DETECTED", severity="medium",
+                              value=result['value'], score=result['score'],
+                              ts=result['timestamp'].timestamp(), details={
+                                  "Price": f"${result['value']:.2f}",
+                                  "Deviation Score": f"{result['score']:.4f}",
+                                  "Alert Level": "MEDIUM"
+                              })
             
             # Print status every 15 points
             if (i + 1) % 15 == 0:
@@ -264,6 +457,10 @@ def run_financial_monitoring():
     except KeyboardInterrupt:
         print("\n\nStopped by user")
         return detector
+    
+    finally:
+        alerts.close()
+        detector.save_checkpoint()
 
 def run_network_monitoring():
     """Real-time network traffic monitoring"""
@@ -271,14 +468,8 @@ def run_network_monitoring():
     print("\nMODE: Network Traffic Monitoring")
     print("Data source: Simulated network bandwidth with anomalies")
     
-    # Generate initial data
-    print("\nTraining detector on initial 180 samples...")
-    df = generate_network_traffic_data(n_samples=180)
-    initial_data = df['traffic_mbps'].values
-    
-    detector = RealtimeAnomalyDetector(window_size=100, update_frequency=0.8)
-    detector.train(initial_data)
-    print("Detector trained!")
+    # Restore from checkpoint or train on initial data
+    detector = load_or_train_detector("network", generate_network_traffic_data, 'traffic_mbps', 180, update_frequency=0.8)
     
     # Stream new data
     print("\nStarting real-time stream...")
@@ -286,16 +477,19 @@ def run_network_monitoring():
     
     df_stream = generate_network_traffic_data(n_samples=500)
     stream_data = df_stream['traffic_mbps'].values
+    alerts = make_alert_dispatcher()
     
     try:
         for i, value in enumerate(stream_data):
             result = detector.add_point(value)
             
             if result and result['is_anomaly']:
-                print(f"\n!!! NETWORK ANOMALY DETECTED !!!")
-                print(f"    Bandwidth: {result['value']:.2f} Mbps")
-                print(f"    Anomaly Score: {result['score']:.4f}")
-                print(f"    Alert: Potential DDoS or traffic spike")
+                alerts.submit("network", "NETWORK ANOMALY DETECTED", value=result['value'], score=result['score'],
+                              ts=result['timestamp'].timestamp(), details={
+                                  "Bandwidth": f"{result['value']:.2f} Mbps",
+                                  "Anomaly Score": f"{result['score']:.4f}",
+                                  "Alert": "Potential DDoS or traffic spike"
+                              })
             
             # Print status every 18 points
             if (i + 1) % 18 == 0:
@@ -310,6 +504,10 @@ def run_network_monitoring():
     except KeyboardInterrupt:
         print("\n\nStopped by user")
         return detector
+    
+    finally:
+        alerts.close()
+        detector.save_checkpoint()
 
 def print_final_report(detector):
     """Print final detection report"""
@@ -0,0 +1,181 @@
+"""
+Multi-Process Serving Mode
+One ingest/detect process runs server.py's detection loop and write API
+(/api/ingest, /api/history, /api/aggregate, /api/stream) and publishes every
+source into a shared-memory ring. N read-only worker processes serve the
+realtime read API (/api/data/<source>, /api/stats) from those rings on one
+shared listening socket, so read throughput scales with cores.
+
+Usage:
+    python serve_shared.py --workers 4 --port 5000 --ingest-port 5001
+
+Requires the "fork" start method (Linux, macOS): workers inherit the socket.
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+from datetime import datetime
+
+from flask import Flask, Response, jsonify, request
+from flask_cors import CORS
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.shm_ring import SharedRing
+from utils.downsample import MIN_MAX_POINTS, downsample_indices
+
+def anomaly_rate(anomalies, total):
+    return round((anomalies / total) * 100, 2) if total else 0
+
+def data_etag(ring, last_seq, since, max_points):
+    return f"{ring.name}-{last_seq}-{since}-{max_points or 'all'}"
+
+def stats_version(rings):
+    names = "-".join(ring.name for ring in rings.values())
+    return f"{names}-{sum(ring.last_seq for ring in rings.values())}"
+
+def create_reader_app(rings):
+    """
+    Read-only Flask app over shared rings, with server.py's response formats
+
+    Args:
+        rings: Source name -> attached SharedRing
+
+    Returns:
+        Flask application
+    """
+    app = Flask(__name__)
+    CORS(app)
+
+    @app.route("/health")
+    def health():
+        return jsonify({"status": "healthy", "worker": os.getpid()})
+
+    @app.route("/api/data/<source>")
+    def get_data(source):
+        if source not in rings:
+            return jsonify({"error": "Invalid source"}), 400
+
+        since = request.args.get("since", default=-1, type=int)
+        max_points = request.args.get("max_points", type=int)
+        if max_points is not None and max_points < MIN_MAX_POINTS:
+            return jsonify({"error": f"max_points must be at least {MIN_MAX_POINTS}"}), 400
+        # Same caching as server.py: the ring name (new every run) and its
+        # last sequence number identify the window exactly
+        ring = rings[source]
+        current = data_etag(ring, ring.last_seq, since, max_points)
+        if request.if_none_match.contains(current):
+            return Response(status=304, headers={"ETag": f'"{current}"'})
+        values, timestamps, flags, start_seq, last_seq, reset = ring.read(since)
+
+        seqs = list(range(start_seq, start_seq + len(values)))
+        if max_points is not None and len(values) > max_points:
+            keep = downsample_indices(values, max_points, flags)
+            values, timestamps, flags = values[keep], timestamps[keep], flags[keep]
+            seqs = [seqs[i] for i in keep]
+        points = [
+            {"seq": seq, "value": value, "timestamp": datetime.fromtimestamp(ts).isoformat(), "is_anomaly": flag}
+            for seq, value, ts, flag in zip(seqs, values.tolist(), timestamps.tolist(), flags.tolist())
+        ]
+
+        response = jsonify({
+            "source": source,
+            "data_points": points,
+            "last_seq": last_seq,
+            "reset": reset and since >= 0
+        })
+        response.headers["ETag"] = f'"{data_etag(ring, last_seq, since, max_points)}"'
+        return response
+
+    @app.route("/api/stats")
+    def stats():
+        # Every write raises some ring's last_seq, so their sum versions the stats
+        etag = f"{stats_version(rings)}-stats"
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers={"ETag": f'"{etag}"'})
+        per_source = {}
+        total = 0
+        anomalies = 0
+        for source, ring in rings.items():
+            counts = ring.counts()
+            counts["anomaly_rate"] = anomaly_rate(counts["anomalies"], counts["data_points"])
+            per_source[source] = counts
+            total += counts["data_points"]
+            anomalies += counts["anomalies"]
+        response = jsonify({
+            "total_data_points": total,
+            "total_anomalies": anomalies,
+            "anomaly_rate": anomaly_rate(anomalies, total),
+            "sources": per_source
+        })
+        response.headers["ETag"] = f'"{etag}"'
+        return response
+
+    return app
+
+def run_reader(fd, host, port, ring_names):
+    """Worker process: attach to the rings and serve on the inherited socket"""
+    rings = {source: SharedRing.attach(name) for source, name in ring_names.items()}
+    server = make_server(host, port, create_reader_app(rings), threaded=True, fd=fd)
+    server.serve_forever()
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Serve the realtime API from several processes")
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=5000, help="Read API port (default: 5000)")
+    parser.add_argument("--ingest-port", type=int, default=5001, help="Ingest/detect process port (default: 5001)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2,
+                        help="Read-only worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    import server
+
+    rings = {source: SharedRing.create(None, server.WINDOW_SIZE) for source in server.SOURCES}
+    server.SHARED_RINGS.update(rings)
+    ring_names = {source: ring.name for source, ring in rings.items()}
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((args.host, args.port))
+    listener.listen(1024)
+    listener.set_inheritable(True)
+
+    # Fork the workers before any thread starts in this process: importing
+    # server starts none (the point store's writer thread is only opened
+    # below, in the parent), and a fork must not copy a lock or SQLite
+    # connection some other thread is holding mid-write
+    if threading.active_count() > 1:
+        parser.error("a thread is already running; refusing to fork the workers")
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=run_reader, args=(listener.fileno(), args.host, args.port, ring_names), daemon=True)
+        for _ in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    print(f"🚀 Read API on http://localhost:{args.port} ({args.workers} workers), "
+          f"ingest/detect on http://localhost:{args.ingest_port}")
+    server.open_point_store()
+    threading.Thread(target=server.data_worker, daemon=True).start()
+    # Exit through the cleanup below on SIGTERM too, so the rings are unlinked
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.app.run(host=args.host, port=args.ingest_port, debug=False, threaded=True)
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
+        listener.close()
+        for ring in rings.values():
+            ring.close()
+
+if __name__ == "__main__":
+    main()
@@ -3,41 +3,154 @@ Real-Time Anomaly Detection Server
 Uses synthetic data + Z-score anomaly detection
 """
 
+import os
+import sys
 import time
 import threading
 from datetime import datetime
+from types import MappingProxyType
 import numpy as np
-from flask import Flask, jsonify
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.ring_buffer import RingBuffer
+from utils.snapshot import SnapshotPublisher
+from utils.broadcast import Broadcaster
+from utils.ingest import parse_ingest_body
+from utils.downsample import MIN_MAX_POINTS, downsample_indices
+from utils.sqlite_store import PointStore
+from utils.compressed_store import CompressedStore
+from utils.rollups import DEFAULT_TIERS, RollupStore, parse_tiers
+
 # ------------------ Flask App ------------------
 app = Flask(__name__)
 CORS(app)
 
 # ------------------ Global Storage ------------------
+WINDOW_SIZE = 60
+Z_THRESHOLD = 2.5
+
+# One fixed-capacity ring buffer per source; each keeps running mean/std
+# and hands request handlers a consistent snapshot under its own lock
 DATA_STORE = {
-    "CPU_Usage": [],
-    "Financial_Data": [],
-    "Network_Traffic": []
+    "CPU_Usage": RingBuffer(WINDOW_SIZE),
+    "Financial_Data": RingBuffer(WINDOW_SIZE),
+    "Network_Traffic": RingBuffer(WINDOW_SIZE)
 }
 
-WINDOW_SIZE = 60
-Z_THRESHOLD = 2.5
+# Immutable view of DATA_STORE republished after every tick and ingest
+# batch: {"series": {source: SeriesSnapshot}, "stats": {...}}. Request
+# threads read it without locks; its version doubles as the ETag
+STATE = SnapshotPublisher()
+
+# Source index order used by the packed binary ingest format
+SOURCES = list(DATA_STORE)
+
+# Held for every write: a tick or an ingest batch updates DATA_STORE, the
+# history, rollups, shared rings and point store and republishes STATE as
+# one operation, so the stores never disagree about which points arrived
+WRITE_LOCK = threading.Lock()
+
+# Cumulative /api/ingest throughput counters
+INGEST_METRICS = {"requests": 0, "points": 0, "anomalies": 0, "busy_sec": 0.0}
+INGEST_LOCK = threading.Lock()
+
+# Every tick is published once here and fanned out to all /api/stream clients
+BROADCASTER = Broadcaster()
+
+# Long in-memory history, compressed to a few bytes per point
+# (delta-of-delta timestamps, XOR floats, run-length anomaly flags)
+HISTORY_RETENTION = float(os.getenv("HISTORY_RETENTION", 3 * 24 * 3600))  # seconds
+HISTORY = CompressedStore(max_age=HISTORY_RETENTION)
+MAX_AGGREGATE_BUCKETS = 2000
+
+# Precomputed rollup tiers (default 1 minute for 7 days, 1 hour for a year)
+# so zoomed-out history never touches raw points; ROLLUP_TIERS takes
+# "width:retention" pairs in seconds, e.g. "60:604800,3600:31536000"
+ROLLUP_TIERS = parse_tiers(os.environ["ROLLUP_TIERS"]) if os.getenv("ROLLUP_TIERS") else DEFAULT_TIERS
+ROLLUPS = RollupStore(ROLLUP_TIERS)
+
+# Optional persistence: set POINT_STORE_PATH to keep every point on disk
+# (SQLite, WAL mode, batched by a background writer thread). The store is
+# opened by open_point_store() at startup rather than on import, so
+# serve_shared.py can fork its workers before the writer thread exists
+POINT_STORE_PATH = os.getenv("POINT_STORE_PATH")
+POINT_STORE = None
+
+# Shared-memory rings the data is also published to when running under
+# serve_shared.py (source -> SharedRing; empty in single-process mode)
+SHARED_RINGS = {}
 
 # ------------------ Utility Functions ------------------
-def z_score_anomaly(series, value):
-    if len(series) < 10:
+def open_point_store():
+    # Start the SQLite writer thread if persistence is configured (idempotent)
+    global POINT_STORE
+    if POINT_STORE_PATH and POINT_STORE is None:
+        POINT_STORE = PointStore(POINT_STORE_PATH)
+    return POINT_STORE
+
+def z_score_anomaly(buffer, value):
+    if len(buffer) < 10:
         return False
-    mean = np.mean(series)
-    std = np.std(series)
-    if std == 0:
+    z = buffer.zscore(value)
+    if z is None:
         return False
-    z = abs((value - mean) / std)
     return z > Z_THRESHOLD
 
-def trim_window(source):
-    if len(DATA_STORE[source]) > WINDOW_SIZE:
-        DATA_STORE[source] = DATA_STORE[source][-WINDOW_SIZE:]
+def z_score_anomaly_batch(buffer, values):
+    # Vectorized z_score_anomaly: the batch is scored in window-sized
+    # sub-batches, each against the window as it stands once the earlier
+    # points have been appended. While that window holds fewer than 10
+    # points (an empty or new source) a sub-batch is scored against its own
+    # statistics instead, so a first batch still gets anomalies flagged
+    history = np.concatenate((np.array(buffer.freeze().values, dtype=float), values))
+    n_old = len(history) - len(values)
+    flags = np.zeros(len(values), dtype=bool)
+    for start in range(0, len(values), buffer.capacity):
+        chunk = values[start:start + buffer.capacity]
+        window = history[max(n_old + start - buffer.capacity, 0):n_old + start]
+        if len(window) < 10:
+            window = chunk
+        std = window.std()
+        if len(window) >= 10 and std > 0:
+            flags[start:start + len(chunk)] = np.abs(chunk - window.mean()) / std > Z_THRESHOLD
+    return flags
+
+def anomaly_rate(anomalies, total):
+    return round((anomalies / total) * 100, 2) if total else 0
+
+def compute_stats(series):
+    # Counts are maintained by the buffers on insert/evict, so this is
+    # O(number of sources) regardless of window size
+    per_source = {}
+    total = 0
+    anomalies = 0
+    for source, snapshot in series.items():
+        counts = snapshot.counts()
+        counts["anomaly_rate"] = anomaly_rate(counts["anomalies"], counts["data_points"])
+        per_source[source] = counts
+        total += counts["data_points"]
+        anomalies += counts["anomalies"]
+
+    return {
+        "total_data_points": total,
+        "total_anomalies": anomalies,
+        "anomaly_rate": anomaly_rate(anomalies, total),
+        "sources": per_source
+    }
+
+def build_state():
+    # Freeze every buffer into the next published state (runs under the
+    # publisher's writer lock, after the writer has updated DATA_STORE)
+    series = {source: buffer.freeze() for source, buffer in DATA_STORE.items()}
+    return MappingProxyType({
+        "series": MappingProxyType(series),
+        "stats": MappingProxyType(compute_stats(series))
+    })
+
+STATE.publish(build_state)
 
 # ------------------ Synthetic Data Generators ------------------
 def generate_cpu():
@@ -52,22 +165,32 @@ def generate_network():
 # ------------------ Background Worker ------------------
 def data_worker():
     while True:
-        for source, generator in [
-            ("CPU_Usage", generate_cpu),
-            ("Financial_Data", generate_financial),
-            ("Network_Traffic", generate_network),
-        ]:
-            value = round(float(generator()), 2)
-            past_values = [d["value"] for d in DATA_STORE[source]]
-            is_anomaly = z_score_anomaly(past_values, value)
-
-            DATA_STORE[source].append({
-                "value": value,
-                "timestamp": datetime.now().isoformat(),
-                "is_anomaly": is_anomaly
-            })
+        points = {}
+        with WRITE_LOCK:
+            for source, generator in [
+                ("CPU_Usage", generate_cpu),
+                ("Financial_Data", generate_financial),
+                ("Network_Traffic", generate_network),
+            ]:
+                value = round(float(generator()), 2)
+                buffer = DATA_STORE[source]
+                is_anomaly = z_score_anomaly(buffer, value)
 
-            trim_window(source)
+                now = datetime.now()
+                timestamp = now.isoformat()
+                buffer.append(value, timestamp, is_anomaly)
+                HISTORY.append(source, now.timestamp(), value, is_anomaly)
+                ROLLUPS.add(source, now.timestamp(), value, is_anomaly)
+                if source in SHARED_RINGS:
+                    SHARED_RINGS[source].append(value, now.timestamp(), is_anomaly)
+                if POINT_STORE is not None:
+                    POINT_STORE.add_point(source, now.timestamp(), value, is_anomaly)
+                points[source] = [buffer.last_seq, value, timestamp, int(is_anomaly)]
+            STATE.publish(build_state)
+
+        # Compact delta: {source: [seq, value, timestamp, is_anomaly]}
+        BROADCASTER.publish("points", points)
+        BROADCASTER.publish("stats", dict(STATE.get()[1]["stats"]))
 
         time.sleep(2)
 
@@ -81,29 +204,233 @@ def get_data(source):
     if source not in DATA_STORE:
         return jsonify({"error": "Invalid source"}), 400
 
+    # ?since=<seq> returns only points newer than the client's cursor;
+    # "reset" tells the client its cursor fell out of the window
+    since = request.args.get("since", default=-1, type=int)
+    max_points = request.args.get("max_points", type=int)
+    if max_points is not None and max_points < MIN_MAX_POINTS:
+        return jsonify({"error": f"max_points must be at least {MIN_MAX_POINTS}"}), 400
+
+    # One published state answers the whole request, so the version
+    # identifies the response exactly
+    version, state = STATE.get()
+    etag = f"{version}-{source}-{since}-{max_points or 'all'}"
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers={"ETag": f'"{etag}"'})
+    points, last_seq, reset = state["series"][source].since(since)
+
+    # ?max_points=N: LTTB-downsample the returned points, keeping anomalies
+    # (each point keeps its seq, so clients still know where it belongs)
+    if max_points is not None and len(points) > max_points:
+        keep = downsample_indices(
+            [p["value"] for p in points], max_points, [p["is_anomaly"] for p in points]
+        )
+        points = [points[i] for i in keep]
+
+    response = jsonify({
+        "source": source,
+        "data_points": points,
+        "last_seq": last_seq,
+        "reset": reset and since >= 0
+    })
+    response.headers["ETag"] = f'"{etag}"'
+    return response
+
+@app.route("/api/history/<source>")
+def get_history(source):
+    # Points in a time range: ?start=&end= (Unix seconds), ?limit= (newest
+    # kept), ?anomalies_only=1, ?max_points= (LTTB). Served from the
+    # compressed in-memory history, or from the SQLite store when enabled
+    # and the range starts before the in-memory retention. ?resolution=
+    # (seconds) returns rollup buckets from the coarsest qualifying tier
+    # instead, falling back to raw points when it is finer than every tier
+    if source not in DATA_STORE:
+        return jsonify({"error": "Invalid source"}), 400
+
+    start = request.args.get("start", type=float)
+    end = request.args.get("end", type=float)
+    limit = request.args.get("limit", type=int)
+    if limit is not None and limit < 1:
+        return jsonify({"error": "limit must be at least 1"}), 400
+    anomalies_only = request.args.get("anomalies_only", default=0, type=int) == 1
+    max_points = request.args.get("max_points", type=int)
+    if max_points is not None and max_points < MIN_MAX_POINTS:
+        return jsonify({"error": f"max_points must be at least {MIN_MAX_POINTS}"}), 400
+    resolution = request.args.get("resolution", type=float)
+    if resolution is not None and not resolution > 0:
+        return jsonify({"error": "resolution must be positive"}), 400
+
+    if resolution is not None and not anomalies_only:
+        tier, buckets = ROLLUPS.query(source, start, end, resolution)
+        if tier is not None:
+            if limit is not None:
+                buckets = buckets[-limit:]
+            return jsonify({
+                "source": source,
+                "resolution": resolution,
+                "tier": tier,
+                "buckets": buckets,
+                "backend": "rollup"
+            })
+
+    oldest = HISTORY.oldest(source)
+    if POINT_STORE is not None and (oldest is None or start is None or start < oldest):
+        rows = POINT_STORE.points(source, start, end, limit, anomalies_only)
+        timestamps = np.array([p["ts"] for p in rows], dtype=float)
+        values = np.array([p["value"] for p in rows], dtype=float)
+        flags = np.array([p["is_anomaly"] for p in rows], dtype=bool)
+        backend = "sqlite"
+    else:
+        timestamps, values, flags = HISTORY.range(source, start, end)
+        if anomalies_only:
+            timestamps, values, flags = timestamps[flags], values[flags], flags[flags]
+        if limit is not None:
+            timestamps, values, flags = timestamps[-limit:], values[-limit:], flags[-limit:]
+        backend = "memory"
+
+    # Downsample before building per-point dicts: ranges can span days
+    total = len(values)
+    if max_points is not None and total > max_points:
+        keep = downsample_indices(values, max_points, flags, timestamps)
+        timestamps, values, flags = timestamps[keep], values[keep], flags[keep]
+    points = [
+        {"ts": ts, "value": value, "is_anomaly": flag}
+        for ts, value, flag in zip(timestamps.tolist(), values.tolist(), flags.tolist())
+    ]
+
     return jsonify({
         "source": source,
-        "data_points": DATA_STORE[source]
+        "data_points": points,
+        "total": total,
+        "backend": backend,
+        "memory": HISTORY.memory_stats().get(source)
+    })
+
+@app.route("/api/aggregate")
+def aggregate():
+    # count/min/max/mean/std/anomalies over [start, end] (Unix seconds,
+    # default: all retained history), optionally in ?buckets=N equal time
+    # buckets for zoomed-out charts; ?source= limits to one source.
+    # Answered from the history's range index, not by scanning points
+    sources = [request.args["source"]] if "source" in request.args else SOURCES
+    if any(source not in DATA_STORE for source in sources):
+        return jsonify({"error": "Invalid source"}), 400
+    start = request.args.get("start", type=float)
+    end = request.args.get("end", type=float)
+    buckets = request.args.get("buckets", default=1, type=int)
+    if not 1 <= buckets <= MAX_AGGREGATE_BUCKETS:
+        return jsonify({"error": f"buckets must be between 1 and {MAX_AGGREGATE_BUCKETS}"}), 400
+
+    started = time.perf_counter()
+    result = {source: HISTORY.aggregate(source, start, end, buckets) for source in sources}
+    return jsonify({
+        "aggregates": result,
+        "query_ms": round((time.perf_counter() - started) * 1000, 3)
     })
 
 @app.route("/api/stats")
 def stats():
-    total = sum(len(v) for v in DATA_STORE.values())
-    anomalies = sum(
-        1 for v in DATA_STORE.values() for d in v if d["is_anomaly"]
-    )
+    version, state = STATE.get()
+    etag = f"{version}-stats"
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers={"ETag": f'"{etag}"'})
+    response = jsonify(dict(state["stats"]))
+    response.headers["ETag"] = f'"{etag}"'
+    return response
+
+@app.route("/api/ingest", methods=["POST"])
+def ingest():
+    # Bulk upload: NDJSON lines {"source", "ts", "value"} or packed binary
+    # (uint16 source index, float64 ts, float64 value); see utils/ingest.py.
+    # The whole body is validated before any state is touched
+    started = time.perf_counter()
+    try:
+        grouped = parse_ingest_body(request.get_data(cache=False), request.content_type, SOURCES)
+    except (ValueError, OverflowError) as e:
+        return jsonify({"error": str(e)}), 400
+    parsed = time.perf_counter()
+
+    # Only the newest `capacity` points can survive in a window, so only
+    # those timestamps are formatted; the rest still advance the sequence
+    retained = {
+        source: [datetime.fromtimestamp(ts).isoformat() for ts in timestamps[-DATA_STORE[source].capacity:]]
+        for source, (timestamps, _) in grouped.items()
+    }
+
+    per_source = {}
+    total_points = 0
+    total_anomalies = 0
+    with WRITE_LOCK:
+        for source, (timestamps, values) in grouped.items():
+            buffer = DATA_STORE[source]
+            flags = z_score_anomaly_batch(buffer, values)
+
+            keep = len(retained[source])
+            buffer.extend(values[-keep:].tolist(), retained[source], flags[-keep:].tolist(),
+                          skipped=len(values) - keep)
+            HISTORY.extend(source, timestamps, values, flags)
+            ROLLUPS.add_many(source, timestamps, values, flags)
+            if source in SHARED_RINGS:
+                SHARED_RINGS[source].extend(values, timestamps, flags)
+            if POINT_STORE is not None:
+                POINT_STORE.add_points(source, timestamps, values, flags)
+
+            n_anomalies = int(flags.sum())
+            per_source[source] = {"points": len(values), "anomalies": n_anomalies}
+            total_points += len(values)
+            total_anomalies += n_anomalies
+        STATE.publish(build_state)
+
+    finished = time.perf_counter()
+    elapsed = finished - started
+    with INGEST_LOCK:
+        INGEST_METRICS["requests"] += 1
+        INGEST_METRICS["points"] += total_points
+        INGEST_METRICS["anomalies"] += total_anomalies
+        INGEST_METRICS["busy_sec"] += elapsed
 
     return jsonify({
-        "total_data_points": total,
-        "total_anomalies": anomalies,
-        "anomaly_rate": round((anomalies / total) * 100, 2) if total else 0
+        "accepted": total_points,
+        "anomalies": total_anomalies,
+        "sources": per_source,
+        "timing_ms": {
+            "parse": round((parsed - started) * 1000, 3),
+            "score_and_store": round((finished - parsed) * 1000, 3),
+            "total": round(elapsed * 1000, 3)
+        },
+        "points_per_sec": round(total_points / elapsed) if elapsed > 0 else 0
     })
 
+@app.route("/api/ingest", methods=["GET"])
+def ingest_info():
+    with INGEST_LOCK:
+        metrics = dict(INGEST_METRICS)
+    busy = metrics.pop("busy_sec")
+    metrics["busy_sec"] = round(busy, 3)
+    metrics["points_per_busy_sec"] = round(metrics["points"] / busy) if busy > 0 else 0
+    return jsonify({
+        "sources": SOURCES,
+        "formats": ["application/x-ndjson", "application/octet-stream"],
+        "metrics": metrics
+    })
+
+@app.route("/api/stream")
+def stream():
+    # One long-lived Server-Sent Events connection carrying every source's
+    # new points and the stats; Last-Event-ID resumes after a reconnect
+    last_event_id = request.headers.get("Last-Event-ID", type=int)
+    return Response(
+        BROADCASTER.stream(last_event_id),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # ------------------ Main ------------------
 if __name__ == "__main__":
     print("🚀 Starting Anomaly Detection Server on http://localhost:5000")
 
+    open_point_store()
     thread = threading.Thread(target=data_worker, daemon=True)
     thread.start()
 
-    app.run(host="0.0.0.0", port=5000, debug=False)
+    app.run(host="0.0.0.0", port=5000, debug=False, threaded=True)
@@ -0,0 +1,53 @@
+"""
+Tests for utils.broadcast.Broadcaster
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.broadcast import Broadcaster
+
+def test_read_returns_events_after_cursor():
+    broadcaster = Broadcaster(capacity=10)
+    for i in range(3):
+        broadcaster.publish("points", {"i": i})
+
+    frames, cursor = broadcaster.read(0, timeout=0)
+    assert len(frames) == 2
+    assert cursor == 2
+
+def test_lagging_client_resumes_from_oldest_retained_event():
+    broadcaster = Broadcaster(capacity=3)
+    for i in range(10):
+        broadcaster.publish("points", {"i": i})
+
+    frames, cursor = broadcaster.read(0, timeout=0)
+    assert frames[0].startswith(b"id: 7\n")
+    assert cursor == 9
+
+def test_client_reconnecting_to_fresh_broadcaster_is_reset():
+    # Last-Event-ID 500 was issued by the previous server process
+    broadcaster = Broadcaster(capacity=10)
+    broadcaster.publish("points", {"i": 0})
+    broadcaster.publish("points", {"i": 1})
+
+    frames, cursor = broadcaster.read(500, timeout=0)
+    assert [frame.split(b"\n")[0] for frame in frames] == [b"id: 0", b"id: 1"]
+    assert cursor == 1
+
+    stream = broadcaster.stream(500)
+    assert next(stream) == b"retry: 3000\n\n"
+    assert next(stream).startswith(b"id: 0\n")
+    stream.close()
+
+def test_stale_cursor_on_empty_broadcaster_waits_for_next_event():
+    broadcaster = Broadcaster(capacity=10)
+    frames, cursor = broadcaster.read(42, timeout=0)
+    assert frames == []
+    assert cursor == -1
+
+    broadcaster.publish("points", {"i": 0})
+    frames, cursor = broadcaster.read(cursor, timeout=0)
+    assert len(frames) == 1
+    assert cursor == 0
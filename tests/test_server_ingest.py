@@ -0,0 +1,41 @@
+"""
+Tests for server.py /api/ingest scoring
+"""
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server
+
+def ndjson(source, values, start=1704067200.0):
+    return "\n".join(json.dumps({"source": source, "ts": start + i, "value": float(v)})
+                     for i, v in enumerate(values))
+
+def test_ingest_into_empty_source_flags_spikes():
+    source = "Network_Traffic"
+    assert len(server.DATA_STORE[source]) == 0
+    values = np.random.default_rng(0).normal(100, 5, 200)
+    spikes = [20, 90, 170]
+    values[spikes] += 100
+
+    client = server.app.test_client()
+    response = client.post("/api/ingest", data=ndjson(source, values), content_type="application/x-ndjson")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["sources"][source] == {"points": 200, "anomalies": 3}
+
+    snapshot = server.STATE.get()[1]["series"][source]
+    flagged = [i for i, flag in enumerate(snapshot.flags) if flag]
+    offset = 200 - len(snapshot.flags)
+    assert flagged == [i - offset for i in spikes if i >= offset]
+
+def test_ingest_rejects_unknown_source_without_touching_state():
+    before = server.STATE.get()[0]
+    client = server.app.test_client()
+    response = client.post("/api/ingest", data=ndjson(99, [1.0]), content_type="application/x-ndjson")
+    assert response.status_code == 400
+    assert server.STATE.get()[0] == before
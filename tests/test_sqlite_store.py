@@ -0,0 +1,43 @@
+"""
+Tests for utils.sqlite_store.PointStore
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.sqlite_store import PointStore
+
+def test_failed_writes_release_the_backlog(tmp_path):
+    store = PointStore(str(tmp_path / "points.db"), max_pending=10)
+    try:
+        # Values that cannot be converted to floats fail on the writer thread
+        for _ in range(5):
+            assert store.add_points("cpu", np.arange(4.0), np.array(["x"] * 4, dtype=object))
+            assert store.flush(timeout=10)
+        assert store.stats["failed"] == 20
+        assert store.last_error
+
+        assert store.add_points("cpu", np.arange(10.0), np.arange(10.0))
+        assert store.flush(timeout=10)
+        assert store.stats["dropped"] == 0
+        assert len(store.points("cpu")) == 10
+    finally:
+        store.close()
+
+def test_failed_transaction_keeps_writer_alive(tmp_path):
+    store = PointStore(str(tmp_path / "points.db"), max_pending=10)
+    try:
+        # An unbindable anomaly value makes the whole transaction roll back
+        assert store.add_anomalies("cpu", [1.0], [{"value": object()}])
+        assert store.flush(timeout=10)
+        assert store.stats["failed"] == 1
+
+        for _ in range(3):
+            assert store.add_points("cpu", np.arange(10.0), np.arange(10.0))
+            assert store.flush(timeout=10)
+        assert store.stats["points"] == 30
+    finally:
+        store.close()
@@ -1,4 +1,7 @@
 """Utility modules for anomaly detection system"""
 from .data_processor import TimeSeriesProcessor
+from .ring_buffer import RingBuffer
+from .broadcast import Broadcaster
+from .anomaly_history import AnomalyHistory
 
-__all__ = ["TimeSeriesProcessor"]
+__all__ = ["TimeSeriesProcessor", "RingBuffer", "Broadcaster", "AnomalyHistory"]
@@ -0,0 +1,293 @@
+"""
+Asynchronous alert dispatch with per-source deduplication, rate limiting and batched delivery
+"""
+import json
+import queue
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+class TokenBucket:
+    """
+    Token bucket: `rate` tokens per second refill up to `burst`
+    """
+
+    def __init__(self, rate: float, burst: float):
+        """
+        Initialize bucket (starts full)
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    def try_acquire(self, n: float = 1.0) -> bool:
+        """
+        Take n tokens if available
+
+        Args:
+            n: Tokens needed
+
+        Returns:
+            True if the tokens were taken
+        """
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= n:
+            self._tokens -= n
+            return True
+        return False
+
+class AlertDispatcher:
+    """
+    Alerts are handed to a bounded queue and delivered by a background thread
+
+    submit() never blocks (a full queue drops the alert and counts it), so
+    alert bursts cannot slow the detection loop. The worker drops repeats of
+    a source's alert within dedup_window seconds, applies a token bucket to
+    what is left and delivers batches of up to batch_size alerts to every
+    sink. Suppressed repeats are reported as "suppressed" on the next
+    delivered alert of the same source.
+    """
+
+    def __init__(self, sinks: Sequence[Callable[[List[Dict[str, Any]]], None]], max_queue: int = 1000,
+                 dedup_window: float = 30.0, rate: float = 1.0, burst: float = 10.0,
+                 batch_size: int = 50, flush_interval: float = 1.0):
+        """
+        Initialize dispatcher and start the delivery thread
+
+        Args:
+            sinks: Callables receiving each batch (list of alert dictionaries)
+            max_queue: Maximum queued alerts before new ones are dropped
+            dedup_window: Seconds after a delivered alert during which the same source's alerts are suppressed
+            rate: Sustained alerts per second across all sources
+            burst: Alerts that may be delivered at once after a quiet period
+            batch_size: Maximum alerts per delivery
+            flush_interval: Maximum seconds an accepted alert waits for delivery
+        """
+        self.sinks = list(sinks)
+        self.dedup_window = dedup_window
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats = {"submitted": 0, "dropped": 0, "deduplicated": 0, "rate_limited": 0,
+                      "delivered": 0, "batches": 0, "sink_errors": 0}
+
+        self._bucket = TokenBucket(rate, burst)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._last_sent = {}
+        self._suppressed = {}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, source: str, message: str, severity: str = "warning", value: Optional[float] = None,
+               score: Optional[float] = None, ts: Optional[float] = None,
+               details: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Queue an alert without blocking
+
+        Args:
+            source: Alert source (the deduplication key)
+            message: Short description
+            severity: Severity label
+            value: Observed value (optional)
+            score: Anomaly score (optional)
+            ts: Unix timestamp (defaults to now)
+            details: Extra fields for the sinks (optional)
+
+        Returns:
+            False if the queue was full and the alert was dropped
+        """
+        alert = {
+            "source": source,
+            "message": message,
+            "severity": severity,
+            "value": value,
+            "score": score,
+            "ts": ts if ts is not None else time.time(),
+            "details": details or {}
+        }
+        self.stats["submitted"] += 1
+        try:
+            self._queue.put_nowait(alert)
+            return True
+        except queue.Full:
+            self.stats["dropped"] += 1
+            return False
+
+    def _admit(self, alert: Dict[str, Any]) -> bool:
+        """Deduplication and rate limiting (worker thread only)"""
+        source = alert["source"]
+        now = time.monotonic()
+        last = self._last_sent.get(source)
+        if last is not None and now - last < self.dedup_window:
+            self.stats["deduplicated"] += 1
+        elif not self._bucket.try_acquire():
+            self.stats["rate_limited"] += 1
+        else:
+            self._last_sent[source] = now
+            alert["suppressed"] = self._suppressed.pop(source, 0)
+            return True
+        self._suppressed[source] = self._suppressed.get(source, 0) + 1
+        return False
+
+    def _deliver(self, batch: List[Dict[str, Any]]) -> None:
+        """Hand one batch to every sink (worker thread only)"""
+        for sink in self.sinks:
+            try:
+                sink(batch)
+            except Exception:
+                self.stats["sink_errors"] += 1
+        self.stats["delivered"] += len(batch)
+        self.stats["batches"] += 1
+
+    def _run(self) -> None:
+        """Worker loop: collect, filter and deliver batches"""
+        batch = []
+        waiters = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not None and self._admit(item):
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if batch and (item is None or waiters or len(batch) >= self.batch_size):
+                self._deliver(batch)
+                batch = []
+                deadline = None
+            if item is None or waiters:
+                for waiter in waiters:
+                    waiter.set()
+                waiters = []
+                if self._closed and self._queue.empty():
+                    return
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until everything queued so far has been delivered or suppressed
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the flush completed
+        """
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Deliver pending alerts and stop the worker"""
+        self._closed = True
+        self.flush(timeout)
+        self._thread.join(timeout)
+
+class ConsoleSink:
+    """Print alerts in the realtime monitor's banner format"""
+
+    def __call__(self, batch: List[Dict[str, Any]]) -> None:
+        for alert in batch:
+            print(f"\n!!! {alert['message']} !!!")
+            for label, text in alert["details"].items():
+                print(f"    {label}: {text}")
+            if alert.get("suppressed"):
+                print(f"    ({alert['suppressed']} similar alerts suppressed)")
+
+class FileSink:
+    """Append alerts to a JSON-lines file"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Output file
+        """
+        self.path = path
+
+    def __call__(self, batch: List[Dict[str, Any]]) -> None:
+        with open(self.path, "a") as f:
+            for alert in batch:
+                f.write(json.dumps(alert, default=str) + "\n")
+
+class WebhookSink:
+    """POST each batch as {"alerts": [...]} JSON to a URL"""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        """
+        Args:
+            url: Webhook endpoint
+            timeout: Request timeout in seconds
+        """
+        self.url = url
+        self.timeout = timeout
+
+    def __call__(self, batch: List[Dict[str, Any]]) -> None:
+        body = json.dumps({"alerts": batch}, default=str).encode()
+        req = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            response.read()
+
+class LocalWebhookServer:
+    """
+    Minimal HTTP endpoint that records the alert batches POSTed to it
+    (a stand-in for a real webhook receiver in tests and benchmarks)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0):
+        """
+        Start serving on a background thread
+
+        Args:
+            host: Bind address
+            port: Bind port (0 picks a free one)
+            delay: Seconds to stall each request, to simulate a slow receiver
+        """
+        self.received = []
+        self._lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                if delay:
+                    time.sleep(delay)
+                with stand_in._lock:
+                    stand_in.received.append(payload)
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self._server.server_address[1]}/alerts"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def alerts(self) -> List[Dict[str, Any]]:
+        """Every alert received so far, in arrival order"""
+        with self._lock:
+            return [alert for payload in self.received for alert in payload["alerts"]]
+
+    def close(self) -> None:
+        """Stop serving"""
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,204 @@
+"""
+Bounded, time-indexed store for detected anomalies
+"""
+import bisect
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+class AnomalyHistory:
+    """
+    Per-dataset anomaly records kept in time order with retention by count and age
+
+    Records live in a list with a moving head offset, so evicting old records
+    is amortized O(1), "latest K" is O(K) and "since T" is O(log n + K).
+    """
+
+    def __init__(self, max_items: int = 10000, max_age: Optional[float] = None):
+        """
+        Initialize history store
+
+        Args:
+            max_items: Maximum records kept per dataset
+            max_age: Maximum record age in seconds (None keeps records until max_items)
+        """
+        self.max_items = max_items
+        self.max_age = max_age
+        self._items = {}
+        self._times = {}
+        self._heads = {}
+        self._lock = threading.Lock()
+
+    def add(self, dataset: str, record: Dict[str, Any], ts: Optional[float] = None) -> None:
+        """
+        Add an anomaly record
+
+        Args:
+            dataset: Dataset name
+            record: Anomaly details (returned as-is by queries)
+            ts: Detection time as a Unix timestamp (defaults to now)
+        """
+        if ts is None:
+            ts = time.time()
+
+        with self._lock:
+            items = self._items.setdefault(dataset, [])
+            times = self._times.setdefault(dataset, [])
+            head = self._heads.setdefault(dataset, 0)
+
+            if not times or ts >= times[-1]:
+                items.append(record)
+                times.append(ts)
+            else:
+                # Late record - keep the time order (rare, O(n))
+                pos = bisect.bisect_right(times, ts, lo=head)
+                items.insert(pos, record)
+                times.insert(pos, ts)
+
+            self._evict(dataset)
+
+    def add_many(self, dataset: str, records: List[Dict[str, Any]], timestamps: List[float]) -> None:
+        """
+        Add a batch of anomaly records under one lock acquisition
+
+        Args:
+            dataset: Dataset name
+            records: Anomaly details
+            timestamps: Detection times as Unix timestamps, aligned with records
+        """
+        if not records:
+            return
+
+        order = sorted(range(len(records)), key=timestamps.__getitem__)
+        records = [records[i] for i in order]
+        timestamps = [timestamps[i] for i in order]
+
+        with self._lock:
+            items = self._items.setdefault(dataset, [])
+            times = self._times.setdefault(dataset, [])
+            head = self._heads.setdefault(dataset, 0)
+
+            if not times or timestamps[0] >= times[-1]:
+                items.extend(records)
+                times.extend(timestamps)
+            else:
+                # Batch overlaps retained history - merge the two ordered runs
+                pos = bisect.bisect_right(times, timestamps[0], lo=head)
+                merged = sorted(
+                    zip(times[pos:] + timestamps, range(len(times) - pos + len(timestamps))),
+                    key=lambda pair: pair[0]
+                )
+                tail_items = items[pos:] + records
+                items[pos:] = [tail_items[i] for _, i in merged]
+                times[pos:] = [t for t, _ in merged]
+
+            self._evict(dataset)
+
+    def remove(self, dataset: str, records: List[Dict[str, Any]]) -> int:
+        """
+        Remove specific records, matched by identity (e.g. a batch being replaced)
+
+        Args:
+            dataset: Dataset name
+            records: Record objects previously passed to add() or add_many()
+
+        Returns:
+            Number of records removed
+        """
+        if not records:
+            return 0
+        targets = {id(record) for record in records}
+
+        with self._lock:
+            if dataset not in self._items:
+                return 0
+            items = self._items[dataset]
+            times = self._times[dataset]
+            keep = [i for i in range(self._heads[dataset], len(items)) if id(items[i]) not in targets]
+            removed = len(items) - self._heads[dataset] - len(keep)
+            self._items[dataset] = [items[i] for i in keep]
+            self._times[dataset] = [times[i] for i in keep]
+            self._heads[dataset] = 0
+            return removed
+
+    def _evict(self, dataset: str, now: Optional[float] = None) -> None:
+        """Apply count and age retention to one dataset (caller holds the lock)"""
+        items = self._items[dataset]
+        times = self._times[dataset]
+        head = self._heads[dataset]
+
+        head = max(head, len(items) - self.max_items)
+        if self.max_age is not None:
+            cutoff = (now if now is not None else time.time()) - self.max_age
+            head = bisect.bisect_left(times, cutoff, lo=head)
+
+        # Compact once the dead prefix dominates, keeping eviction amortized O(1)
+        if head > len(items) // 2:
+            del items[:head]
+            del times[:head]
+            head = 0
+
+        self._heads[dataset] = head
+
+    def _expire(self) -> None:
+        """Apply age retention to every dataset (caller holds the lock)"""
+        if self.max_age is None:
+            return
+        now = time.time()
+        for dataset in self._items:
+            self._evict(dataset, now)
+
+    def datasets(self) -> List[str]:
+        """Names of datasets with recorded anomalies"""
+        with self._lock:
+            return list(self._items)
+
+    def count(self, dataset: Optional[str] = None) -> int:
+        """
+        Number of retained records
+
+        Args:
+            dataset: Dataset name (None counts all datasets)
+        """
+        with self._lock:
+            self._expire()
+            names = [dataset] if dataset is not None else list(self._items)
+            return sum(
+                len(self._items.get(name, [])) - self._heads.get(name, 0)
+                for name in names
+            )
+
+    def latest(self, dataset: str, k: int = 50) -> List[Dict[str, Any]]:
+        """
+        Most recent records for a dataset, newest first
+
+        Args:
+            dataset: Dataset name
+            k: Maximum number of records
+        """
+        with self._lock:
+            if dataset not in self._items:
+                return []
+            self._expire()
+            items = self._items[dataset]
+            start = max(self._heads[dataset], len(items) - k)
+            return items[start:][::-1]
+
+    def since(self, dataset: str, ts: float, k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Records detected at or after a time, newest first
+
+        Args:
+            dataset: Dataset name
+            ts: Unix timestamp lower bound
+            k: Maximum number of records (newest kept)
+        """
+        with self._lock:
+            if dataset not in self._items:
+                return []
+            self._expire()
+            items = self._items[dataset]
+            start = bisect.bisect_left(self._times[dataset], ts, lo=self._heads[dataset])
+            if k is not None:
+                start = max(start, len(items) - k)
+            return items[start:][::-1]
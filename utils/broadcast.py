@@ -0,0 +1,111 @@
+"""
+Shared broadcast buffer for Server-Sent Events streams
+"""
+import itertools
+import json
+import threading
+from collections import deque
+from typing import Any, Iterator, List, Optional, Tuple
+
+class Broadcaster:
+    """
+    Bounded log of pre-encoded SSE frames shared by all connected clients
+
+    Each event is serialized once on publish; every client just replays the
+    same bytes from its own cursor, so per-client cost is a wakeup and a write.
+    """
+
+    def __init__(self, capacity: int = 1000, heartbeat: float = 15.0):
+        """
+        Initialize broadcaster
+
+        Args:
+            capacity: Number of recent events kept for slow or reconnecting clients
+            heartbeat: Seconds of silence before a keep-alive comment is sent
+        """
+        self.capacity = capacity
+        self.heartbeat = heartbeat
+        self._events = deque(maxlen=capacity)
+        self._next_seq = 0
+        self._cond = threading.Condition()
+        self.clients = 0
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest event (-1 if none published)"""
+        return self._next_seq - 1
+
+    def publish(self, event: str, data: Any) -> int:
+        """
+        Encode an event once and wake every waiting client
+
+        Args:
+            event: SSE event name
+            data: JSON-serializable payload
+
+        Returns:
+            Sequence number assigned to the event
+        """
+        payload = json.dumps(data, separators=(",", ":"), default=str)
+        with self._cond:
+            seq = self._next_seq
+            frame = f"id: {seq}\nevent: {event}\ndata: {payload}\n\n".encode("utf-8")
+            self._events.append(frame)
+            self._next_seq += 1
+            self._cond.notify_all()
+        return seq
+
+    def read(self, cursor: int, timeout: Optional[float] = None) -> Tuple[List[bytes], int]:
+        """
+        Block until events newer than the cursor exist (or timeout)
+
+        Args:
+            cursor: Last sequence number the client has received
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Tuple of (frames, new_cursor). Clients that fell further behind than
+            the buffer capacity, or hold a cursor ahead of the newest event (a
+            Last-Event-ID from before a server restart), resume from the oldest
+            retained event.
+        """
+        with self._cond:
+            if cursor > self._next_seq - 1:
+                cursor = self._next_seq - len(self._events) - 1
+            if self._next_seq - 1 <= cursor:
+                self._cond.wait(timeout)
+
+            first_seq = self._next_seq - len(self._events)
+            offset = max(cursor + 1 - first_seq, 0)
+            if offset >= len(self._events):
+                return [], cursor
+            frames = list(itertools.islice(self._events, offset, None))
+            return frames, self._next_seq - 1
+
+    def stream(self, cursor: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Generator of SSE frames for one client connection
+
+        Args:
+            cursor: Resume after this sequence number (e.g. from Last-Event-ID);
+                    None starts with the next published event
+
+        Yields:
+            Encoded SSE frames and periodic keep-alive comments
+        """
+        if cursor is None:
+            cursor = self.last_seq
+
+        with self._cond:
+            self.clients += 1
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                frames, cursor = self.read(cursor, timeout=self.heartbeat)
+                if frames:
+                    yield b"".join(frames)
+                else:
+                    yield b": keep-alive\n\n"
+        finally:
+            with self._cond:
+                self.clients -= 1
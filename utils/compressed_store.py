@@ -0,0 +1,547 @@
+"""
+Compressed in-memory columnar store for long point histories
+
+Points are appended to a small uncompressed head; every chunk_size points
+the head is sealed into an immutable compressed chunk:
+    Timestamps  quantized to ts_resolution ticks, delta-of-delta encoded,
+                zigzagged and bit-packed at the chunk's widest delta
+    Values      Gorilla-style XOR with the previous value; zero XORs (repeats)
+                cost one bitmap bit and the others keep only the chunk-wide
+                window of meaningful bits, so both encoding and decoding are
+                whole-array numpy operations. When every value in the chunk is
+                an exact decimal with few digits (e.g. rounded sensor readings)
+                and it is smaller, the scaled integers' deltas are packed instead
+    Flags       run-length encoded
+
+Range reads only decompress the chunks overlapping the requested range.
+Each sealed chunk's count/sum/min/max/anomaly summary also goes into a
+RangeIndex, so range aggregates only decode the (at most two) chunks
+straddling the range boundaries.
+"""
+import bisect
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+from .range_index import RangeIndex, aggregate_values, combine_aggregates, summarize_aggregate
+
+MAX_DECIMALS = 6
+
+def _zigzag(x: np.ndarray) -> np.ndarray:
+    """Map signed integers to unsigned so small magnitudes get small codes"""
+    x = x.astype(np.int64)
+    return ((x << 1) ^ (x >> 63)).astype(np.uint64)
+
+def _unzigzag(u: np.ndarray) -> np.ndarray:
+    """Inverse of _zigzag"""
+    return (u >> np.uint64(1)).astype(np.int64) ^ -(u & np.uint64(1)).astype(np.int64)
+
+def _bit_width(u: np.ndarray) -> int:
+    """Bits needed for the largest value of an unsigned array"""
+    return int(u.max()).bit_length() if len(u) else 0
+
+def _pack(u: np.ndarray, width: int) -> bytes:
+    """Bit-pack unsigned integers at a fixed width"""
+    if width == 0 or len(u) == 0:
+        return b""
+    shifts = np.arange(width - 1, -1, -1, dtype=np.uint64)
+    bits = ((u.astype(np.uint64)[:, None] >> shifts) & np.uint64(1)).astype(np.uint8)
+    return np.packbits(bits.ravel()).tobytes()
+
+def _unpack(buf: bytes, width: int, count: int) -> np.ndarray:
+    """Inverse of _pack"""
+    if width == 0 or count == 0:
+        return np.zeros(count, dtype=np.uint64)
+    bits = np.unpackbits(np.frombuffer(buf, dtype=np.uint8), count=count * width)
+    shifts = np.arange(width - 1, -1, -1, dtype=np.uint64)
+    return (bits.reshape(count, width).astype(np.uint64) << shifts).sum(axis=1, dtype=np.uint64)
+
+class _Chunk:
+    """One sealed, immutable compressed chunk"""
+
+    __slots__ = ("count", "t_min", "t_max", "t0", "d0", "ts_width", "value_codec", "value_first",
+                 "value_shift", "value_width", "flag_first", "run_width", "n_runs", "sizes", "blob")
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the chunk including its Python objects"""
+        return sys.getsizeof(self) + sys.getsizeof(self.blob) + sys.getsizeof(self.sizes)
+
+def _encode_values(values: np.ndarray):
+    """Pick the smaller of the XOR and decimal-delta encodings"""
+    n = len(values)
+
+    bits = values.view(np.uint64)
+    xors = bits[1:] ^ bits[:-1]
+    nonzero = xors != 0
+    meaningful = xors[nonzero]
+    if len(meaningful):
+        combined = int(np.bitwise_or.reduce(meaningful))
+        shift = (combined & -combined).bit_length() - 1
+        width = _bit_width(meaningful) - shift
+    else:
+        shift = width = 0
+    xor_streams = [np.packbits(nonzero).tobytes(), _pack(meaningful >> np.uint64(shift), width)]
+    best = ("xor", int(bits[0]), shift, width, xor_streams)
+
+    finite = np.isfinite(values).all() and n > 1 and np.abs(values).max() < 2 ** 40
+    for decimals in range(MAX_DECIMALS + 1) if finite else ():
+        scale = 10.0 ** decimals
+        scaled = np.round(values * scale)
+        if np.abs(scaled).max() >= 2 ** 53:
+            break
+        if np.array_equal(scaled / scale, values):
+            deltas = _zigzag(np.diff(scaled.astype(np.int64)))
+            dec_width = _bit_width(deltas)
+            dec_streams = [_pack(deltas, dec_width)]
+            if len(dec_streams[0]) < sum(len(s) for s in xor_streams):
+                best = ("decimal", int(scaled[0]), decimals, dec_width, dec_streams)
+            break
+
+    return best
+
+def _decode_values(chunk: _Chunk, streams) -> np.ndarray:
+    """Inverse of _encode_values"""
+    n = chunk.count
+    if chunk.value_codec == "decimal":
+        deltas = _unzigzag(_unpack(streams[0], chunk.value_width, n - 1))
+        ints = chunk.value_first + np.concatenate(([0], np.cumsum(deltas)))
+        return ints / 10.0 ** chunk.value_shift
+
+    nonzero = np.unpackbits(np.frombuffer(streams[0], dtype=np.uint8), count=n - 1).astype(bool)
+    xors = np.zeros(n - 1, dtype=np.uint64)
+    xors[nonzero] = _unpack(streams[1], chunk.value_width, int(nonzero.sum())) << np.uint64(chunk.value_shift)
+    bits = np.bitwise_xor.accumulate(np.concatenate(([np.uint64(chunk.value_first)], xors)))
+    return bits.view(np.float64)
+
+class CompressedSeries:
+    """
+    Append-only compressed time series (timestamps, values, anomaly flags)
+    """
+
+    def __init__(self, chunk_size: int = 1024, ts_resolution: float = 1e-3):
+        """
+        Initialize series
+
+        Args:
+            chunk_size: Points per compressed chunk
+            ts_resolution: Timestamp precision in seconds (timestamps are rounded to it)
+        """
+        self.chunk_size = chunk_size
+        self.ts_resolution = ts_resolution
+        self._chunks = []
+        self._chunk_starts = []
+        self._chunk_ends = []
+        # Adjacent chunk pairs overlapping in time; dropping old chunks can
+        # bring this back to zero
+        self._overlaps = 0
+        self._index = RangeIndex()
+        self._decoded = OrderedDict()
+        self._head_ts = []
+        self._head_values = []
+        self._head_flags = []
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def _ordered(self) -> bool:
+        """Whether the sealed chunks are disjoint and in time order"""
+        return self._overlaps == 0
+
+    def _quantize(self, timestamps: np.ndarray) -> np.ndarray:
+        """Timestamps rounded to ts_resolution, exactly as a sealed chunk decodes them"""
+        return np.round(timestamps / self.ts_resolution).astype(np.int64) * self.ts_resolution
+
+    def _bounds(self, start: Optional[float], end: Optional[float]) -> Tuple[float, float]:
+        """Query bounds rounded like stored timestamps, so a point's own raw timestamp finds it"""
+        lo = -np.inf if start is None else float(self._quantize(np.array([start]))[0])
+        hi = np.inf if end is None else float(self._quantize(np.array([end]))[0])
+        return lo, hi
+
+    def append(self, ts: float, value: float, is_anomaly: bool = False) -> None:
+        """
+        Append one point
+
+        Args:
+            ts: Unix timestamp
+            value: Observed value
+            is_anomaly: Detection result
+        """
+        # The head holds quantized timestamps too, so a point matches the same
+        # range queries before and after its chunk is sealed
+        self._head_ts.append(float(self._quantize(np.array([ts]))[0]))
+        self._head_values.append(value)
+        self._head_flags.append(is_anomaly)
+        self._count += 1
+        if len(self._head_ts) >= self.chunk_size:
+            self._seal()
+
+    def extend(self, timestamps, values, flags=None) -> None:
+        """
+        Append a batch of points
+
+        Args:
+            timestamps: Unix timestamps
+            values: Observed values
+            flags: Detection results (optional)
+        """
+        timestamps = self._quantize(np.asarray(timestamps, dtype=float))
+        values = np.asarray(values, dtype=float)
+        flags = np.zeros(len(values), dtype=bool) if flags is None else np.asarray(flags, dtype=bool)
+
+        start = 0
+        while start < len(values):
+            room = self.chunk_size - len(self._head_ts)
+            end = min(start + room, len(values))
+            self._head_ts.extend(timestamps[start:end].tolist())
+            self._head_values.extend(values[start:end].tolist())
+            self._head_flags.extend(flags[start:end].tolist())
+            self._count += end - start
+            start = end
+            if len(self._head_ts) >= self.chunk_size:
+                self._seal()
+
+    def _seal(self) -> None:
+        """Compress the head into a new chunk"""
+        timestamps = np.array(self._head_ts, dtype=float)
+        values = np.array(self._head_values, dtype=float)
+        flags = np.array(self._head_flags, dtype=bool)
+        chunk = self._encode(timestamps, values, flags)
+        # Chunks that do not overlap in time allow bisecting and index-only
+        # aggregation of interior chunks
+        if self._chunk_ends and chunk.t_min < self._chunk_ends[-1]:
+            self._overlaps += 1
+        self._chunks.append(chunk)
+        self._chunk_starts.append(chunk.t_min)
+        self._chunk_ends.append(chunk.t_max)
+        summary = aggregate_values(values, flags)
+        self._index.append(summary["count"], summary["sum"], summary["sum_sq"], summary["anomalies"],
+                           summary["min"], summary["max"])
+        self._head_ts = []
+        self._head_values = []
+        self._head_flags = []
+
+    def _encode(self, timestamps: np.ndarray, values: np.ndarray, flags: np.ndarray) -> _Chunk:
+        """Compress one chunk of points"""
+        chunk = _Chunk()
+        n = len(values)
+        chunk.count = n
+
+        ticks = np.round(timestamps / self.ts_resolution).astype(np.int64)
+        # Bounds come from the stored ticks, not the raw input, so they match
+        # the decoded timestamps range() filters on
+        chunk.t_min = float(ticks.min() * self.ts_resolution)
+        chunk.t_max = float(ticks.max() * self.ts_resolution)
+        deltas = np.diff(ticks)
+        chunk.t0 = int(ticks[0])
+        chunk.d0 = int(deltas[0]) if n > 1 else 0
+        dod = _zigzag(np.diff(deltas))
+        chunk.ts_width = _bit_width(dod)
+        streams = [_pack(dod, chunk.ts_width)]
+
+        (chunk.value_codec, chunk.value_first, chunk.value_shift,
+         chunk.value_width, value_streams) = _encode_values(values)
+        streams.extend(value_streams)
+
+        changes = np.flatnonzero(flags[1:] != flags[:-1]) + 1
+        runs = np.diff(np.concatenate(([0], changes, [n]))).astype(np.uint64)
+        chunk.flag_first = bool(flags[0])
+        chunk.n_runs = len(runs)
+        chunk.run_width = _bit_width(runs)
+        streams.append(_pack(runs, chunk.run_width))
+
+        chunk.sizes = tuple(len(s) for s in streams)
+        chunk.blob = b"".join(streams)
+        return chunk
+
+    def _decode(self, chunk: _Chunk) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Decompress one chunk"""
+        streams = []
+        offset = 0
+        for size in chunk.sizes:
+            streams.append(chunk.blob[offset:offset + size])
+            offset += size
+        n = chunk.count
+
+        dod = _unzigzag(_unpack(streams[0], chunk.ts_width, max(n - 2, 0)))
+        deltas = chunk.d0 + np.concatenate(([0], np.cumsum(dod)))
+        ticks = chunk.t0 + np.concatenate(([0], np.cumsum(deltas)))[:n]
+        timestamps = ticks * self.ts_resolution
+
+        values = _decode_values(chunk, streams[1:-1])
+
+        runs = _unpack(streams[-1], chunk.run_width, chunk.n_runs).astype(np.int64)
+        states = (np.arange(chunk.n_runs) % 2 == 0) == chunk.flag_first
+        flags = np.repeat(states, runs)
+
+        return timestamps, values, flags
+
+    def range(self, start: Optional[float] = None, end: Optional[float] = None
+              ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Points with start <= ts <= end, in append order (bounds and
+        timestamps compared at ts_resolution)
+
+        Args:
+            start: Unix timestamp lower bound (None for no bound)
+            end: Unix timestamp upper bound (None for no bound)
+
+        Returns:
+            Tuple of (timestamps, values, flags) arrays
+        """
+        lo, hi = self._bounds(start, end)
+
+        # With non-overlapping chunks the scan starts at the first chunk that can reach `start`
+        first = bisect.bisect_left(self._chunk_ends, lo) if self._ordered else 0
+        parts = [
+            self._decode(chunk) for chunk in self._chunks[first:]
+            if chunk.t_max >= lo and chunk.t_min <= hi
+        ]
+        if self._head_ts:
+            parts.append((np.array(self._head_ts), np.array(self._head_values, dtype=float),
+                          np.array(self._head_flags, dtype=bool)))
+        if not parts:
+            return np.array([]), np.array([]), np.array([], dtype=bool)
+
+        timestamps = np.concatenate([p[0] for p in parts])
+        values = np.concatenate([p[1] for p in parts])
+        flags = np.concatenate([p[2] for p in parts])
+        mask = (timestamps >= lo) & (timestamps <= hi)
+        return timestamps[mask], values[mask], flags[mask]
+
+    def oldest(self) -> Optional[float]:
+        """Earliest timestamp held (None when empty)"""
+        candidates = [chunk.t_min for chunk in self._chunks] + self._head_ts[:1]
+        return min(candidates) if candidates else None
+
+    def drop_before(self, ts: float) -> int:
+        """
+        Drop whole chunks whose points are all older than a time
+
+        Args:
+            ts: Unix timestamp cutoff
+
+        Returns:
+            Number of points dropped
+        """
+        n_drop = 0
+        while n_drop < len(self._chunks) and self._chunks[n_drop].t_max < ts:
+            n_drop += 1
+        dropped = sum(chunk.count for chunk in self._chunks[:n_drop])
+        for i in range(1, min(n_drop + 1, len(self._chunks))):
+            if self._chunk_starts[i] < self._chunk_ends[i - 1]:
+                self._overlaps -= 1
+        del self._chunks[:n_drop]
+        del self._chunk_starts[:n_drop]
+        del self._chunk_ends[:n_drop]
+        self._index.drop_front(n_drop)
+        self._count -= dropped
+        return dropped
+
+    def _decode_cached(self, chunk: _Chunk) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Decode a chunk, reusing the last few results (neighbouring buckets share chunks)"""
+        key = id(chunk)
+        cached = self._decoded.get(key)
+        if cached is not None and cached[0] is chunk:
+            return cached[1]
+        decoded = self._decode(chunk)
+        self._decoded[key] = (chunk, decoded)
+        if len(self._decoded) > 4:
+            self._decoded.popitem(last=False)
+        return decoded
+
+    def aggregate(self, start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, float]:
+        """
+        Count, sum, sum of squares, anomalies, min and max of points with start <= ts <= end
+
+        Interior chunks come from the range index in O(1); only the chunks
+        straddling either boundary and the uncompressed head are scanned.
+        Chunks that overlap in time (out-of-order input) fall back to a scan.
+
+        Args:
+            start: Unix timestamp lower bound (None for no bound)
+            end: Unix timestamp upper bound (None for no bound)
+
+        Returns:
+            Raw aggregate (see utils.range_index.combine_aggregates)
+        """
+        lo, hi = self._bounds(start, end)
+
+        parts = []
+        if self._head_ts:
+            head_ts = np.array(self._head_ts)
+            parts.append(aggregate_values(np.array(self._head_values, dtype=float),
+                                          np.array(self._head_flags, dtype=bool),
+                                          (head_ts >= lo) & (head_ts <= hi)))
+
+        if not self._ordered:
+            for chunk in self._chunks:
+                if chunk.t_max >= lo and chunk.t_min <= hi:
+                    timestamps, values, flags = self._decode_cached(chunk)
+                    parts.append(aggregate_values(values, flags, (timestamps >= lo) & (timestamps <= hi)))
+            return combine_aggregates(parts)
+
+        first = bisect.bisect_left(self._chunk_ends, lo)
+        last = bisect.bisect_right(self._chunk_starts, hi)
+        full_first, full_last = first, last
+        for i in sorted({first, last - 1}):
+            if first <= i < last and (self._chunk_starts[i] < lo or self._chunk_ends[i] > hi):
+                timestamps, values, flags = self._decode_cached(self._chunks[i])
+                parts.append(aggregate_values(values, flags, (timestamps >= lo) & (timestamps <= hi)))
+                if i == first:
+                    full_first = first + 1
+                if i == last - 1:
+                    full_last = last - 1
+        parts.append(self._index.query(full_first, full_last))
+        return combine_aggregates(parts)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the series"""
+        head = sum(sys.getsizeof(items) for items in (self._head_ts, self._head_values, self._head_flags))
+        head += len(self._head_ts) * 2 * sys.getsizeof(1.0)
+        return sum(chunk.nbytes for chunk in self._chunks) + head
+
+class CompressedStore:
+    """
+    Per-source CompressedSeries with age-based retention
+    """
+
+    def __init__(self, chunk_size: int = 1024, ts_resolution: float = 1e-3, max_age: Optional[float] = None):
+        """
+        Initialize store
+
+        Args:
+            chunk_size: Points per compressed chunk
+            ts_resolution: Timestamp precision in seconds
+            max_age: Seconds of history to keep (None keeps everything); whole
+                     chunks are dropped once all their points are older
+        """
+        self.chunk_size = chunk_size
+        self.ts_resolution = ts_resolution
+        self.max_age = max_age
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _get(self, source: str) -> CompressedSeries:
+        """Series for a source, created on first use (caller holds the lock)"""
+        series = self._series.get(source)
+        if series is None:
+            series = self._series[source] = CompressedSeries(self.chunk_size, self.ts_resolution)
+        return series
+
+    def append(self, source: str, ts: float, value: float, is_anomaly: bool = False) -> None:
+        """
+        Append one point
+
+        Args:
+            source: Source name
+            ts: Unix timestamp
+            value: Observed value
+            is_anomaly: Detection result
+        """
+        with self._lock:
+            series = self._get(source)
+            series.append(ts, value, is_anomaly)
+            if self.max_age is not None and len(series) % self.chunk_size == 0:
+                series.drop_before(ts - self.max_age)
+
+    def extend(self, source: str, timestamps, values, flags=None) -> None:
+        """
+        Append a batch of points
+
+        Args:
+            source: Source name
+            timestamps: Unix timestamps
+            values: Observed values
+            flags: Detection results (optional)
+        """
+        if len(values) == 0:
+            return
+        with self._lock:
+            series = self._get(source)
+            series.extend(timestamps, values, flags)
+            if self.max_age is not None:
+                series.drop_before(float(np.max(timestamps)) - self.max_age)
+
+    def range(self, source: str, start: Optional[float] = None, end: Optional[float] = None
+              ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Points of one source with start <= ts <= end
+
+        Args:
+            source: Source name
+            start: Unix timestamp lower bound (None for no bound)
+            end: Unix timestamp upper bound (None for no bound)
+
+        Returns:
+            Tuple of (timestamps, values, flags) arrays
+        """
+        with self._lock:
+            series = self._series.get(source)
+            if series is None:
+                return np.array([]), np.array([]), np.array([], dtype=bool)
+            return series.range(start, end)
+
+    def aggregate(self, source: str, start: Optional[float] = None, end: Optional[float] = None,
+                  buckets: int = 1) -> List[Dict[str, Any]]:
+        """
+        Statistics of one source over [start, end], optionally split into equal time buckets
+
+        Args:
+            source: Source name
+            start: Unix timestamp lower bound (None for the oldest point)
+            end: Unix timestamp upper bound (None for the newest point)
+            buckets: Number of equal-width buckets
+
+        Returns:
+            One dictionary per bucket with start, end, count, min, max,
+            mean, std, anomalies and anomaly_rate
+        """
+        with self._lock:
+            series = self._series.get(source)
+            if series is None or len(series) == 0:
+                return []
+            if start is None:
+                start = series.oldest()
+            if end is None:
+                end = max(series._chunk_ends[-1:] + series._head_ts[-1:])
+            if buckets <= 1 or end <= start:
+                return [{"start": start, "end": end, **summarize_aggregate(series.aggregate(start, end))}]
+
+            # Buckets are half-open except the last, so no point is counted
+            # twice: each inner upper bound is the tick before the next edge
+            edges = np.linspace(start, end, buckets + 1)
+            inner = series._quantize(edges[1:-1]) - self.ts_resolution
+            results = []
+            for i in range(buckets):
+                upper = edges[i + 1] if i == buckets - 1 else inner[i]
+                stats = summarize_aggregate(series.aggregate(edges[i], upper))
+                results.append({"start": float(edges[i]), "end": float(edges[i + 1]), **stats})
+            return results
+
+    def oldest(self, source: str) -> Optional[float]:
+        """Earliest retained timestamp of a source (None when empty)"""
+        with self._lock:
+            series = self._series.get(source)
+            return series.oldest() if series is not None else None
+
+    def sources(self):
+        """Names of sources with stored points"""
+        with self._lock:
+            return list(self._series)
+
+    def memory_stats(self) -> Dict[str, Dict[str, float]]:
+        """Points, bytes and bytes per point for each source"""
+        with self._lock:
+            stats = {}
+            for source, series in self._series.items():
+                n_bytes = series.nbytes()
+                stats[source] = {
+                    "points": len(series),
+                    "bytes": n_bytes,
+                    "bytes_per_point": round(n_bytes / len(series), 2) if len(series) else 0
+                }
+            return stats
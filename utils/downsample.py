@@ -0,0 +1,94 @@
+"""
+Largest-Triangle-Three-Buckets downsampling for chart series
+"""
+import numpy as np
+from typing import Optional
+
+# Smallest max_points downsample_indices() accepts: half the budget for
+# flagged points and half for the line, each needing at least 2
+MIN_MAX_POINTS = 4
+
+def lttb_indices(y: np.ndarray, n_out: int, x: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Select the points that best preserve a series' visual shape
+
+    The first and last points are always kept; the rest are split into
+    n_out - 2 equal buckets and from each bucket the point forming the
+    largest triangle with the previously selected point and the next
+    bucket's centroid is kept. Bucket centroids are computed in one pass and
+    each bucket's triangle areas as one array operation, so the Python loop
+    runs once per output point rather than once per input point.
+
+    Args:
+        y: Series values
+        n_out: Number of points to keep (at least 2)
+        x: Point positions (defaults to 0..n-1)
+
+    Returns:
+        Sorted indices of the kept points
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out < 2:
+        raise ValueError(f"n_out must be at least 2, got {n_out}")
+    if n <= n_out:
+        return np.arange(n)
+    if n_out == 2:
+        return np.array([0, n - 1])
+
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # Bucket i covers [edges[i], edges[i + 1]); spacing >= 1 so none is empty
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.int64)
+    sizes = np.diff(edges)
+    centroid_x = np.append(np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / sizes, x[-1])
+    centroid_y = np.append(np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / sizes, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        cx, cy = centroid_x[i + 1], centroid_y[i + 1]
+        areas = np.abs((ax - cx) * (y[start:end] - ay) - (ax - x[start:end]) * (cy - ay))
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+
+    return selected
+
+def downsample_indices(y: np.ndarray, max_points: int, keep: Optional[np.ndarray] = None,
+                       x: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    LTTB-downsample a series while keeping flagged points
+
+    Flagged points (e.g. anomalies) are always kept unless they alone exceed
+    half of max_points, in which case they are themselves LTTB-downsampled to
+    that share; the remaining budget goes to the line. The result never has
+    more than max_points indices, however long the series is.
+
+    Args:
+        y: Series values
+        max_points: Maximum number of points to return (at least MIN_MAX_POINTS)
+        keep: Boolean mask of points that must survive (optional)
+        x: Point positions (defaults to 0..n-1)
+
+    Returns:
+        Sorted indices of the kept points
+    """
+    if max_points < MIN_MAX_POINTS:
+        raise ValueError(f"max_points must be at least {MIN_MAX_POINTS}, got {max_points}")
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+    keep_idx = np.flatnonzero(keep) if keep is not None else np.array([], dtype=np.int64)
+    keep_budget = max_points // 2
+    if len(keep_idx) > keep_budget:
+        keep_idx = keep_idx[lttb_indices(y[keep_idx], keep_budget, x[keep_idx])]
+
+    line_idx = lttb_indices(y, max_points - len(keep_idx), x)
+    return np.union1d(line_idx, keep_idx)
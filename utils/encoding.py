@@ -0,0 +1,132 @@
+"""
+Compact response encodings for chart data endpoints
+
+Two body formats are produced:
+    JSON     (application/json): the regular endpoint payload
+    Float32  (application/x-float32-series): a little-endian uint32 header
+             length, a JSON header padded to a 4-byte boundary, then every
+             series' values as one float32 array; the header maps each series
+             to its element offset and count so a browser can take
+             Float32Array views straight into chart buffers
+
+Either body may then be gzip or (when the brotli package is installed)
+brotli compressed according to Accept-Encoding.
+"""
+import gzip
+import json
+import struct
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON_MEDIA_TYPE = "application/json"
+FLOAT32_MEDIA_TYPE = "application/x-float32-series"
+
+# Bodies smaller than this are sent uncompressed - the framing costs more than it saves
+MIN_COMPRESS_SIZE = 512
+
+def encode_json(payload: Any) -> bytes:
+    """
+    Serialize a payload as compact JSON
+
+    Args:
+        payload: JSON-serializable object
+
+    Returns:
+        UTF-8 encoded body
+    """
+    return json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+
+def encode_float32_series(series: Dict[str, Dict[str, Any]], meta: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Pack several value series into the float32 typed-array format
+
+    Args:
+        series: Series name -> fields; "values" is packed as float32, every
+                other field is kept in the JSON header alongside offset/count
+        meta: Extra top-level header fields (e.g. a summary)
+
+    Returns:
+        Encoded body
+    """
+    header = dict(meta or {})
+    header["series"] = {}
+    arrays = []
+    offset = 0
+
+    for name, fields in series.items():
+        values = np.asarray(fields["values"], dtype="<f4")
+        entry = {key: value for key, value in fields.items() if key != "values"}
+        entry["offset"] = offset
+        entry["count"] = len(values)
+        header["series"][name] = entry
+        arrays.append(values)
+        offset += len(values)
+
+    header_bytes = encode_json(header)
+    header_bytes += b" " * (-len(header_bytes) % 4)
+    data = np.concatenate(arrays).tobytes() if arrays else b""
+    return struct.pack("<I", len(header_bytes)) + header_bytes + data
+
+def decode_float32_series(body: bytes) -> Dict[str, Any]:
+    """
+    Decode the float32 typed-array format (inverse of encode_float32_series)
+
+    Args:
+        body: Encoded body
+
+    Returns:
+        Header dictionary with each series' "values" restored as a float32 array
+    """
+    if len(body) < 4:
+        raise ValueError("Float32 series body is too short")
+    (header_len,) = struct.unpack_from("<I", body)
+    header = json.loads(body[4:4 + header_len])
+    data = np.frombuffer(body, dtype="<f4", offset=4 + header_len)
+    for entry in header["series"].values():
+        entry["values"] = data[entry["offset"]:entry["offset"] + entry["count"]]
+    return header
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the best supported content coding from an Accept-Encoding header
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+
+    Returns:
+        "br", "gzip", or None for identity
+    """
+    accepted = set()
+    for part in (accept_encoding or "").lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip())
+
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+def compress(body: bytes, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """
+    Compress a body with the chosen content coding
+
+    Args:
+        body: Uncompressed body
+        encoding: "br", "gzip", or None
+
+    Returns:
+        Tuple of (body, applied encoding or None)
+    """
+    if encoding is None or len(body) < MIN_COMPRESS_SIZE:
+        return body, None
+    if encoding == "br":
+        return brotli.compress(body, quality=4), "br"
+    return gzip.compress(body, compresslevel=5, mtime=0), "gzip"
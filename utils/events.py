@@ -0,0 +1,176 @@
+"""
+Run-length compaction of per-point anomaly decisions into events
+"""
+import threading
+import numpy as np
+from typing import Any, Dict, List, Optional
+
+def compact_events(flags, scores=None, timestamps=None, values=None,
+                   gap_tolerance: int = 0) -> List[Dict[str, Any]]:
+    """
+    Merge runs of flagged points into events
+
+    Args:
+        flags: Per-point decisions (predictions array or booleans)
+        scores: Per-point anomaly scores (optional)
+        timestamps: Per-point timestamps (optional, any JSON-serializable values)
+        values: Per-point observed values (optional)
+        gap_tolerance: Normal points allowed between two flagged points of one event
+
+    Returns:
+        List of events in order, each with start_index, end_index, count
+        (flagged points) and peak_index (highest score, else first point),
+        plus peak_score, peak_value, start, end and peak_at when the
+        inputs are given
+    """
+    flagged = np.flatnonzero(np.asarray(flags) != 0)
+    if len(flagged) == 0:
+        return []
+
+    # A new event starts wherever the distance to the previous flagged point
+    # exceeds the tolerance
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(flagged) > gap_tolerance + 1) + 1))
+    ends = np.concatenate((starts[1:], [len(flagged)])) - 1
+    counts = ends - starts + 1
+
+    if scores is not None:
+        flagged_scores = np.asarray(scores, dtype=float)[flagged]
+        event_ids = np.repeat(np.arange(len(starts)), counts)
+        # Sort by event, then score descending: each event's first entry is its peak
+        order = np.lexsort((-flagged_scores, event_ids))
+        peaks = flagged[order[starts]]
+    else:
+        peaks = flagged[starts]
+
+    events = []
+    for first, last, count, peak in zip(flagged[starts].tolist(), flagged[ends].tolist(),
+                                        counts.tolist(), peaks.tolist()):
+        event = {"start_index": first, "end_index": last, "count": count, "peak_index": peak}
+        if scores is not None:
+            event["peak_score"] = float(scores[peak])
+        if values is not None:
+            event["peak_value"] = float(values[peak])
+        if timestamps is not None:
+            event["start"] = timestamps[first]
+            event["end"] = timestamps[last]
+            event["peak_at"] = timestamps[peak]
+        events.append(event)
+    return events
+
+class EventCompactor:
+    """
+    Streaming compact_events(): per-dataset open events fed point by point or
+    in batches, closed once more than gap_tolerance normal points follow them
+    """
+
+    def __init__(self, gap_tolerance: int = 0):
+        """
+        Initialize compactor
+
+        Args:
+            gap_tolerance: Normal points allowed between two flagged points of one event
+        """
+        self.gap_tolerance = gap_tolerance
+        self._open = {}
+        self._quiet = {}
+        self._lock = threading.Lock()
+
+    def update(self, dataset: str, ts: Any, is_anomaly: bool, score: Optional[float] = None,
+               value: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Feed one decision
+
+        Args:
+            dataset: Dataset name
+            ts: Point timestamp
+            is_anomaly: Detection result
+            score: Anomaly score (optional)
+            value: Observed value (optional)
+
+        Returns:
+            Events closed by this point (at most one)
+        """
+        return self.update_batch(
+            dataset, [ts], [is_anomaly],
+            None if score is None else [score],
+            None if value is None else [value]
+        )
+
+    def update_batch(self, dataset: str, timestamps, flags, scores=None, values=None) -> List[Dict[str, Any]]:
+        """
+        Feed a batch of decisions in arrival order
+
+        Args:
+            dataset: Dataset name
+            timestamps: Point timestamps
+            flags: Detection results
+            scores: Anomaly scores (optional)
+            values: Observed values (optional)
+
+        Returns:
+            Events closed by this batch, oldest first
+        """
+        n = len(flags)
+        if n == 0:
+            return []
+        batch = compact_events(flags, scores, timestamps, values, self.gap_tolerance)
+        events = [_public(event) for event in batch]
+        ends = [event["end_index"] for event in batch]
+
+        with self._lock:
+            current = self._open.pop(dataset, None)
+            quiet = self._quiet.pop(dataset, 0)
+            if current is not None:
+                if batch and quiet + batch[0]["start_index"] <= self.gap_tolerance:
+                    _extend(current, events[0])
+                    events[0] = current
+                else:
+                    # Still open before this batch; its last flagged point precedes it
+                    events.insert(0, current)
+                    ends.insert(0, -1 - quiet)
+            if not events:
+                return []
+
+            closed = events[:-1]
+            tail = n - 1 - ends[-1]
+            if tail > self.gap_tolerance:
+                closed.append(events[-1])
+            else:
+                self._open[dataset] = events[-1]
+                self._quiet[dataset] = tail
+            return closed
+
+    def open_events(self) -> Dict[str, Dict[str, Any]]:
+        """Copies of the events still in progress, by dataset"""
+        with self._lock:
+            return {dataset: dict(event) for dataset, event in self._open.items()}
+
+    def flush(self, dataset: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Close events still in progress
+
+        Args:
+            dataset: Dataset name (None closes every dataset's event)
+
+        Returns:
+            The closed events
+        """
+        with self._lock:
+            names = [dataset] if dataset is not None else list(self._open)
+            self._quiet = {name: q for name, q in self._quiet.items() if name not in names}
+            return [self._open.pop(name) for name in names if name in self._open]
+
+def _public(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Streaming form of a compact_events() entry (batch-relative indices dropped)"""
+    return {key: event[key] for key in ("start", "end", "count", "peak_score", "peak_value", "peak_at")
+            if key in event}
+
+def _extend(current: Dict[str, Any], event: Dict[str, Any]) -> None:
+    """Fold a batch event into the open event it continues"""
+    current["end"] = event.get("end")
+    current["count"] += event["count"]
+    if event.get("peak_score") is not None and (current.get("peak_score") is None
+                                                or event["peak_score"] > current["peak_score"]):
+        for key in ("peak_score", "peak_value", "peak_at"):
+            if key in event:
+                current[key] = event[key]
@@ -0,0 +1,140 @@
+"""
+Parsing of bulk point uploads for the ingest endpoints
+
+Two wire formats are accepted:
+    NDJSON  (application/x-ndjson): one {"source": ..., "ts": ..., "value": ...} object per line,
+            where source is a source name or its index and ts is Unix seconds (optional)
+    Packed  (application/octet-stream): little-endian records of
+            (uint16 source index, float64 ts, float64 value), 18 bytes each
+"""
+import json
+import time
+import numpy as np
+from typing import Dict, List, Tuple
+
+POINT_DTYPE = np.dtype([("source", "<u2"), ("ts", "<f8"), ("value", "<f8")])
+
+# Accepted timestamp range (Unix seconds): 1970-01-01 up to 2100-01-01
+MIN_TIMESTAMP = 0.0
+MAX_TIMESTAMP = 4102444800.0
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+PACKED_CONTENT_TYPES = ("application/octet-stream", "application/x-anomaly-points")
+
+def pack_points(source_ids: np.ndarray, timestamps: np.ndarray, values: np.ndarray) -> bytes:
+    """
+    Encode points in the packed binary format
+
+    Args:
+        source_ids: Source indices
+        timestamps: Unix timestamps in seconds
+        values: Observed values
+
+    Returns:
+        Packed bytes ready to POST
+    """
+    records = np.empty(len(values), dtype=POINT_DTYPE)
+    records["source"] = source_ids
+    records["ts"] = timestamps
+    records["value"] = values
+    return records.tobytes()
+
+def parse_packed(body: bytes) -> np.ndarray:
+    """
+    Decode a packed binary body without copying
+
+    Args:
+        body: Request body
+
+    Returns:
+        Structured array with source, ts and value fields
+    """
+    if len(body) % POINT_DTYPE.itemsize:
+        raise ValueError(f"Packed body length {len(body)} is not a multiple of {POINT_DTYPE.itemsize}")
+    return np.frombuffer(body, dtype=POINT_DTYPE)
+
+def parse_ndjson(body: bytes, sources: List[str]) -> np.ndarray:
+    """
+    Decode an NDJSON body into the same structured array as parse_packed
+
+    Args:
+        body: Request body
+        sources: Known source names; their position is the source index
+
+    Returns:
+        Structured array with source, ts and value fields
+    """
+    source_index = {name: i for i, name in enumerate(sources)}
+    lines = [line for line in body.splitlines() if line.strip()]
+    records = np.empty(len(lines), dtype=POINT_DTYPE)
+    now = time.time()
+
+    for i, line in enumerate(lines):
+        try:
+            point = json.loads(line)
+            source = point["source"]
+            records[i] = (
+                source if isinstance(source, int) else source_index[source],
+                point.get("ts", now),
+                point["value"]
+            )
+        except (ValueError, KeyError, TypeError, OverflowError) as e:
+            raise ValueError(f"Invalid NDJSON point on line {i + 1}: {e}")
+
+    return records
+
+def validate_records(records: np.ndarray, n_sources: int) -> None:
+    """
+    Reject a batch that would corrupt detector or store state
+
+    Runs before anything is scored or stored, so a rejected request leaves
+    no trace.
+
+    Args:
+        records: Structured array with source, ts and value fields
+        n_sources: Number of known sources
+
+    Raises:
+        ValueError: On an unknown source index, a non-finite value or a
+            non-finite or out-of-range timestamp (names the first bad record)
+    """
+    if not len(records):
+        return
+    checks = [
+        (records["source"] >= n_sources, f"source index out of range (known sources: {n_sources})"),
+        (~np.isfinite(records["value"]), "value is not a finite number"),
+        (~((records["ts"] >= MIN_TIMESTAMP) & (records["ts"] <= MAX_TIMESTAMP)),
+         f"ts is not a Unix timestamp between {MIN_TIMESTAMP:.0f} and {MAX_TIMESTAMP:.0f}")
+    ]
+    for bad, message in checks:
+        if bad.any():
+            raise ValueError(f"Invalid point {int(np.argmax(bad)) + 1}: {message}")
+
+def parse_ingest_body(body: bytes, content_type: str, sources: List[str]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Decode a request body and group its points by source
+
+    Args:
+        body: Request body
+        content_type: Request Content-Type (selects the wire format)
+        sources: Known source names; their position is the source index
+
+    Returns:
+        Dictionary of source name -> (timestamps, values), each in arrival order
+    """
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in PACKED_CONTENT_TYPES:
+        records = parse_packed(body)
+    elif content_type in NDJSON_CONTENT_TYPES:
+        records = parse_ndjson(body, sources)
+    else:
+        raise ValueError(f"Unsupported Content-Type: {content_type or 'none'}")
+
+    validate_records(records, len(sources))
+
+    grouped = {}
+    source_ids = records["source"]
+    for source_id in np.unique(source_ids):
+        mask = source_ids == source_id
+        grouped[sources[source_id]] = (records["ts"][mask], records["value"][mask])
+    return grouped
@@ -0,0 +1,170 @@
+"""
+Range aggregation index over a growing sequence of block summaries
+"""
+import math
+from typing import Any, Dict, List, Optional
+
+def empty_aggregate() -> Dict[str, float]:
+    """Aggregate of no points (identity for combine_aggregates)"""
+    return {"count": 0, "sum": 0.0, "sum_sq": 0.0, "anomalies": 0, "min": math.inf, "max": -math.inf}
+
+def combine_aggregates(parts: List[Dict[str, float]]) -> Dict[str, float]:
+    """
+    Merge partial aggregates of disjoint point sets
+
+    Args:
+        parts: Dictionaries with count, sum, sum_sq, anomalies, min and max
+
+    Returns:
+        Combined aggregate in the same form
+    """
+    total = empty_aggregate()
+    for part in parts:
+        total["count"] += part["count"]
+        total["sum"] += part["sum"]
+        total["sum_sq"] += part["sum_sq"]
+        total["anomalies"] += part["anomalies"]
+        total["min"] = min(total["min"], part["min"])
+        total["max"] = max(total["max"], part["max"])
+    return total
+
+def summarize_aggregate(aggregate: Dict[str, float]) -> Dict[str, Any]:
+    """
+    Turn raw sums into the reported statistics
+
+    Args:
+        aggregate: Dictionary with count, sum, sum_sq, anomalies, min and max
+
+    Returns:
+        Dictionary with count, min, max, mean, std, anomalies and anomaly_rate
+    """
+    count = aggregate["count"]
+    if count == 0:
+        return {"count": 0, "min": None, "max": None, "mean": None, "std": None,
+                "anomalies": 0, "anomaly_rate": 0}
+    mean = aggregate["sum"] / count
+    variance = max(aggregate["sum_sq"] / count - mean * mean, 0.0)
+    return {
+        "count": int(count),
+        "min": float(aggregate["min"]),
+        "max": float(aggregate["max"]),
+        "mean": float(mean),
+        "std": math.sqrt(variance),
+        "anomalies": int(aggregate["anomalies"]),
+        "anomaly_rate": round(aggregate["anomalies"] / count * 100, 2)
+    }
+
+class RangeIndex:
+    """
+    Prefix sums (count, sum, sum of squares, anomalies) and sparse tables
+    (min, max) over block summaries appended in order
+
+    Any contiguous run of blocks is aggregated in O(1): sums are prefix
+    differences and min/max combine two overlapping power-of-two spans.
+    Appending a block costs O(log n); dropping old blocks only moves an
+    offset until the dead prefix dominates, then the tables are rebuilt.
+    """
+
+    def __init__(self):
+        """Initialize an empty index"""
+        self._base = 0
+        self._summaries = []
+        self._prefix = {"count": [0], "sum": [0.0], "sum_sq": [0.0], "anomalies": [0]}
+        self._min_table = []
+        self._max_table = []
+
+    def __len__(self) -> int:
+        return len(self._summaries) - self._base
+
+    def append(self, count: int, total: float, total_sq: float, anomalies: int,
+               minimum: float, maximum: float) -> None:
+        """
+        Add the summary of the next block
+
+        Args:
+            count: Points in the block
+            total: Sum of values
+            total_sq: Sum of squared values
+            anomalies: Flagged points
+            minimum: Smallest value
+            maximum: Largest value
+        """
+        self._summaries.append((count, total, total_sq, anomalies, minimum, maximum))
+        for key, value in (("count", count), ("sum", total), ("sum_sq", total_sq), ("anomalies", anomalies)):
+            self._prefix[key].append(self._prefix[key][-1] + value)
+
+        # Level k holds the min/max of blocks [i, i + 2^k); the new block
+        # completes exactly one new entry per level
+        n = len(self._summaries)
+        for table, value, pick in ((self._min_table, minimum, min), (self._max_table, maximum, max)):
+            if not table:
+                table.append([])
+            table[0].append(value)
+            k = 1
+            while (1 << k) <= n:
+                if len(table) <= k:
+                    table.append([])
+                i = n - (1 << k)
+                table[k].append(pick(table[k - 1][i], table[k - 1][i + (1 << (k - 1))]))
+                k += 1
+
+    def drop_front(self, n_blocks: int) -> None:
+        """
+        Forget the oldest blocks
+
+        Args:
+            n_blocks: Number of blocks to drop
+        """
+        self._base = min(self._base + n_blocks, len(self._summaries))
+        if self._base > len(self._summaries) // 2:
+            live = self._summaries[self._base:]
+            self.__init__()
+            for summary in live:
+                self.append(*summary)
+
+    def query(self, lo: int, hi: int) -> Dict[str, float]:
+        """
+        Aggregate of blocks [lo, hi), counted from the oldest retained block
+
+        Args:
+            lo: First block
+            hi: One past the last block
+
+        Returns:
+            Dictionary with count, sum, sum_sq, anomalies, min and max
+        """
+        if hi <= lo:
+            return empty_aggregate()
+        lo = int(lo) + self._base
+        hi = int(hi) + self._base
+        result = {key: prefix[hi] - prefix[lo] for key, prefix in self._prefix.items()}
+        k = (hi - lo).bit_length() - 1
+        result["min"] = min(self._min_table[k][lo], self._min_table[k][hi - (1 << k)])
+        result["max"] = max(self._max_table[k][lo], self._max_table[k][hi - (1 << k)])
+        return result
+
+def aggregate_values(values, flags, mask: Optional[Any] = None) -> Dict[str, float]:
+    """
+    Aggregate raw points (used for partially covered blocks)
+
+    Args:
+        values: Value array
+        flags: Anomaly flag array
+        mask: Boolean selection (optional)
+
+    Returns:
+        Dictionary with count, sum, sum_sq, anomalies, min and max
+    """
+    if mask is not None:
+        values = values[mask]
+        flags = flags[mask]
+    if len(values) == 0:
+        return empty_aggregate()
+    return {
+        "count": len(values),
+        "sum": float(values.sum()),
+        "sum_sq": float((values * values).sum()),
+        "anomalies": int(flags.sum()),
+        "min": float(values.min()),
+        "max": float(values.max())
+    }
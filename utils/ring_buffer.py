@@ -0,0 +1,314 @@
+"""
+Fixed-capacity ring buffer for streaming time-series points
+"""
+import math
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+class RingBuffer:
+    """
+    Thread-safe ring buffer of (value, timestamp, is_anomaly) points that
+    keeps a running mean and variance of the values it currently holds
+
+    Every appended point gets a monotonic sequence number (0, 1, 2, ...),
+    which clients use as a cursor to fetch only the points they have not seen.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize ring buffer
+
+        Args:
+            capacity: Maximum number of points retained (oldest are evicted)
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self._values = [0.0] * capacity
+        self._timestamps = [None] * capacity
+        self._flags = [False] * capacity
+        self._start = 0
+        self._size = 0
+        self._anomaly_count = 0
+        self._next_seq = 0
+
+        # Welford accumulators over the values currently in the window
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._evictions = 0
+
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value: float, timestamp: Any, is_anomaly: bool = False) -> None:
+        """
+        Append a point, evicting the oldest one when the buffer is full
+
+        Args:
+            value: Observed value
+            timestamp: Point timestamp (stored as given)
+            is_anomaly: Detection decision for the point
+        """
+        with self._lock:
+            self._append(value, timestamp, is_anomaly)
+
+    def extend(self, values: List[float], timestamps: List[Any], flags: List[bool], skipped: int = 0) -> None:
+        """
+        Append many points under a single lock acquisition
+
+        Readers see either none or all of the new points, which makes this
+        suitable for swapping in a whole new window at once. Batches at least
+        as large as the capacity rebuild the window directly in O(capacity).
+
+        Args:
+            values: Observed values
+            timestamps: Point timestamps aligned with values
+            flags: Detection decisions aligned with values
+            skipped: Number of older points from the same batch the caller
+                     already dropped because they could not fit in the window
+                     (they still consume sequence numbers)
+        """
+        n = len(values)
+        if n > self.capacity:
+            skipped += n - self.capacity
+            values = values[-self.capacity:]
+            timestamps = timestamps[-self.capacity:]
+            flags = flags[-self.capacity:]
+            n = self.capacity
+
+        with self._lock:
+            self._next_seq += skipped
+            if n == self.capacity:
+                self._values = [float(v) for v in values]
+                self._timestamps = list(timestamps)
+                self._flags = [bool(f) for f in flags]
+                self._start = 0
+                self._size = n
+                self._next_seq += n
+                self._anomaly_count = sum(self._flags)
+                self._evictions = 0
+                self._recompute_stats()
+                return
+
+            for value, timestamp, is_anomaly in zip(values, timestamps, flags):
+                self._append(value, timestamp, is_anomaly)
+
+    def _append(self, value: float, timestamp: Any, is_anomaly: bool) -> None:
+        """Append one point (caller holds the lock)"""
+        if self._size == self.capacity:
+            self._evict_oldest()
+
+        idx = (self._start + self._size) % self.capacity
+        self._values[idx] = value
+        self._timestamps[idx] = timestamp
+        self._flags[idx] = bool(is_anomaly)
+        self._size += 1
+        self._next_seq += 1
+        if is_anomaly:
+            self._anomaly_count += 1
+
+        delta = value - self._mean
+        self._mean += delta / self._size
+        self._m2 += delta * (value - self._mean)
+
+    def _evict_oldest(self) -> None:
+        """Drop the oldest point and remove it from the running statistics"""
+        value = self._values[self._start]
+        if self._flags[self._start]:
+            self._anomaly_count -= 1
+        self._start = (self._start + 1) % self.capacity
+        self._size -= 1
+
+        if self._size == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+        else:
+            old_mean = self._mean
+            self._mean = (old_mean * (self._size + 1) - value) / self._size
+            self._m2 = max(self._m2 - (value - old_mean) * (value - self._mean), 0.0)
+
+        # Recompute exactly once per full turn of the buffer so floating point
+        # drift from repeated removals never accumulates (amortized O(1))
+        self._evictions += 1
+        if self._evictions >= self.capacity:
+            self._evictions = 0
+            self._recompute_stats()
+
+    def _recompute_stats(self) -> None:
+        """Recompute mean and M2 from the stored values"""
+        values = self._ordered(self._values)
+        if not values:
+            self._mean = 0.0
+            self._m2 = 0.0
+            return
+        self._mean = math.fsum(values) / len(values)
+        self._m2 = math.fsum((v - self._mean) ** 2 for v in values)
+
+    def _ordered(self, items: List[Any], offset: int = 0) -> List[Any]:
+        """Return the stored items oldest-first, skipping the first `offset`"""
+        begin = self._start + offset
+        end = self._start + self._size
+        if begin >= self.capacity:
+            return items[begin - self.capacity:end - self.capacity]
+        if end <= self.capacity:
+            return items[begin:end]
+        return items[begin:] + items[:end - self.capacity]
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest point (-1 if nothing appended yet)"""
+        return self._next_seq - 1
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Point and anomaly counts for the current window in O(1)
+
+        Returns:
+            Dictionary with data_points and anomalies keys
+        """
+        with self._lock:
+            return {"data_points": self._size, "anomalies": self._anomaly_count}
+
+    @property
+    def mean(self) -> float:
+        """Mean of the values currently in the buffer"""
+        with self._lock:
+            return self._mean
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation of the values currently in the buffer"""
+        with self._lock:
+            return math.sqrt(self._m2 / self._size) if self._size else 0.0
+
+    def zscore(self, value: float) -> Optional[float]:
+        """
+        Absolute z-score of a value against the buffered window in O(1)
+
+        Args:
+            value: Value to evaluate
+
+        Returns:
+            |z| or None if the window has zero variance
+        """
+        with self._lock:
+            if self._size == 0 or self._m2 == 0:
+                return None
+            return abs(value - self._mean) / math.sqrt(self._m2 / self._size)
+
+    def freeze(self) -> "SeriesSnapshot":
+        """
+        Immutable copy of the window for lock-free readers
+
+        Returns:
+            SeriesSnapshot of the buffered points and counts
+        """
+        with self._lock:
+            return SeriesSnapshot(
+                self._next_seq - self._size,
+                tuple(self._ordered(self._values)),
+                tuple(self._ordered(self._timestamps)),
+                tuple(self._ordered(self._flags)),
+                self._anomaly_count
+            )
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Consistent copy of the buffered points, oldest first
+
+        Returns:
+            List of point dicts with seq, value, timestamp and is_anomaly keys
+        """
+        return self.since(-1)[0]
+
+    def since(self, seq: int) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """
+        Points appended after the given sequence number, oldest first
+
+        Args:
+            seq: Last sequence number the caller already holds (-1 for everything)
+
+        Returns:
+            Tuple of (points, last_seq, reset). last_seq is the newest sequence
+            number at read time (the caller's next cursor); reset is True when
+            points between the cursor and the oldest buffered point were
+            already evicted, or the cursor is ahead of last_seq (it came from
+            an earlier buffer), so the caller should discard what it holds;
+            the whole window is returned then
+        """
+        with self._lock:
+            first_seq = self._next_seq - self._size
+            offset = seq + 1 - first_seq
+            reset = offset < 0 or seq >= self._next_seq
+            offset = 0 if reset else offset
+
+            values = self._ordered(self._values, offset)
+            timestamps = self._ordered(self._timestamps, offset)
+            flags = self._ordered(self._flags, offset)
+            start_seq = first_seq + offset
+            last_seq = self._next_seq - 1
+
+        points = [
+            {"seq": start_seq + i, "value": v, "timestamp": t, "is_anomaly": f}
+            for i, (v, t, f) in enumerate(zip(values, timestamps, flags))
+        ]
+        return points, last_seq, reset
+
+class SeriesSnapshot:
+    """
+    Read-only window of a RingBuffer at one point in time (see RingBuffer.freeze)
+
+    Answers the same cursor queries as the buffer without taking any lock.
+    """
+
+    __slots__ = ("first_seq", "values", "timestamps", "flags", "anomalies")
+
+    def __init__(self, first_seq: int, values: tuple, timestamps: tuple, flags: tuple, anomalies: int):
+        """
+        Args:
+            first_seq: Sequence number of the oldest point
+            values: Values, oldest first
+            timestamps: Timestamps aligned with values
+            flags: Detection decisions aligned with values
+            anomalies: Number of flagged points
+        """
+        self.first_seq = first_seq
+        self.values = values
+        self.timestamps = timestamps
+        self.flags = flags
+        self.anomalies = anomalies
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest point (-1 if nothing appended yet)"""
+        return self.first_seq + len(self.values) - 1
+
+    def counts(self) -> Dict[str, int]:
+        """Point and anomaly counts, as RingBuffer.counts()"""
+        return {"data_points": len(self.values), "anomalies": self.anomalies}
+
+    def since(self, seq: int) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """
+        Points after a sequence number, as RingBuffer.since()
+
+        Args:
+            seq: Last sequence number the caller already holds (-1 for everything)
+
+        Returns:
+            Tuple of (points, last_seq, reset)
+        """
+        offset = seq + 1 - self.first_seq
+        reset = offset < 0 or seq > self.last_seq
+        offset = 0 if reset else offset
+        start_seq = self.first_seq + offset
+        points = [
+            {"seq": start_seq + i, "value": v, "timestamp": t, "is_anomaly": f}
+            for i, (v, t, f) in enumerate(zip(self.values[offset:], self.timestamps[offset:], self.flags[offset:]))
+        ]
+        return points, self.last_seq, reset
@@ -0,0 +1,290 @@
+"""
+Multi-resolution rollups (e.g. 1 minute and 1 hour buckets) maintained on ingest
+"""
+import bisect
+import math
+import threading
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_TIERS = ((60, 7 * 24 * 3600), (3600, 365 * 24 * 3600))
+
+def parse_tiers(spec: str) -> Tuple[Tuple[float, float], ...]:
+    """
+    Parse a tier specification such as "60:604800,3600:31536000"
+
+    Args:
+        spec: Comma-separated width:retention pairs in seconds
+
+    Returns:
+        Tuple of (width, retention) pairs, finest first
+    """
+    tiers = []
+    for part in spec.split(","):
+        width, _, retention = part.partition(":")
+        try:
+            tiers.append((float(width), float(retention)))
+        except ValueError:
+            raise ValueError(f"Invalid rollup tier {part!r} (expected width:retention in seconds)")
+    return tuple(sorted(tiers))
+
+class RollupTier:
+    """
+    Fixed-width time buckets holding count, sum, min, max and anomaly count
+
+    Buckets are kept in key order in parallel lists; in-order points update
+    the newest bucket in O(1) and late points find theirs by bisection.
+    """
+
+    def __init__(self, width: float, retention: float):
+        """
+        Initialize tier
+
+        Args:
+            width: Bucket width in seconds
+            retention: Seconds of buckets to keep
+        """
+        self.width = width
+        self.retention = retention
+        self._keys = []
+        self._count = []
+        self._sum = []
+        self._min = []
+        self._max = []
+        self._anomalies = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _bucket(self, key: int) -> int:
+        """Position of a bucket, created if missing"""
+        keys = self._keys
+        if keys and keys[-1] == key:
+            return len(keys) - 1
+        if not keys or key > keys[-1]:
+            pos = len(keys)
+        else:
+            pos = bisect.bisect_left(keys, key)
+            if pos < len(keys) and keys[pos] == key:
+                return pos
+        keys.insert(pos, key)
+        self._count.insert(pos, 0)
+        self._sum.insert(pos, 0.0)
+        self._min.insert(pos, math.inf)
+        self._max.insert(pos, -math.inf)
+        self._anomalies.insert(pos, 0)
+        return pos
+
+    def add(self, ts: float, value: float, is_anomaly: bool = False) -> None:
+        """
+        Fold one point into its bucket
+
+        Args:
+            ts: Unix timestamp
+            value: Observed value
+            is_anomaly: Detection result
+        """
+        pos = self._bucket(int(ts // self.width))
+        self._count[pos] += 1
+        self._sum[pos] += value
+        if value < self._min[pos]:
+            self._min[pos] = value
+        if value > self._max[pos]:
+            self._max[pos] = value
+        if is_anomaly:
+            self._anomalies[pos] += 1
+
+    def add_many(self, timestamps: np.ndarray, values: np.ndarray, flags: np.ndarray) -> None:
+        """
+        Fold a batch of points into their buckets (reduced per bucket first)
+
+        Args:
+            timestamps: Unix timestamps
+            values: Observed values
+            flags: Detection results
+        """
+        keys, inverse = np.unique(np.floor_divide(timestamps, self.width).astype(np.int64), return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(keys))
+        sums = np.bincount(inverse, weights=values, minlength=len(keys))
+        anomalies = np.bincount(inverse, weights=flags.astype(float), minlength=len(keys))
+        minima = np.full(len(keys), np.inf)
+        maxima = np.full(len(keys), -np.inf)
+        np.minimum.at(minima, inverse, values)
+        np.maximum.at(maxima, inverse, values)
+
+        for key, count, total, lo, hi, flagged in zip(keys.tolist(), counts.tolist(), sums.tolist(),
+                                                      minima.tolist(), maxima.tolist(), anomalies.tolist()):
+            pos = self._bucket(key)
+            self._count[pos] += count
+            self._sum[pos] += total
+            self._min[pos] = min(self._min[pos], lo)
+            self._max[pos] = max(self._max[pos], hi)
+            self._anomalies[pos] += int(flagged)
+
+    def expire(self, now: float) -> None:
+        """
+        Drop buckets older than the retention
+
+        Args:
+            now: Current Unix timestamp
+        """
+        cutoff = bisect.bisect_left(self._keys, int((now - self.retention) // self.width))
+        if cutoff:
+            for column in (self._keys, self._count, self._sum, self._min, self._max, self._anomalies):
+                del column[:cutoff]
+
+    def oldest(self) -> Optional[float]:
+        """Start of the oldest retained bucket (None when empty)"""
+        return self._keys[0] * self.width if self._keys else None
+
+    def query(self, start: float, end: float, resolution: float) -> List[Dict[str, Any]]:
+        """
+        Buckets overlapping [start, end], merged into resolution-wide groups
+
+        Args:
+            start: Unix timestamp lower bound
+            end: Unix timestamp upper bound
+            resolution: Output bucket width in seconds (a multiple of the tier width works best)
+
+        Returns:
+            List of {start, count, mean, min, max, anomalies} dictionaries
+        """
+        lo = bisect.bisect_left(self._keys, int(start // self.width)) if math.isfinite(start) else 0
+        hi = bisect.bisect_right(self._keys, int(end // self.width)) if math.isfinite(end) else len(self._keys)
+        if hi <= lo:
+            return []
+
+        keys = np.array(self._keys[lo:hi])
+        groups = np.floor_divide(keys * self.width, resolution).astype(np.int64)
+        boundaries = np.flatnonzero(np.diff(groups)) + 1
+        starts = np.concatenate(([0], boundaries))
+
+        counts = np.add.reduceat(np.array(self._count[lo:hi]), starts)
+        sums = np.add.reduceat(np.array(self._sum[lo:hi]), starts)
+        minima = np.minimum.reduceat(np.array(self._min[lo:hi]), starts)
+        maxima = np.maximum.reduceat(np.array(self._max[lo:hi]), starts)
+        anomalies = np.add.reduceat(np.array(self._anomalies[lo:hi]), starts)
+
+        return [
+            {"start": float(group * resolution), "count": int(count), "mean": float(total / count),
+             "min": float(low), "max": float(high), "anomalies": int(flagged)}
+            for group, count, total, low, high, flagged in zip(
+                groups[starts].tolist(), counts.tolist(), sums.tolist(),
+                minima.tolist(), maxima.tolist(), anomalies.tolist()
+            )
+        ]
+
+class RollupStore:
+    """
+    Per-source rollup tiers updated incrementally as points arrive
+    """
+
+    def __init__(self, tiers: Sequence[Tuple[float, float]] = DEFAULT_TIERS):
+        """
+        Initialize store
+
+        Args:
+            tiers: (bucket width, retention) pairs in seconds
+        """
+        self.tiers = tuple(sorted(tiers))
+        self._series = {}
+        self._newest = {}
+        self._lock = threading.Lock()
+
+    def _get(self, source: str) -> List[RollupTier]:
+        """Tiers for a source, created on first use (caller holds the lock)"""
+        tiers = self._series.get(source)
+        if tiers is None:
+            tiers = self._series[source] = [RollupTier(width, retention) for width, retention in self.tiers]
+        return tiers
+
+    def _expire(self, source: str, ts: float) -> None:
+        """Apply retention once the newest point enters a new finest-tier bucket (caller holds the lock)"""
+        width = self.tiers[0][0]
+        previous = self._newest.get(source)
+        if previous is None or ts // width > previous // width:
+            for tier in self._series[source]:
+                tier.expire(ts)
+        if previous is None or ts > previous:
+            self._newest[source] = ts
+
+    def add(self, source: str, ts: float, value: float, is_anomaly: bool = False) -> None:
+        """
+        Fold one point into every tier
+
+        Args:
+            source: Source name
+            ts: Unix timestamp
+            value: Observed value
+            is_anomaly: Detection result
+        """
+        with self._lock:
+            for tier in self._get(source):
+                tier.add(ts, value, is_anomaly)
+            self._expire(source, ts)
+
+    def add_many(self, source: str, timestamps, values, flags=None) -> None:
+        """
+        Fold a batch of points into every tier
+
+        Args:
+            source: Source name
+            timestamps: Unix timestamps
+            values: Observed values
+            flags: Detection results (optional)
+        """
+        if len(values) == 0:
+            return
+        timestamps = np.asarray(timestamps, dtype=float)
+        values = np.asarray(values, dtype=float)
+        flags = np.zeros(len(values), dtype=bool) if flags is None else np.asarray(flags, dtype=bool)
+        with self._lock:
+            for tier in self._get(source):
+                tier.add_many(timestamps, values, flags)
+            self._expire(source, float(timestamps.max()))
+
+    def pick_tier(self, source: str, start: Optional[float], resolution: float) -> Optional[RollupTier]:
+        """
+        Coarsest tier no wider than the resolution that still covers the start
+
+        Args:
+            source: Source name
+            start: Unix timestamp lower bound (None for no bound)
+            resolution: Requested bucket width in seconds
+
+        Returns:
+            The tier, or None when raw points are needed (resolution finer than every tier)
+        """
+        with self._lock:
+            tiers = self._series.get(source, [])
+            eligible = [tier for tier in tiers if tier.width <= resolution]
+            if not eligible:
+                return None
+            for tier in reversed(eligible):
+                oldest = tier.oldest()
+                if start is None or oldest is None or oldest <= start:
+                    return tier
+            # No tier reaches back far enough: the longest-retained one has the most
+            return max(eligible, key=lambda tier: tier.retention)
+
+    def query(self, source: str, start: Optional[float], end: Optional[float],
+              resolution: float) -> Tuple[Optional[float], List[Dict[str, Any]]]:
+        """
+        Rolled-up buckets of one source over [start, end] at a resolution
+
+        Args:
+            source: Source name
+            start: Unix timestamp lower bound (None for no bound)
+            end: Unix timestamp upper bound (None for no bound)
+            resolution: Requested bucket width in seconds
+
+        Returns:
+            Tuple of (width of the tier used or None if raw points are needed, buckets)
+        """
+        tier = self.pick_tier(source, start, resolution)
+        if tier is None:
+            return None, []
+        with self._lock:
+            buckets = tier.query(-math.inf if start is None else start,
+                                 math.inf if end is None else end, resolution)
+        return tier.width, buckets
@@ -0,0 +1,202 @@
+"""
+Shared-memory ring buffer for one writer process and many reader processes
+"""
+import threading
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+# int64 header slots
+_VERSION = 0    # seqlock counter: odd while a write is in progress
+_CAPACITY = 1
+_NEXT_SEQ = 2   # sequence number the next point will get
+_ANOMALIES = 3  # flagged points currently in the window
+HEADER_SLOTS = 8
+
+class SharedRing:
+    """
+    Fixed-capacity ring of (value, timestamp, is_anomaly) points in a
+    multiprocessing.shared_memory block
+
+    Layout: int64 header, then float64 values, float64 Unix timestamps and
+    uint8 flags, each `capacity` long. Sequence numbers work as in
+    RingBuffer (0, 1, 2, ...; readers pass their last one as a cursor).
+
+    Writes are seqlock-protected: the writer makes the version odd, updates
+    the arrays and header, then makes it even again. Readers copy what they
+    need and retry if the version was odd or changed meanwhile, so they
+    never take a lock and never see a half-written batch. The seqlock
+    assumes one writer at a time, so writes through one handle are
+    serialized by a thread lock (several writer threads in the owning
+    process are fine; several writer processes are not supported).
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool = False):
+        """
+        Wrap a shared memory block (use create() or attach())
+
+        Args:
+            shm: Shared memory block holding the ring
+            owner: Whether this handle created the block (and may unlink it)
+        """
+        self._shm = shm
+        self._owner = owner
+        self._header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=shm.buf)
+        capacity = int(self._header[_CAPACITY])
+        offset = HEADER_SLOTS * 8
+        self._values = np.ndarray((capacity,), dtype=np.float64, buffer=shm.buf, offset=offset)
+        self._timestamps = np.ndarray((capacity,), dtype=np.float64, buffer=shm.buf, offset=offset + capacity * 8)
+        self._flags = np.ndarray((capacity,), dtype=np.uint8, buffer=shm.buf, offset=offset + capacity * 16)
+        self.capacity = capacity
+        self.name = shm.name
+        self._write_lock = threading.Lock()
+
+    @classmethod
+    def create(cls, name: Optional[str], capacity: int) -> "SharedRing":
+        """
+        Allocate a new ring
+
+        Args:
+            name: Shared memory name (None lets the OS pick one)
+            capacity: Maximum number of points retained
+
+        Returns:
+            Writer handle that owns the block
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        shm = shared_memory.SharedMemory(name=name, create=True, size=HEADER_SLOTS * 8 + capacity * 17)
+        header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[_CAPACITY] = capacity
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedRing":
+        """
+        Open an existing ring
+
+        Args:
+            name: Shared memory name given to create()
+
+        Returns:
+            Handle for reading
+        """
+        return cls(shared_memory.SharedMemory(name=name))
+
+    def append(self, value: float, ts: float, is_anomaly: bool = False) -> None:
+        """
+        Publish one point (writer process only)
+
+        Args:
+            value: Observed value
+            ts: Unix timestamp
+            is_anomaly: Detection decision
+        """
+        self.extend(np.array([value], dtype=float), np.array([ts], dtype=float), np.array([is_anomaly]))
+
+    def extend(self, values: np.ndarray, timestamps: np.ndarray, flags: np.ndarray) -> None:
+        """
+        Publish a batch of points atomically for readers (writer process only,
+        thread-safe)
+
+        Args:
+            values: Observed values
+            timestamps: Unix timestamps aligned with values
+            flags: Detection decisions aligned with values
+        """
+        values = np.asarray(values, dtype=float)
+        timestamps = np.asarray(timestamps, dtype=float)
+        flags = np.asarray(flags, dtype=np.uint8)
+        n = len(values)
+        if n == 0:
+            return
+        skipped = max(n - self.capacity, 0)
+        if skipped:
+            values, timestamps, flags = values[skipped:], timestamps[skipped:], flags[skipped:]
+            n = self.capacity
+
+        with self._write_lock:
+            self._write(values, timestamps, flags, n, skipped)
+
+    def _write(self, values, timestamps, flags, n, skipped):
+        """Seqlock-protected write of a batch (caller holds the writer lock)"""
+        header = self._header
+        next_seq = int(header[_NEXT_SEQ]) + skipped
+        size = min(int(header[_NEXT_SEQ]), self.capacity)
+        evicted = max(size + n - self.capacity, 0)
+        positions = (next_seq + np.arange(n)) % self.capacity
+
+        header[_VERSION] += 1
+        if skipped:
+            # The batch replaces the whole window
+            header[_ANOMALIES] = 0
+        elif evicted:
+            header[_ANOMALIES] -= int(self._flags[positions[:evicted]].sum())
+        self._values[positions] = values
+        self._timestamps[positions] = timestamps
+        self._flags[positions] = flags
+        header[_ANOMALIES] += int(flags.sum())
+        header[_NEXT_SEQ] = next_seq + n
+        header[_VERSION] += 1
+
+    def read(self, since: int = -1) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int, int, bool]:
+        """
+        Consistent copy of the points after a cursor, oldest first
+
+        Args:
+            since: Last sequence number the caller already holds (-1 for everything)
+
+        Returns:
+            Tuple of (values, timestamps, flags, start_seq, last_seq, reset) with
+            the same cursor semantics as RingBuffer.since()
+        """
+        header = self._header
+        while True:
+            version = int(header[_VERSION])
+            if version & 1:
+                time.sleep(0)
+                continue
+            next_seq = int(header[_NEXT_SEQ])
+            size = min(next_seq, self.capacity)
+            first_seq = next_seq - size
+            offset = since + 1 - first_seq
+            reset = offset < 0 or since >= next_seq
+            offset = 0 if reset else offset
+            positions = np.arange(first_seq + offset, next_seq) % self.capacity
+            values = self._values[positions]
+            timestamps = self._timestamps[positions]
+            flags = self._flags[positions].astype(bool)
+            if int(header[_VERSION]) == version:
+                return values, timestamps, flags, first_seq + offset, next_seq - 1, reset
+
+    def counts(self) -> dict:
+        """
+        Point and anomaly counts for the current window
+
+        Returns:
+            Dictionary with data_points and anomalies keys
+        """
+        header = self._header
+        while True:
+            version = int(header[_VERSION])
+            if version & 1:
+                time.sleep(0)
+                continue
+            counts = {"data_points": min(int(header[_NEXT_SEQ]), self.capacity),
+                      "anomalies": int(header[_ANOMALIES])}
+            if int(header[_VERSION]) == version:
+                return counts
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest point (-1 if nothing published yet)"""
+        return int(self._header[_NEXT_SEQ]) - 1
+
+    def close(self) -> None:
+        """Detach from the block (and free it if this handle created it)"""
+        self._header = self._values = self._timestamps = self._flags = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
@@ -0,0 +1,61 @@
+"""
+Versioned snapshot publication for lock-free readers
+"""
+import threading
+from typing import Any, Callable, Tuple
+
+class SnapshotPublisher:
+    """
+    Latest immutable state of the detection side, replaced wholesale
+
+    Writers build a complete new state and swap it in with a single
+    reference assignment (atomic in CPython); readers take (version, state)
+    with get() and use it without any lock. States are never mutated after
+    publication, so a reader cannot see a torn update, and the version,
+    which increases with every publication, identifies a state exactly
+    (usable as an ETag).
+    """
+
+    def __init__(self, state: Any = None):
+        """
+        Initialize publisher
+
+        Args:
+            state: Initial state (published as version 0)
+        """
+        self._current = (0, state)
+        self._write_lock = threading.Lock()
+
+    def publish(self, build: Callable[[], Any]) -> int:
+        """
+        Build the next state and publish it
+
+        Writers are serialized around build(), so a state built from newer
+        data is never replaced by one built from older data. Readers never
+        take this lock.
+
+        Args:
+            build: Returns the new state (must not be mutated afterwards)
+
+        Returns:
+            Version of the published state
+        """
+        with self._write_lock:
+            state = build()
+            version = self._current[0] + 1
+            self._current = (version, state)
+            return version
+
+    def get(self) -> Tuple[int, Any]:
+        """
+        Current (version, state) pair
+
+        Returns:
+            Tuple of (version, state) taken from one publication
+        """
+        return self._current
+
+    @property
+    def version(self) -> int:
+        """Version of the current state"""
+        return self._current[0]
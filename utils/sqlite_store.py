@@ -0,0 +1,320 @@
+"""
+Optional persistent point and anomaly store on local SQLite
+"""
+import json
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import numpy as np
+from typing import Any, Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS points (
+    source TEXT NOT NULL,
+    ts REAL NOT NULL,
+    value REAL NOT NULL,
+    is_anomaly INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_points_source_ts ON points (source, ts);
+CREATE INDEX IF NOT EXISTS idx_points_anomalies ON points (source, ts) WHERE is_anomaly = 1;
+
+CREATE TABLE IF NOT EXISTS anomalies (
+    source TEXT NOT NULL,
+    ts REAL NOT NULL,
+    value REAL,
+    score REAL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_anomalies_source_ts ON anomalies (source, ts);
+"""
+
+# Rows returned by points()/anomalies() when the caller gives no limit
+DEFAULT_LIMIT = 10000
+
+class PointStore:
+    """
+    Points and anomaly records persisted to SQLite by a background writer
+
+    Callers only enqueue work (never blocking: when max_pending rows are
+    already waiting the new batch is dropped and counted), and a single
+    writer thread commits everything pending in one transaction once
+    batch_size rows accumulate or flush_interval elapses. The database runs in WAL mode so readers on
+    other connections never wait for the writer.
+    """
+
+    def __init__(self, path: str, batch_size: int = 5000, flush_interval: float = 0.5,
+                 max_pending: int = 200000):
+        """
+        Initialize store and start the writer thread
+
+        Args:
+            path: SQLite database file
+            batch_size: Rows per transaction before an early commit
+            flush_interval: Maximum seconds a queued row waits for its commit
+            max_pending: Maximum uncommitted rows before new writes are dropped
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.stats = {"points": 0, "anomalies": 0, "commits": 0, "dropped": 0, "failed": 0}
+        self.last_error = None
+
+        writer = self._connect()
+        writer.executescript(SCHEMA)
+        writer.commit()
+
+        self._queue = queue.Queue()
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, args=(writer,), daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection configured for WAL with relaxed fsync"""
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _enqueue(self, item: tuple, n_rows: int) -> bool:
+        """Queue work for the writer without blocking (drops it when the backlog is full)"""
+        with self._pending_lock:
+            if self._pending + n_rows > self.max_pending:
+                self.stats["dropped"] += n_rows
+                return False
+            self._pending += n_rows
+        self._queue.put(item)
+        return True
+
+    def add_point(self, source: str, ts: float, value: float, is_anomaly: bool = False) -> bool:
+        """
+        Queue one point
+
+        Args:
+            source: Source name
+            ts: Unix timestamp
+            value: Observed value
+            is_anomaly: Detection result
+
+        Returns:
+            False if the backlog was full and the point was dropped
+        """
+        return self._enqueue(("points", source, [ts], [value], [is_anomaly]), 1)
+
+    def add_points(self, source: str, timestamps: np.ndarray, values: np.ndarray,
+                   flags: Optional[np.ndarray] = None) -> bool:
+        """
+        Queue a batch of points (converted to rows on the writer thread)
+
+        Args:
+            source: Source name
+            timestamps: Unix timestamps
+            values: Observed values
+            flags: Detection results (optional)
+
+        Returns:
+            False if the backlog was full and the batch was dropped
+        """
+        if flags is None:
+            flags = np.zeros(len(values), dtype=bool)
+        return self._enqueue(("points", source, timestamps, values, flags), len(values))
+
+    def add_anomalies(self, source: str, timestamps: List[float], records: List[Dict[str, Any]]) -> bool:
+        """
+        Queue anomaly records
+
+        Args:
+            source: Source name
+            timestamps: Detection times as Unix timestamps, aligned with records
+            records: Anomaly details (returned as-is by anomalies(); "value"
+                     and "score" are also stored as columns when present)
+
+        Returns:
+            False if the backlog was full and the records were dropped
+        """
+        if not records:
+            return True
+        return self._enqueue(("anomalies", source, timestamps, records), len(records))
+
+    def _run(self, conn: sqlite3.Connection) -> None:
+        """Writer loop: drain the queue and commit in batches"""
+        points = []
+        anomalies = []
+        waiters = []
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is not None:
+                if item[0] == "flush":
+                    waiters.append(item[1])
+                else:
+                    try:
+                        self._add_rows(item, points, anomalies)
+                    except Exception as e:
+                        # A malformed item is dropped on its own; the writer keeps running
+                        self._failed(len(item[3]), e)
+                        self._release(len(item[3]))
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            due = item is None or waiters or len(points) + len(anomalies) >= self.batch_size
+            if due and (points or anomalies or waiters):
+                if points or anomalies:
+                    try:
+                        with conn:  # rolls the transaction back on error
+                            conn.executemany("INSERT INTO points VALUES (?, ?, ?, ?)", points)
+                            conn.executemany("INSERT INTO anomalies VALUES (?, ?, ?, ?, ?)", anomalies)
+                    except Exception as e:
+                        self._failed(len(points) + len(anomalies), e)
+                    else:
+                        self.stats["points"] += len(points)
+                        self.stats["anomalies"] += len(anomalies)
+                        self.stats["commits"] += 1
+                    self._release(len(points) + len(anomalies))
+                    points = []
+                    anomalies = []
+                for waiter in waiters:
+                    waiter.set()
+                waiters = []
+                deadline = None
+
+            if self._closed and self._queue.empty() and not (points or anomalies):
+                conn.close()
+                return
+
+    @staticmethod
+    def _add_rows(item: tuple, points: list, anomalies: list) -> None:
+        """Convert one queued item to rows for the next transaction"""
+        if item[0] == "points":
+            _, source, timestamps, values, flags = item
+            points.extend(zip(
+                [source] * len(values),
+                np.asarray(timestamps, dtype=float).tolist(),
+                np.asarray(values, dtype=float).tolist(),
+                np.asarray(flags, dtype=int).tolist()
+            ))
+        else:
+            _, source, timestamps, records = item
+            rows = [
+                (source, float(ts), record.get("value"), record.get("score"), json.dumps(record, default=str))
+                for ts, record in zip(timestamps, records)
+            ]
+            anomalies.extend(rows)
+
+    def _release(self, n_rows: int) -> None:
+        """Return rows that were committed or dropped to the backlog budget"""
+        with self._pending_lock:
+            self._pending -= n_rows
+
+    def _failed(self, n_rows: int, error: Exception) -> None:
+        """Count rows lost to a failed conversion or transaction"""
+        if n_rows and self.stats["failed"] == 0:
+            print(f"PointStore: write failed, dropping rows ({error})", file=sys.stderr)
+        self.stats["failed"] += n_rows
+        self.last_error = str(error)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until everything queued so far is committed
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the flush completed
+        """
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """
+        Commit pending writes and stop the writer thread
+
+        Args:
+            timeout: Maximum seconds to wait for the final flush
+        """
+        self._closed = True
+        self.flush(timeout)
+        self._thread.join(timeout=5)
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers = []
+
+    def _query(self, sql: str, params: tuple) -> List[tuple]:
+        """Run a read query on a pooled reader connection"""
+        with self._readers_lock:
+            conn = self._readers.pop() if self._readers else None
+        if conn is None:
+            conn = self._connect()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            with self._readers_lock:
+                self._readers.append(conn)
+
+    @staticmethod
+    def _range(source: str, start: Optional[float], end: Optional[float]) -> tuple:
+        """WHERE clause and parameters for a source and optional time range"""
+        return (
+            "source = ? AND ts >= ? AND ts <= ?",
+            (source, start if start is not None else float("-inf"), end if end is not None else float("inf"))
+        )
+
+    def points(self, source: str, start: Optional[float] = None, end: Optional[float] = None,
+               limit: Optional[int] = None, anomalies_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Points of one source in a time range, oldest first
+
+        Args:
+            source: Source name
+            start: Unix timestamp lower bound (inclusive, optional)
+            end: Unix timestamp upper bound (inclusive, optional)
+            limit: Maximum number of points, newest kept (default: DEFAULT_LIMIT)
+            anomalies_only: Only return flagged points
+
+        Returns:
+            List of {"ts", "value", "is_anomaly"} dictionaries
+        """
+        where, params = self._range(source, start, end)
+        if anomalies_only:
+            where += " AND is_anomaly = 1"
+        sql = f"SELECT ts, value, is_anomaly FROM points WHERE {where} ORDER BY ts DESC LIMIT ?"
+        rows = self._query(sql, params + (limit if limit is not None else DEFAULT_LIMIT,))
+        return [{"ts": ts, "value": value, "is_anomaly": bool(flag)} for ts, value, flag in reversed(rows)]
+
+    def anomalies(self, source: str, start: Optional[float] = None, end: Optional[float] = None,
+                  limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Anomaly records of one source in a time range, newest first
+
+        Args:
+            source: Source name
+            start: Unix timestamp lower bound (inclusive, optional)
+            end: Unix timestamp upper bound (inclusive, optional)
+            limit: Maximum number of records (default: DEFAULT_LIMIT)
+
+        Returns:
+            Records as passed to add_anomalies()
+        """
+        where, params = self._range(source, start, end)
+        sql = f"SELECT record FROM anomalies WHERE {where} ORDER BY ts DESC LIMIT ?"
+        rows = self._query(sql, params + (limit if limit is not None else DEFAULT_LIMIT,))
+        return [json.loads(record) for (record,) in rows]
+
+    def sources(self) -> List[str]:
+        """Names of sources with stored points"""
+        return [source for (source,) in self._query("SELECT DISTINCT source FROM points", ())]
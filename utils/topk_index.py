@@ -0,0 +1,257 @@
+"""
+Top-K anomaly index: per-dataset anomaly events bucketed by time and ordered by score
+"""
+import bisect
+import heapq
+import itertools
+import math
+import threading
+from typing import Any, Dict, List, Optional
+
+class _DatasetIndex:
+    """
+    Time buckets of (-score, seq, ts, record) entries, each kept best first,
+    under a segment tree holding the best score of every bucket
+
+    Buckets live in a list with a moving head offset (dropped buckets become
+    empty leaves) and the tree is rebuilt only when the dead prefix dominates
+    or a late event opens a bucket in the middle.
+    """
+
+    def __init__(self, width: float):
+        self.width = width
+        self.keys = []
+        self.buckets = []
+        self.head = 0
+        self.size = 0
+        self.newest = -math.inf
+        self._leaves = 1
+        self._tree = [-math.inf, -math.inf]
+
+    def _rebuild(self) -> None:
+        """Compact the dropped prefix and rebuild the tree"""
+        del self.keys[:self.head]
+        del self.buckets[:self.head]
+        self.head = 0
+        leaves = 1
+        while leaves < len(self.buckets):
+            leaves *= 2
+        tree = [-math.inf] * (2 * leaves)
+        for i, bucket in enumerate(self.buckets):
+            tree[leaves + i] = -bucket[0][0]
+        for node in range(leaves - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        self._leaves = leaves
+        self._tree = tree
+
+    def _set_leaf(self, pos: int) -> None:
+        """Propagate a changed bucket best score up the tree"""
+        tree = self._tree
+        bucket = self.buckets[pos]
+        node = self._leaves + pos
+        tree[node] = -bucket[0][0] if bucket else -math.inf
+        node //= 2
+        while node:
+            best = max(tree[2 * node], tree[2 * node + 1])
+            if tree[node] == best:
+                break
+            tree[node] = best
+            node //= 2
+
+    def add(self, entry: tuple) -> None:
+        """Insert one (-score, seq, ts, record) entry"""
+        ts = entry[2]
+        key = int(ts // self.width)
+        keys = self.keys
+        rebuild = False
+        if keys and len(keys) > self.head and keys[-1] == key:
+            pos = len(keys) - 1
+        elif len(keys) == self.head or key > keys[-1]:
+            pos = len(keys)
+            keys.append(key)
+            self.buckets.append([])
+            rebuild = pos >= self._leaves
+        else:
+            pos = bisect.bisect_left(keys, key, lo=self.head)
+            if keys[pos] != key:
+                # Late event in a gap: positions shift (rare, O(n))
+                keys.insert(pos, key)
+                self.buckets.insert(pos, [])
+                rebuild = True
+
+        bisect.insort(self.buckets[pos], entry)
+        self.size += 1
+        self.newest = max(self.newest, ts)
+        if rebuild:
+            self._rebuild()
+        else:
+            self._set_leaf(pos)
+
+    def drop_oldest(self) -> None:
+        """Forget the oldest retained bucket"""
+        pos = self.head
+        self.size -= len(self.buckets[pos])
+        self.buckets[pos] = []
+        self._set_leaf(pos)
+        self.head += 1
+        if self.head > len(self.keys) // 2:
+            self._rebuild()
+
+    def evict(self, max_items: Optional[int], max_age: Optional[float]) -> None:
+        """Apply count and age retention a whole bucket at a time"""
+        if max_age is not None:
+            cutoff = int((self.newest - max_age) // self.width)
+            while self.head < len(self.keys) and self.keys[self.head] < cutoff:
+                self.drop_oldest()
+        if max_items is not None:
+            while self.size > max_items and len(self.keys) - self.head > 1:
+                self.drop_oldest()
+
+    def top(self, k: int, start: float, end: float) -> List[Dict[str, Any]]:
+        """Best-first search: buckets partly outside [start, end] are filtered,
+        the covered run is split into O(log n) tree nodes and expanded lazily"""
+        keys = self.keys
+        lo = bisect.bisect_left(keys, int(start // self.width), lo=self.head) if math.isfinite(start) else self.head
+        hi = bisect.bisect_right(keys, int(end // self.width), lo=self.head) if math.isfinite(end) else len(keys)
+        if hi <= lo or k <= 0:
+            return []
+
+        heap = []
+        counter = itertools.count()
+        for pos in sorted({lo, hi - 1}):
+            if keys[pos] * self.width < start or (keys[pos] + 1) * self.width > end:
+                entries = [entry for entry in self.buckets[pos] if start <= entry[2] <= end]
+                if entries:
+                    heap.append((entries[0][0], next(counter), entries, 0))
+                if pos == lo:
+                    lo += 1
+                else:
+                    hi -= 1
+
+        tree = self._tree
+        left, right = lo + self._leaves, hi + self._leaves
+        while left < right:
+            if left & 1:
+                heap.append((-tree[left], next(counter), None, left))
+                left += 1
+            if right & 1:
+                right -= 1
+                heap.append((-tree[right], next(counter), None, right))
+            left //= 2
+            right //= 2
+        heapq.heapify(heap)
+
+        result = []
+        while heap and len(result) < k:
+            neg_score, _, entries, ref = heapq.heappop(heap)
+            if neg_score == math.inf:
+                break
+            if entries is not None:
+                result.append(entries[ref][3])
+                if ref + 1 < len(entries):
+                    heapq.heappush(heap, (entries[ref + 1][0], next(counter), entries, ref + 1))
+            elif ref >= self._leaves:
+                bucket = self.buckets[ref - self._leaves]
+                heapq.heappush(heap, (bucket[0][0], next(counter), bucket, 0))
+            else:
+                for child in (2 * ref, 2 * ref + 1):
+                    if tree[child] > -math.inf:
+                        heapq.heappush(heap, (-tree[child], next(counter), None, child))
+        return result
+
+class TopKIndex:
+    """
+    Per-dataset anomaly events ordered by score within time buckets
+
+    "The K worst anomalies between T1 and T2" is answered in about
+    O((K + log n) log n) for n buckets: only the two edge buckets are
+    filtered, everything between them is reached through the tree.
+    """
+
+    def __init__(self, bucket_width: float = 60.0, max_items: Optional[int] = None,
+                 max_age: Optional[float] = None):
+        """
+        Initialize index
+
+        Args:
+            bucket_width: Seconds per time bucket
+            max_items: Maximum events kept per dataset (oldest buckets dropped first)
+            max_age: Seconds of events kept, relative to the newest event
+        """
+        self.bucket_width = bucket_width
+        self.max_items = max_items
+        self.max_age = max_age
+        self._datasets = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def add(self, dataset: str, ts: float, score: float, record: Dict[str, Any]) -> None:
+        """
+        Index one anomaly event
+
+        Args:
+            dataset: Dataset name
+            ts: Detection time as a Unix timestamp
+            score: Anomaly score (higher = more anomalous)
+            record: Anomaly details (returned as-is by top())
+        """
+        self.add_many(dataset, [ts], [score], [record])
+
+    def add_many(self, dataset: str, timestamps: List[float], scores: List[float],
+                 records: List[Dict[str, Any]]) -> None:
+        """
+        Index a batch of anomaly events under one lock acquisition
+
+        Args:
+            dataset: Dataset name
+            timestamps: Detection times as Unix timestamps
+            scores: Anomaly scores, aligned with timestamps (NaN scores are skipped)
+            records: Anomaly details, aligned with timestamps
+        """
+        if not records:
+            return
+        with self._lock:
+            index = self._datasets.get(dataset)
+            if index is None:
+                index = self._datasets[dataset] = _DatasetIndex(self.bucket_width)
+            for ts, score, record in zip(timestamps, scores, records):
+                score = float(score)
+                if not math.isnan(score):
+                    index.add((-score, next(self._seq), float(ts), record))
+            index.evict(self.max_items, self.max_age)
+
+    def top(self, dataset: str, k: int, start: Optional[float] = None,
+            end: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Highest-scoring events of a dataset in a time range, best first
+
+        Args:
+            dataset: Dataset name
+            k: Maximum number of events
+            start: Unix timestamp lower bound (inclusive, optional)
+            end: Unix timestamp upper bound (inclusive, optional)
+
+        Returns:
+            Records as passed to add()
+        """
+        with self._lock:
+            index = self._datasets.get(dataset)
+            if index is None:
+                return []
+            return index.top(k, -math.inf if start is None else start, math.inf if end is None else end)
+
+    def datasets(self) -> List[str]:
+        """Names of datasets with indexed events"""
+        with self._lock:
+            return list(self._datasets)
+
+    def count(self, dataset: Optional[str] = None) -> int:
+        """
+        Number of indexed events
+
+        Args:
+            dataset: Dataset name (None counts all datasets)
+        """
+        with self._lock:
+            names = [dataset] if dataset is not None else list(self._datasets)
+            return sum(self._datasets[name].size for name in names if name in self._datasets)
@@ -7,6 +7,7 @@ import plotly.graph_objects as go
 import plotly.express as px
 from typing import Optional, List
 import os
+from utils.downsample import downsample_indices
 
 class TimeSeriesPlotter:
     """Handles visualization of time-series anomaly detection results"""
@@ -24,13 +25,41 @@ class TimeSeriesPlotter:
         if style != "default":
             plt.style.use(style)
     
+    def _downsample(
+        self,
+        data: np.ndarray,
+        predictions: np.ndarray,
+        scores: Optional[np.ndarray],
+        max_points: Optional[int]
+    ) -> tuple:
+        """
+        Reduce a series to at most max_points for drawing
+        
+        Args:
+            data: Time-series data
+            predictions: Binary predictions
+            scores: Anomaly scores (optional)
+            max_points: Point budget (None keeps every point)
+            
+        Returns:
+            Tuple of (x, data, predictions, scores) with x holding the original time indices
+        """
+        data = np.asarray(data)
+        predictions = np.asarray(predictions)
+        if max_points is None or len(data) <= max_points:
+            return np.arange(len(data)), data, predictions, scores
+        
+        keep = downsample_indices(data, max_points, predictions == 1)
+        return keep, data[keep], predictions[keep], (np.asarray(scores)[keep] if scores is not None else None)
+    
     def plot_anomalies_matplotlib(
         self,
         data: np.ndarray,
         predictions: np.ndarray,
         scores: Optional[np.ndarray] = None,
         title: str = "Time Series Anomaly Detection",
-        savepath: Optional[str] = None
+        savepath: Optional[str] = None,
+        max_points: Optional[int] = None
     ) -> None:
         """
         Plot time-series with anomalies using Matplotlib
@@ -41,7 +70,9 @@ class TimeSeriesPlotter:
             scores: Anomaly scores (optional)
             title: Plot title
             savepath: Path to save figure
+            max_points: LTTB-downsample to at most this many points, keeping anomalies (optional)
         """
+        x, data, predictions, scores = self._downsample(data, predictions, scores, max_points)
         fig, axes = plt.subplots(2 if scores is not None else 1, 1, figsize=self.figsize)
         
         if scores is None:
@@ -49,7 +80,6 @@ class TimeSeriesPlotter:
         
         # Plot 1: Time series with anomalies highlighted
         ax = axes[0]
-        x = np.arange(len(data))
         normal_mask = predictions == 0
         anomaly_mask = predictions == 1
         
@@ -88,7 +118,8 @@ class TimeSeriesPlotter:
         predictions: np.ndarray,
         scores: Optional[np.ndarray] = None,
         title: str = "Time Series Anomaly Detection",
-        savepath: Optional[str] = None
+        savepath: Optional[str] = None,
+        max_points: Optional[int] = None
     ) -> None:
         """
         Plot time-series with anomalies using Plotly (interactive)
@@ -99,8 +130,9 @@ class TimeSeriesPlotter:
             scores: Anomaly scores (optional)
             title: Plot title
             savepath: Path to save HTML
+            max_points: LTTB-downsample to at most this many points, keeping anomalies (optional)
         """
-        x = np.arange(len(data))
+        x, data, predictions, scores = self._downsample(data, predictions, scores, max_points)
         normal_mask = predictions == 0
         anomaly_mask = predictions == 1
         
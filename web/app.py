@@ -6,20 +6,37 @@ import os
 import sys
 import numpy as np
 import pandas as pd
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, render_template, jsonify, request
 from datetime import datetime
 import plotly.graph_objects as go
 import plotly.io as pio
 import json
-from collections import defaultdict
 import random
+import threading
 import time
+from collections import OrderedDict
+from types import MappingProxyType
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.data_processor import TimeSeriesProcessor
-from models import StatisticalDetector, IsolationForestDetector, LOFDetector, EnsembleDetector
+from utils.ring_buffer import RingBuffer
+from utils.snapshot import SnapshotPublisher
+from utils.broadcast import Broadcaster
+from utils.anomaly_history import AnomalyHistory
+from utils.topk_index import TopKIndex
+from utils.events import EventCompactor, compact_events
+from utils.ingest import parse_ingest_body
+from utils.downsample import MIN_MAX_POINTS, downsample_indices
+from utils.sqlite_store import PointStore
+from utils.compressed_store import CompressedStore
+from utils.rollups import DEFAULT_TIERS, RollupStore, parse_tiers
+from utils.encoding import (
+    JSON_MEDIA_TYPE, FLOAT32_MEDIA_TYPE, encode_json, encode_float32_series, choose_encoding, compress
+)
+from config.config import config
+from models import StatisticalDetector, IsolationForestDetector, LOFDetector, EnsembleDetector, StreamingDetector
 from data.generate_data import (
     generate_cpu_usage_data, 
     generate_financial_data, 
@@ -30,17 +47,76 @@ from data.generate_data import (
 # Initialize Flask app
 app = Flask(__name__, template_folder='templates')
 
-# Store global data for streaming
+# Points kept per dataset for streaming (the test split of a 500-sample dataset)
+STREAMING_WINDOW = 150
+
+# Store global data for streaming; every point gets a sequence number so
+# clients can poll with ?since=<seq> and receive only new points
 streaming_data = {
-    'CPU Usage (Server Monitoring)': {'data': [], 'anomalies': []},
-    'Financial Data': {'data': [], 'anomalies': []},
-    'Network Traffic (Packets/sec)': {'data': [], 'anomalies': []},
-    'Temperature Sensor (°C)': {'data': [], 'anomalies': []},
-    'Stock Price ($)': {'data': [], 'anomalies': []}
+    'CPU Usage (Server Monitoring)': RingBuffer(STREAMING_WINDOW),
+    'Financial Data': RingBuffer(STREAMING_WINDOW),
+    'Network Traffic (Packets/sec)': RingBuffer(STREAMING_WINDOW),
+    'Temperature Sensor (°C)': RingBuffer(STREAMING_WINDOW),
+    'Stock Price ($)': RingBuffer(STREAMING_WINDOW)
 }
 
-# Store anomaly history with timestamps
-anomaly_history = defaultdict(list)
+
+def freeze_streaming_data():
+    """Immutable {dataset: SeriesSnapshot} view of streaming_data"""
+    return MappingProxyType({name: buffer.freeze() for name, buffer in streaming_data.items()})
+
+
+# Writers (dashboard rebuilds, realtime scoring, ingest) republish this view
+# once per rebuild, generator tick or ingest request, not per point; request
+# threads read it without locks and its version doubles as the ETag
+streaming_state = SnapshotPublisher()
+streaming_state.publish(freeze_streaming_data)
+
+# Store anomaly history with timestamps, bounded per dataset by count and age
+ANOMALY_HISTORY_MAX_ITEMS = int(os.getenv('ANOMALY_HISTORY_MAX_ITEMS', 5000))
+ANOMALY_HISTORY_MAX_AGE = float(os.getenv('ANOMALY_HISTORY_MAX_AGE', 24 * 3600))  # seconds
+anomaly_history = AnomalyHistory(max_items=ANOMALY_HISTORY_MAX_ITEMS, max_age=ANOMALY_HISTORY_MAX_AGE)
+
+# The same anomalies ordered by score within 1-minute buckets, for
+# "worst K in a time range" queries. Ensemble scores (dashboard rebuilds,
+# in [0, 1]) and streaming z-scores (realtime and ingest, unbounded) are not
+# comparable, so each kind gets its own index (the ensemble one is rebuilt
+# and swapped in by every dashboard rebuild)
+def make_anomaly_index():
+    """Empty top-K index with the anomaly history's retention"""
+    return TopKIndex(bucket_width=60, max_items=ANOMALY_HISTORY_MAX_ITEMS, max_age=ANOMALY_HISTORY_MAX_AGE)
+
+
+anomaly_indexes = {kind: make_anomaly_index() for kind in ('streaming', 'ensemble')}
+
+# Runs of flagged points merged into events (start, end, peak score, count);
+# an event stays open until more than config.EVENT_GAP_TOLERANCE normal
+# points follow it (the same EVENT_GAP_TOLERANCE setting main.py uses)
+anomaly_events = EventCompactor(gap_tolerance=config.EVENT_GAP_TOLERANCE)
+event_history = AnomalyHistory(max_items=ANOMALY_HISTORY_MAX_ITEMS, max_age=ANOMALY_HISTORY_MAX_AGE)
+
+# Long in-memory history of realtime/ingested points, compressed to a few
+# bytes per point (delta-of-delta timestamps, XOR floats, run-length flags)
+HISTORY_RETENTION = float(os.getenv('HISTORY_RETENTION', 3 * 24 * 3600))  # seconds
+series_history = CompressedStore(max_age=HISTORY_RETENTION)
+MAX_AGGREGATE_BUCKETS = 2000
+
+# Precomputed rollup tiers (default 1 minute for 7 days, 1 hour for a year)
+# for zoomed-out history; ROLLUP_TIERS takes "width:retention" pairs in
+# seconds, e.g. "60:604800,3600:31536000"
+ROLLUP_TIERS = parse_tiers(os.environ['ROLLUP_TIERS']) if os.getenv('ROLLUP_TIERS') else DEFAULT_TIERS
+rollups = RollupStore(ROLLUP_TIERS)
+
+# Optional persistence of realtime/ingested points and anomalies: set
+# POINT_STORE_PATH to a SQLite file (WAL mode, batched background writes)
+POINT_STORE_PATH = os.getenv('POINT_STORE_PATH')
+point_store = PointStore(POINT_STORE_PATH) if POINT_STORE_PATH else None
+
+# Encoded /api/get-streaming-data bodies keyed by (ETag, format, coding), so
+# dashboards polling from the same cursor share one serialization
+ENCODED_CACHE_SIZE = 64
+encoded_cache = OrderedDict()
+encoded_cache_lock = threading.Lock()
 
 # Real-time CPU data generator state
 cpu_time_index = 0
@@ -55,6 +131,48 @@ realtime_state = {
     'Stock Price ($)': {'index': 0, 'base_value': 150.0}
 }
 
+# Real-time generator parameters per chart: (min_val, max_val, drift, anomaly_range)
+realtime_params = {
+    'CPU Usage (Server Monitoring)': (20, 80, 2, 40),
+    'Financial Data': (50, 200, 5, 60),
+    'Network Traffic (Packets/sec)': (200, 1000, 20, 200),
+    'Temperature Sensor (°C)': (15, 35, 1, 8),
+    'Stock Price ($)': (100, 200, 3, 40)
+}
+
+# Each chart is scored by a long-lived StreamingDetector, fitted once at
+# startup on simulated normal behavior and adapted incrementally per point
+REALTIME_TRAINING_SAMPLES = 300
+REALTIME_THRESHOLD = 3.0
+REALTIME_ALPHA = 0.1  # EWMA weight: fast enough to follow the random walk, slow enough to keep spikes visible
+
+# Held for every scored point or batch and for swapping in a dashboard
+# rebuild: the detector, streaming window, histories, rollups and point store
+# are updated as one operation (an RLock, so a caller can hold it across
+# several score_point/score_batch calls)
+scoring_lock = threading.RLock()
+
+# Cumulative /api/ingest throughput counters
+ingest_metrics = {'requests': 0, 'points': 0, 'anomalies': 0, 'busy_sec': 0.0}
+ingest_lock = threading.Lock()
+
+# Server-Sent Events: one background producer publishes every series, new
+# anomalies and stats into a shared buffer that all /api/stream clients read
+STREAM_INTERVAL = 3  # seconds, same cadence the dashboard used to poll at
+broadcaster = Broadcaster()
+stream_worker_lock = threading.Lock()
+stream_worker_thread = None
+
+# Dashboard datasets are generated, fitted and scored once off the request
+# path and refreshed in the background when older than DASHBOARD_TTL seconds
+# (or on POST /api/refresh-dashboard)
+DASHBOARD_TTL = int(os.getenv('DASHBOARD_TTL', 600))
+dashboard_lock = threading.Lock()
+dashboard_state = {'initialized_at': None}
+# Anomaly records and events the last rebuild added per dataset, removed
+# again when the next rebuild replaces them
+dashboard_records = {}
+
 # Create necessary folders
 os.makedirs('logs', exist_ok=True)
 os.makedirs('uploads', exist_ok=True)
@@ -62,6 +180,61 @@ os.makedirs('uploads', exist_ok=True)
 @app.route('/')
 def index():
     """Main page - Shows modern dashboard with real-time anomaly detection"""
+    ensure_dashboard_fresh()
+    return render_template('modern_dashboard.html')
+
+
+@app.route('/api/refresh-dashboard', methods=['POST'])
+def refresh_dashboard():
+    """API endpoint that forces a background rebuild of the dashboard datasets"""
+    started = not dashboard_lock.locked()
+    if started:
+        refresh_dashboard_async()
+    
+    return jsonify({
+        'refresh_started': started,
+        'initialized_at': dashboard_state['initialized_at'],
+        'ttl': DASHBOARD_TTL
+    })
+
+
+def ensure_dashboard_fresh():
+    """Kick off a background rebuild if the cached datasets are missing or stale"""
+    initialized_at = dashboard_state['initialized_at']
+    is_stale = initialized_at is None or time.time() - initialized_at > DASHBOARD_TTL
+    if is_stale and not dashboard_lock.locked():
+        refresh_dashboard_async()
+
+
+def refresh_dashboard_async():
+    """Run initialize_dashboard() on a background thread"""
+    threading.Thread(target=initialize_dashboard, daemon=True).start()
+
+
+def initialize_dashboard():
+    """Generate, fit and score all dashboard datasets (slow - keep off the request path)
+    
+    Returns:
+        False if another rebuild was already running, True otherwise
+    """
+    if not dashboard_lock.acquire(blocking=False):
+        return False
+    try:
+        build_dashboard_datasets()
+        dashboard_state['initialized_at'] = time.time()
+    finally:
+        dashboard_lock.release()
+    return True
+
+
+def build_dashboard_datasets():
+    """Score fresh synthetic datasets and swap the results in under scoring_lock
+    
+    The ensemble anomalies and events of the previous rebuild are replaced,
+    not appended to. A dataset's streaming window is only seeded with the
+    scored test split while no realtime or ingested point has been scored
+    for it, so a refresh never overwrites live windows.
+    """
     print("\n" + "="*70)
     print("INITIALIZING MODERN ANOMALY DETECTION DASHBOARD...")
     print("="*70)
@@ -75,13 +248,15 @@ def index():
         'Stock Price ($)': generate_financial_data(n_samples=500)
     }
     
-    # Store initial data globally for streaming
     processor = TimeSeriesProcessor()
     # Use ensemble detector for improved accuracy
     detector = EnsembleDetector(
         voting='weighted'  # Weighted voting for more nuanced detection
     )
     
+    # Everything is computed before taking the lock; only the swap holds it
+    rebuilt = {}
+    ensemble_index = make_anomaly_index()
     for name, df in datasets.items():
         numeric_cols = df.select_dtypes(include=[np.number]).columns
         data = df[numeric_cols[-1]].values.tolist()
@@ -92,63 +267,241 @@ def index():
         
         detector.fit(train_normalized)
         result = detector.predict_with_scores(test_normalized)
+        flags = result['predictions'] == 1
         
-        anomaly_indices = [i for i, pred in enumerate(result['predictions']) if pred == 1]
+        # Points keep the dataset's own spacing (Unix seconds), shifted so the
+        # last test point lands at now: the histories' age limit would drop
+        # the generators' historical dates on insert
+        unix_times = df['timestamp'].values.astype('datetime64[ns]').astype(np.int64) / 1e9
+        _, test_times = processor.split_data(unix_times, train_ratio=0.7)
+        test_times = (test_times + (time.time() - test_times[-1])).tolist()
+        iso_times = [datetime.fromtimestamp(ts).isoformat() for ts in test_times]
         
-        streaming_data[name]['data'] = test_data.tolist()
-        streaming_data[name]['anomalies'] = anomaly_indices
+        # Anomaly records with each point's own time, value and score
+        anomaly_indices = np.flatnonzero(flags).tolist()
+        records = [{
+            'timestamp': iso_times[idx],
+            'index': idx,
+            'value': float(test_data[idx]),
+            'score': round(float(result['scores'][idx]), 3),
+            'detected_at': iso_times[idx]
+        } for idx in anomaly_indices]
+        record_times = [test_times[idx] for idx in anomaly_indices]
+        ensemble_index.add_many(name, record_times, [float(result['scores'][idx]) for idx in anomaly_indices], records)
         
-        # Store anomaly history with timestamps and values
-        for idx in anomaly_indices:
-            anomaly_history[name].append({
-                'timestamp': datetime.now().isoformat(),
-                'index': idx,
-                'value': float(test_data[idx]),
-                'detected_at': datetime.now().isoformat()
-            })
+        events = compact_events(result['predictions'], result['scores'], timestamps=test_times,
+                                values=test_data, gap_tolerance=config.EVENT_GAP_TOLERANCE)
+        rebuilt[name] = (test_data.tolist(), iso_times, flags.tolist(), records, record_times, events)
         
         print(f"✓ {name}: {len(test_data)} points, {len(anomaly_indices)} anomalies")
     
+    with scoring_lock:
+        for name, (values, iso_times, flags, records, record_times, events) in rebuilt.items():
+            # Appending a full window's worth of points replaces the previous
+            # window in one locked operation
+            if realtime_state[name]['index'] == 0:
+                streaming_data[name].extend(values, iso_times, flags)
+            
+            previous_records, previous_events = dashboard_records.get(name, ([], []))
+            anomaly_history.remove(name, previous_records)
+            anomaly_history.add_many(name, records, record_times)
+            event_history.remove(name, previous_events)
+            event_history.add_many(name, events, [event['end'] for event in events])
+            dashboard_records[name] = (records, events)
+        
+        anomaly_indexes['ensemble'] = ensemble_index
+        # Readers switch to the rebuilt windows in one step
+        streaming_state.publish(freeze_streaming_data)
+    
     print("✅ Dashboard initialized - LIVE and ready!")
     print("="*70 + "\n")
-    
-    return render_template('modern_dashboard.html')
 
 
 @app.route('/api/get-streaming-data')
 def get_streaming_data():
-    """API endpoint that returns current streaming data"""
-    response_data = {}
+    """API endpoint that returns current streaming data
+    
+    Every dataset numbers its points independently, so cursors are per
+    dataset: ?since={"<dataset>": <last_seq>, ...} (JSON) returns only the
+    points newer than each dataset's cursor (datasets left out get their full
+    window). summary.cursors holds every dataset's last_seq, ready to be sent
+    back as the next since. Anomaly indices are relative to the returned
+    values and "reset" is set when a cursor fell out of its window or is
+    ahead of it (the full window is returned instead).
+    
+    With ?max_points=N each series is LTTB-downsampled to at most N points,
+    keeping anomalies; "positions" then gives each kept value's index in
+    the full series so charts keep their x axis.
+    
+    The body is JSON by default, or packed float32 series when the client
+    sends Accept: application/x-float32-series (or ?format=float32), and is
+    gzip/brotli compressed per Accept-Encoding. The whole response comes from
+    one published snapshot whose version is part of the ETag, so an unchanged
+    poll gets a 304 without any serialization.
+    """
+    ensure_dashboard_fresh()
+    try:
+        cursors = parse_cursors(request.args.get('since'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    max_points = request.args.get('max_points', type=int)
+    if max_points is not None and max_points < MIN_MAX_POINTS:
+        return jsonify({'error': f'max_points must be at least {MIN_MAX_POINTS}'}), 400
+    if request.args.get('format') == 'float32':
+        media_type = FLOAT32_MEDIA_TYPE
+    else:
+        media_type = request.accept_mimetypes.best_match([JSON_MEDIA_TYPE, FLOAT32_MEDIA_TYPE]) or JSON_MEDIA_TYPE
+    coding = choose_encoding(request.headers.get('Accept-Encoding', ''))
+    
+    version, state = streaming_state.get()
+    since = ','.join(str(cursors.get(name, -1)) for name in streaming_data)
+    etag = f"{version}-{since}-{max_points or 'all'}-{'f32' if media_type == FLOAT32_MEDIA_TYPE else 'json'}-{coding or 'identity'}"
+    headers = {'ETag': f'"{etag}"', 'Vary': 'Accept, Accept-Encoding', 'Cache-Control': 'no-cache'}
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers=headers)
+    
+    with encoded_cache_lock:
+        cached = encoded_cache.get(etag)
+        if cached is not None:
+            encoded_cache.move_to_end(etag)
+    
+    if cached is None:
+        series, summary = build_streaming_payload(state, cursors, max_points)
+        if media_type == FLOAT32_MEDIA_TYPE:
+            body = encode_float32_series(series, {'summary': summary})
+        else:
+            body = encode_json({**series, 'summary': summary})
+        cached = compress(body, coding)
+        with encoded_cache_lock:
+            encoded_cache[etag] = cached
+            if len(encoded_cache) > ENCODED_CACHE_SIZE:
+                encoded_cache.popitem(last=False)
+    
+    body, applied = cached
+    if applied:
+        headers['Content-Encoding'] = applied
+    return Response(body, mimetype=media_type, headers=headers)
+
+
+def parse_cursors(value):
+    """Parse the ?since= JSON map of dataset -> last_seq (None means no cursors)"""
+    if value is None:
+        return {}
+    try:
+        cursors = json.loads(value)
+    except ValueError:
+        cursors = None
+    if not isinstance(cursors, dict):
+        raise ValueError('since must be a JSON object of dataset -> last_seq')
+    for name, seq in cursors.items():
+        if name not in streaming_data:
+            raise ValueError(f'Unknown dataset in since: {name}')
+        if not isinstance(seq, int) or isinstance(seq, bool):
+            raise ValueError(f'Invalid cursor for {name}: {seq}')
+    return cursors
+
+
+def build_streaming_payload(state, cursors, max_points=None):
+    """Collect per-dataset points newer than their cursors plus the overall summary
+    
+    Args:
+        state: Published {dataset: SeriesSnapshot} view
+        cursors: Dataset -> sequence cursor (missing datasets get the full window)
+        max_points: LTTB-downsample each series to at most this many points (None keeps all)
+    
+    Returns:
+        Tuple of ({dataset: fields}, summary)
+    """
+    series = {}
     total_points = 0
     total_anomalies = 0
     
-    for name in streaming_data.keys():
-        response_data[name] = {
-            'values': streaming_data[name]['data'],
-            'anomalies': streaming_data[name]['anomalies'],
-            'count': len(streaming_data[name]['data'])
+    for name, snapshot in state.items():
+        since = cursors.get(name, -1)
+        points, last_seq, reset = snapshot.since(since)
+        counts = snapshot.counts()
+        values = [p['value'] for p in points]
+        flags = [p['is_anomaly'] for p in points]
+        keep = None
+        
+        if max_points is not None and len(points) > max_points:
+            keep = downsample_indices(values, max_points, flags)
+            values = [values[i] for i in keep]
+            flags = [flags[i] for i in keep]
+        
+        series[name] = {
+            'values': values,
+            'anomalies': [i for i, flag in enumerate(flags) if flag],
+            'count': len(values),
+            'last_seq': last_seq,
+            'reset': reset and since >= 0
         }
-        total_points += len(streaming_data[name]['data'])
-        total_anomalies += len(streaming_data[name]['anomalies'])
+        if keep is not None:
+            series[name]['positions'] = keep.tolist()
+        total_points += counts['data_points']
+        total_anomalies += counts['anomalies']
     
-    response_data['summary'] = {
+    summary = {
         'total_points': total_points,
         'total_anomalies': total_anomalies,
         'anomaly_rate': (total_anomalies / total_points * 100) if total_points > 0 else 0,
-        'server_status': 'ACTIVE'
+        'server_status': 'ACTIVE',
+        'cursors': {name: fields['last_seq'] for name, fields in series.items()}
     }
-    
-    return jsonify(response_data)
+    return series, summary
 
 
 @app.route('/api/get-anomaly-history')
 def get_anomaly_history():
-    """API endpoint that returns historical anomalies with timestamps"""
+    """API endpoint that returns historical anomalies with timestamps
+    
+    Query parameters:
+        limit: Maximum anomalies per dataset (default 50)
+        since: Only anomalies detected at or after this time (ISO string or Unix seconds)
+        until: Only anomalies detected at or before this time (with top_k)
+        top_k: Return the K highest-scoring anomalies in the range instead,
+               best first (served from the score index, not a scan)
+        scores: Score kind ranked by top_k: "streaming" z-scores (default)
+                or "ensemble" scores from the dashboard rebuild
+    """
+    limit = request.args.get('limit', default=50, type=int)
+    top_k = request.args.get('top_k', type=int)
+    if top_k is not None and top_k < 1:
+        return jsonify({'error': 'top_k must be at least 1'}), 400
+    score_kind = request.args.get('scores', default='streaming')
+    if score_kind not in anomaly_indexes:
+        return jsonify({'error': f"scores must be one of {', '.join(anomaly_indexes)}"}), 400
+    since = request.args.get('since')
+    if since is not None:
+        try:
+            since_ts = parse_time_param(since)
+        except ValueError:
+            return jsonify({'error': f'Invalid since value: {since}'}), 400
+    try:
+        until_ts = parse_time_param(request.args.get('until'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     history = {}
+    if top_k is not None:
+        index = anomaly_indexes[score_kind]
+        for dataset_name in index.datasets():
+            history[dataset_name] = index.top(
+                dataset_name, top_k, since_ts if since is not None else None, until_ts
+            )
+        return jsonify({
+            'history': history,
+            'order': 'score',
+            'scores': score_kind,
+            'timestamp': datetime.now().isoformat()
+        })
     
-    for dataset_name, anomalies in anomaly_history.items():
-        # Return last 50 anomalies for each dataset, most recent first
-        history[dataset_name] = sorted(anomalies, key=lambda x: x['detected_at'], reverse=True)[:50]
+    for dataset_name in anomaly_history.datasets():
+        # Most recent first; the store is already time-ordered so no sorting is needed
+        if since is None:
+            history[dataset_name] = anomaly_history.latest(dataset_name, limit)
+        else:
+            history[dataset_name] = anomaly_history.since(dataset_name, since_ts, limit)
     
     return jsonify({
         'history': history,
@@ -156,39 +509,327 @@ def get_anomaly_history():
     })
 
 
+@app.route('/api/get-anomaly-events')
+def get_anomaly_events():
+    """API endpoint that returns anomalies compacted into events
+
+    Each event covers a run of flagged points (normal gaps of up to
+    EVENT_GAP_TOLERANCE points included) with its start, end, flagged point
+    count and peak score/value; "open" holds events still in progress.
+
+    Query parameters:
+        limit: Maximum closed events per dataset (default 50)
+        since: Only events that ended at or after this time (ISO string or Unix seconds)
+    """
+    limit = request.args.get('limit', default=50, type=int)
+    try:
+        since_ts = parse_time_param(request.args.get('since'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    events = {}
+    for dataset_name in event_history.datasets():
+        if since_ts is None:
+            events[dataset_name] = event_history.latest(dataset_name, limit)
+        else:
+            events[dataset_name] = event_history.since(dataset_name, since_ts, limit)
+
+    return jsonify({
+        'events': events,
+        'open': anomaly_events.open_events(),
+        'gap_tolerance': config.EVENT_GAP_TOLERANCE,
+        'timestamp': datetime.now().isoformat()
+    })
+
+
+@app.route('/api/get-history')
+def get_history():
+    """API endpoint that returns point history and anomalies for one dataset
+    
+    Points come from the compressed in-memory history, or from the SQLite
+    store when it is enabled and the range starts before the in-memory
+    retention. With a resolution, points are replaced by rollup buckets
+    from the coarsest tier no wider than it (raw points are still used when
+    the resolution is finer than every tier). Anomalies come from the SQLite
+    store when enabled, otherwise from the in-memory anomaly history.
+    
+    Query parameters:
+        dataset: Dataset name (required)
+        start, end: Time range bounds (ISO string or Unix seconds, optional)
+        limit: Maximum points and anomalies (newest kept; anomalies default to 1000)
+        max_points: LTTB-downsample the points, keeping anomalies
+        resolution: Bucket width in seconds for rolled-up points
+    """
+    dataset_name = request.args.get('dataset')
+    if dataset_name not in streaming_detectors:
+        return jsonify({'error': f'Unknown dataset: {dataset_name}'}), 400
+    try:
+        start = parse_time_param(request.args.get('start'))
+        end = parse_time_param(request.args.get('end'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    limit = request.args.get('limit', type=int)
+    if limit is not None and limit < 1:
+        return jsonify({'error': 'limit must be at least 1'}), 400
+    max_points = request.args.get('max_points', type=int)
+    if max_points is not None and max_points < MIN_MAX_POINTS:
+        return jsonify({'error': f'max_points must be at least {MIN_MAX_POINTS}'}), 400
+    resolution = request.args.get('resolution', type=float)
+    if resolution is not None and not resolution > 0:
+        return jsonify({'error': 'resolution must be positive'}), 400
+    
+    tier, buckets = (None, None) if resolution is None else rollups.query(dataset_name, start, end, resolution)
+    
+    oldest = series_history.oldest(dataset_name)
+    if tier is not None:
+        if limit is not None:
+            buckets = buckets[-limit:]
+        timestamps, values, flags = np.empty(0), np.empty(0), np.empty(0, dtype=bool)
+        backend = 'rollup'
+    elif point_store is not None and (oldest is None or start is None or start < oldest):
+        rows = point_store.points(dataset_name, start, end, limit)
+        timestamps = np.array([p['ts'] for p in rows], dtype=float)
+        values = np.array([p['value'] for p in rows], dtype=float)
+        flags = np.array([p['is_anomaly'] for p in rows], dtype=bool)
+        backend = 'sqlite'
+    else:
+        timestamps, values, flags = series_history.range(dataset_name, start, end)
+        if limit is not None:
+            timestamps, values, flags = timestamps[-limit:], values[-limit:], flags[-limit:]
+        backend = 'memory'
+    
+    # Downsample before building per-point dicts: ranges can span days
+    total = len(values) if tier is None else sum(bucket['count'] for bucket in buckets)
+    if max_points is not None and total > max_points:
+        keep = downsample_indices(values, max_points, flags, timestamps)
+        timestamps, values, flags = timestamps[keep], values[keep], flags[keep]
+    points = [
+        {'ts': ts, 'value': value, 'is_anomaly': flag}
+        for ts, value, flag in zip(timestamps.tolist(), values.tolist(), flags.tolist())
+    ]
+    
+    anomaly_limit = limit if limit is not None else 1000
+    if point_store is not None:
+        anomalies = point_store.anomalies(dataset_name, start, end, anomaly_limit)
+    else:
+        anomalies = anomaly_history.since(dataset_name, start if start is not None else 0, anomaly_limit)
+        if end is not None:
+            anomalies = [a for a in anomalies if datetime.fromisoformat(a['detected_at']).timestamp() <= end]
+    
+    response = {
+        'dataset': dataset_name,
+        'points': points,
+        'total_points': total,
+        'anomalies': anomalies,
+        'backend': backend,
+        'memory': series_history.memory_stats().get(dataset_name)
+    }
+    if tier is not None:
+        response.update({'resolution': resolution, 'tier': tier, 'buckets': buckets})
+    return jsonify(response)
+
+
+@app.route('/api/aggregate')
+def get_aggregate():
+    """API endpoint that returns range statistics from the history's range index
+    
+    Query parameters:
+        dataset: Dataset name (default: every dataset)
+        start, end: Time range bounds (ISO string or Unix seconds, default: all retained history)
+        buckets: Split the range into this many equal time buckets (default 1)
+    """
+    dataset_name = request.args.get('dataset')
+    if dataset_name is not None and dataset_name not in streaming_detectors:
+        return jsonify({'error': f'Unknown dataset: {dataset_name}'}), 400
+    try:
+        start = parse_time_param(request.args.get('start'))
+        end = parse_time_param(request.args.get('end'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    buckets = request.args.get('buckets', default=1, type=int)
+    if not 1 <= buckets <= MAX_AGGREGATE_BUCKETS:
+        return jsonify({'error': f'buckets must be between 1 and {MAX_AGGREGATE_BUCKETS}'}), 400
+    
+    names = [dataset_name] if dataset_name is not None else list(streaming_detectors)
+    started = time.perf_counter()
+    aggregates = {name: series_history.aggregate(name, start, end, buckets) for name in names}
+    
+    return jsonify({
+        'aggregates': aggregates,
+        'query_ms': round((time.perf_counter() - started) * 1000, 3)
+    })
+
+
+def parse_time_param(value):
+    """Parse an ISO datetime or Unix seconds query value (None passes through)"""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            raise ValueError(f'Invalid time value: {value}')
+
+
 @app.route('/api/get-realtime-cpu')
 def get_realtime_cpu():
     """API endpoint that returns a single new CPU data point for real-time sliding chart"""
-    return get_realtime_data('CPU Usage (Server Monitoring)', 20, 80, 2, 40)
+    return get_realtime_data('CPU Usage (Server Monitoring)')
 
 
 @app.route('/api/get-realtime-financial')
 def get_realtime_financial():
     """API endpoint for real-time Financial data"""
-    return get_realtime_data('Financial Data', 50, 200, 5, 60)
+    return get_realtime_data('Financial Data')
 
 
 @app.route('/api/get-realtime-network')
 def get_realtime_network():
     """API endpoint for real-time Network Traffic data"""
-    return get_realtime_data('Network Traffic (Packets/sec)', 200, 1000, 20, 200)
+    return get_realtime_data('Network Traffic (Packets/sec)')
 
 
 @app.route('/api/get-realtime-temperature')
 def get_realtime_temperature():
     """API endpoint for real-time Temperature data"""
-    return get_realtime_data('Temperature Sensor (°C)', 15, 35, 1, 8)
+    return get_realtime_data('Temperature Sensor (°C)')
 
 
 @app.route('/api/get-realtime-stock')
 def get_realtime_stock():
     """API endpoint for real-time Stock Price data"""
-    return get_realtime_data('Stock Price ($)', 100, 200, 3, 40)
+    return get_realtime_data('Stock Price ($)')
+
+
+@app.route('/api/get-realtime-all')
+def get_realtime_all():
+    """API endpoint that returns one new scored point for every chart in a single response"""
+    return jsonify(generate_realtime_tick())
+
+
+@app.route('/api/ingest', methods=['POST'])
+def ingest():
+    """API endpoint for bulk point ingestion with batched scoring
+    
+    Accepts NDJSON lines {"source", "ts", "value"} (application/x-ndjson) or
+    packed binary records of (uint16 source index, float64 ts, float64 value)
+    (application/octet-stream); source indices follow GET /api/ingest.
+    The whole body is validated before any detector or store is touched.
+    """
+    started = time.perf_counter()
+    sources = list(realtime_params)
+    try:
+        grouped = parse_ingest_body(request.get_data(cache=False), request.content_type, sources)
+    except (ValueError, OverflowError) as e:
+        return jsonify({'error': str(e)}), 400
+    parsed = time.perf_counter()
+    
+    per_source = {}
+    total_points = 0
+    total_anomalies = 0
+    with scoring_lock:
+        scored = {dataset_name: _score_batch(dataset_name, timestamps, values)
+                  for dataset_name, (timestamps, values) in grouped.items()}
+        streaming_state.publish(freeze_streaming_data)
+    for dataset_name, (timestamps, values) in grouped.items():
+        n_anomalies = scored[dataset_name]
+        per_source[dataset_name] = {'points': len(values), 'anomalies': n_anomalies}
+        total_points += len(values)
+        total_anomalies += n_anomalies
+    
+    finished = time.perf_counter()
+    elapsed = finished - started
+    with ingest_lock:
+        ingest_metrics['requests'] += 1
+        ingest_metrics['points'] += total_points
+        ingest_metrics['anomalies'] += total_anomalies
+        ingest_metrics['busy_sec'] += elapsed
+    
+    return jsonify({
+        'accepted': total_points,
+        'anomalies': total_anomalies,
+        'sources': per_source,
+        'timing_ms': {
+            'parse': round((parsed - started) * 1000, 3),
+            'score_and_store': round((finished - parsed) * 1000, 3),
+            'total': round(elapsed * 1000, 3)
+        },
+        'points_per_sec': round(total_points / elapsed) if elapsed > 0 else 0
+    })
+
+
+@app.route('/api/ingest', methods=['GET'])
+def ingest_info():
+    """API endpoint describing the ingest formats, source indices and throughput so far"""
+    with ingest_lock:
+        metrics = dict(ingest_metrics)
+    busy = metrics.pop('busy_sec')
+    metrics['busy_sec'] = round(busy, 3)
+    metrics['points_per_busy_sec'] = round(metrics['points'] / busy) if busy > 0 else 0
+    
+    return jsonify({
+        'sources': list(realtime_params),
+        'formats': ['application/x-ndjson', 'application/octet-stream'],
+        'metrics': metrics
+    })
+
+
+@app.route('/api/stream')
+def stream():
+    """Server-Sent Events stream multiplexing all series, new anomalies and stats
+    
+    Replaces per-chart polling: each tick publishes one compact "points" event
+    ({dataset: [index, value, timestamp, is_anomaly]}), an "anomaly" event per
+    flagged point and a "stats" event. Last-Event-ID resumes after reconnects.
+    """
+    ensure_stream_worker()
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    return Response(
+        broadcaster.stream(last_event_id),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 
-def get_realtime_data(dataset_name, min_val, max_val, drift, anomaly_range):
+def get_realtime_data(dataset_name):
     """Generic function to generate real-time data for any chart"""
-    state = realtime_state[dataset_name]
+    return jsonify(generate_realtime_point(dataset_name))
+
+
+def generate_realtime_point(dataset_name):
+    """Generate the next simulated point for a chart and score it"""
+    with scoring_lock:
+        return score_point(dataset_name, simulate_realtime_value(dataset_name))
+
+
+def generate_realtime_tick():
+    """Generate and score the next point of every chart, publishing the windows once
+    
+    Returns:
+        Dictionary of dataset name -> scored point
+    """
+    with scoring_lock:
+        points = {
+            dataset_name: _score_point(dataset_name, simulate_realtime_value(dataset_name))
+            for dataset_name in realtime_params
+        }
+        streaming_state.publish(freeze_streaming_data)
+    return points
+
+
+def simulate_realtime_value(dataset_name, state=None, inject_anomalies=True):
+    """Advance a chart's random walk by one step and return the new value
+    
+    Args:
+        dataset_name: Chart name (key of realtime_params)
+        state: Walk state to advance (defaults to the chart's live state)
+        inject_anomalies: Whether to occasionally inject spikes/drops
+    """
+    min_val, max_val, drift, anomaly_range = realtime_params[dataset_name]
+    if state is None:
+        state = realtime_state[dataset_name]
     
     # Generate realistic pattern with drift
     state['base_value'] += random.uniform(-drift, drift)
@@ -199,37 +840,180 @@ def get_realtime_data(dataset_name, min_val, max_val, drift, anomaly_range):
     value = state['base_value'] + noise
     
     # Occasionally create anomalies (10% chance)
-    is_anomaly = False
-    if random.random() < 0.10:
+    if inject_anomalies and random.random() < 0.10:
         anomaly_type = random.choice(['spike', 'drop'])
         if anomaly_type == 'spike':
             value = state['base_value'] + random.uniform(anomaly_range * 0.6, anomaly_range)
         else:
             value = state['base_value'] - random.uniform(anomaly_range * 0.6, anomaly_range)
-        is_anomaly = True
     
     # Clamp to range
-    value = max(min_val * 0.8, min(max_val * 1.2, value))
+    return max(min_val * 0.8, min(max_val * 1.2, value))
+
+
+def score_point(dataset_name, value):
+    """Score one point with the chart's streaming detector and record it
+    
+    The point is appended to the chart's streaming window and, when flagged,
+    to the anomaly history.
+    """
+    with scoring_lock:
+        result = _score_point(dataset_name, value)
+        streaming_state.publish(freeze_streaming_data)
+    return result
+
+
+def _score_point(dataset_name, value):
+    """score_point() body without publishing; the caller holds scoring_lock"""
+    score, is_anomaly = streaming_detectors[dataset_name].update(value)
     
+    state = realtime_state[dataset_name]
     state['index'] += 1
-    current_time = datetime.now().strftime('%H:%M:%S')
+    now = datetime.now()
+    current_time = now.strftime('%H:%M:%S')
+    
+    streaming_data[dataset_name].append(value, now.isoformat(), is_anomaly)
     
     # Store anomaly in history if detected
     if is_anomaly:
-        anomaly_history[dataset_name].append({
+        record = {
             'timestamp': current_time,
             'index': state['index'],
             'value': float(value),
-            'detected_at': datetime.now().isoformat()
-        })
+            'score': round(score, 3),
+            'detected_at': now.isoformat()
+        }
+        anomaly_history.add(dataset_name, record)
+        anomaly_indexes['streaming'].add(dataset_name, now.timestamp(), score, record)
+        if point_store is not None:
+            point_store.add_anomalies(dataset_name, [now.timestamp()], [record])
     
-    return jsonify({
+    closed = anomaly_events.update(dataset_name, now.timestamp(), is_anomaly, score, float(value))
+    event_history.add_many(dataset_name, closed, [event['end'] for event in closed])
+    series_history.append(dataset_name, now.timestamp(), float(value), is_anomaly)
+    rollups.add(dataset_name, now.timestamp(), float(value), is_anomaly)
+    if point_store is not None:
+        point_store.add_point(dataset_name, now.timestamp(), float(value), is_anomaly)
+    
+    return {
         'index': state['index'],
         'value': round(value, 2),
         'timestamp': current_time,
         'is_anomaly': is_anomaly,
+        'score': round(score, 3),
         'dataset': dataset_name
-    })
+    }
+
+
+def score_batch(dataset_name, timestamps, values):
+    """Vectorized score_point() for an ingested batch of one chart's points
+    
+    Args:
+        dataset_name: Chart name
+        timestamps: Unix timestamps in arrival order
+        values: Values in arrival order
+    
+    Returns:
+        Number of points flagged as anomalies
+    """
+    with scoring_lock:
+        n_anomalies = _score_batch(dataset_name, timestamps, values)
+        streaming_state.publish(freeze_streaming_data)
+    return n_anomalies
+
+
+def _score_batch(dataset_name, timestamps, values):
+    """score_batch() body without publishing; the caller holds scoring_lock"""
+    # Only the newest window's worth of points survives in the streaming
+    # buffer, so only those timestamps are formatted (before any state
+    # changes, so a failure here leaves the detector untouched)
+    buffer = streaming_data[dataset_name]
+    keep = min(len(values), buffer.capacity)
+    retained_ts = [datetime.fromtimestamp(ts).isoformat() for ts in timestamps[len(values) - keep:]]
+    
+    scores, flags = streaming_detectors[dataset_name].update_batch(values)
+    
+    state = realtime_state[dataset_name]
+    first_index = state['index'] + 1
+    state['index'] += len(values)
+    
+    buffer.extend(values[-keep:].tolist(), retained_ts, flags[-keep:].tolist(), skipped=len(values) - keep)
+    
+    anomaly_indices = np.flatnonzero(flags)
+    records = []
+    for i in anomaly_indices:
+        detected_at = datetime.fromtimestamp(timestamps[i])
+        records.append({
+            'timestamp': detected_at.strftime('%H:%M:%S'),
+            'index': first_index + int(i),
+            'value': float(values[i]),
+            'score': round(float(scores[i]), 3),
+            'detected_at': detected_at.isoformat()
+        })
+    anomaly_history.add_many(dataset_name, records, timestamps[anomaly_indices].tolist())
+    anomaly_indexes['streaming'].add_many(dataset_name, timestamps[anomaly_indices].tolist(),
+                                          scores[anomaly_indices].tolist(), records)
+    
+    closed = anomaly_events.update_batch(dataset_name, timestamps.tolist(), flags, scores, values)
+    event_history.add_many(dataset_name, closed, [event['end'] for event in closed])
+    series_history.extend(dataset_name, timestamps, values, flags)
+    rollups.add_many(dataset_name, timestamps, values, flags)
+    if point_store is not None:
+        point_store.add_points(dataset_name, timestamps, values, flags)
+        point_store.add_anomalies(dataset_name, timestamps[anomaly_indices].tolist(), records)
+    
+    return int(flags.sum())
+
+
+def build_streaming_detectors(n_samples=REALTIME_TRAINING_SAMPLES):
+    """Fit one StreamingDetector per chart on simulated normal behavior"""
+    detectors = {}
+    for dataset_name in realtime_params:
+        state = dict(realtime_state[dataset_name])
+        training = [
+            simulate_realtime_value(dataset_name, state, inject_anomalies=False)
+            for _ in range(n_samples)
+        ]
+        detector = StreamingDetector(threshold=REALTIME_THRESHOLD, alpha=REALTIME_ALPHA)
+        detector.fit(np.array(training))
+        detectors[dataset_name] = detector
+    return detectors
+
+
+streaming_detectors = build_streaming_detectors()
+
+
+def stream_worker():
+    """Background producer for /api/stream"""
+    while True:
+        points = {}
+        for dataset_name, point in generate_realtime_tick().items():
+            points[dataset_name] = [point['index'], point['value'], point['timestamp'], int(point['is_anomaly'])]
+            if point['is_anomaly']:
+                broadcaster.publish('anomaly', {
+                    'dataset': dataset_name,
+                    'index': point['index'],
+                    'value': point['value'],
+                    'timestamp': point['timestamp'],
+                    'detected_at': datetime.now().isoformat()
+                })
+        
+        broadcaster.publish('points', points)
+        broadcaster.publish('stats', {
+            'total_points': sum(state['index'] for state in realtime_state.values()),
+            'total_anomalies': anomaly_history.count(),
+            'clients': broadcaster.clients
+        })
+        time.sleep(STREAM_INTERVAL)
+
+
+def ensure_stream_worker():
+    """Start the stream producer on first use"""
+    global stream_worker_thread
+    with stream_worker_lock:
+        if stream_worker_thread is None:
+            stream_worker_thread = threading.Thread(target=stream_worker, daemon=True)
+            stream_worker_thread.start()
 
 
 if __name__ == '__main__':
@@ -244,7 +1028,12 @@ if __name__ == '__main__':
     print("  3. Display 4 interactive charts with anomalies highlighted")
     print("\n" + "=" * 70 + "\n")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Build the dashboard datasets once at startup instead of on page load
+    # (only in the reloader's serving child, not the watcher process)
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        refresh_dashboard_async()
+    
+    app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)
 
 # Commit message: Update app.py with new features and improvements
 # Changes include enhancements to the user interface and bug fixes.